@@ -0,0 +1,43 @@
+"""
+Shared fixtures for the backend endpoint suites.
+
+The suites are plain HTTP checks against BASE_URL, so most of their wall time
+is connection setup. `http` hands every test the same keep-alive pooled
+session instead of opening a new TCP connection per call.
+
+The suites are also safe to spread across worker processes with pytest-xdist:
+
+    python -m pytest backend/tests -n auto --dist loadscope
+
+Each worker gets its own session (session-scoped fixtures are per process),
+and --dist loadscope keeps every test class on a single worker.
+"""
+import os
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive connections held per host; sized for the endpoint-availability
+# loops that hit ten routes back to back.
+POOL_SIZE = int(os.environ.get("BACKEND_TEST_POOL_SIZE", "16"))
+
+# Network-bound suites: `-n auto` starts more workers than CPU cores.
+AUTO_WORKERS = int(os.environ.get("BACKEND_TEST_WORKERS", "8"))
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive pooled HTTP session shared by every test in this process"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """Worker count for `-n auto` (only called when pytest-xdist is installed)"""
+    return AUTO_WORKERS
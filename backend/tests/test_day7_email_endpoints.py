@@ -20,14 +20,15 @@ import os
 import json
 
 BASE_URL = "http://localhost:3000"
+TEMPLATES_FILE = "/app/web/src/lib/email/templates.ts"
 
 
 class TestUpgradeDay7EndpointNoAuth:
     """Test /api/email/upgrade-day7 without authentication - should return 401"""
     
-    def test_upgrade_day7_no_auth(self):
+    def test_upgrade_day7_no_auth(self, http):
         """Upgrade Day 7 email endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-day7",
             headers={"Content-Type": "application/json"}
         )
@@ -37,9 +38,9 @@ class TestUpgradeDay7EndpointNoAuth:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ POST /api/email/upgrade-day7 correctly returns 401 for unauthenticated requests")
     
-    def test_upgrade_day7_invalid_token(self):
+    def test_upgrade_day7_invalid_token(self, http):
         """Upgrade Day 7 email endpoint should reject invalid tokens"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-day7",
             headers={
                 "Content-Type": "application/json",
@@ -52,9 +53,9 @@ class TestUpgradeDay7EndpointNoAuth:
         assert data.get("ok") == False
         print(f"✓ POST /api/email/upgrade-day7 correctly rejects invalid tokens (status: {response.status_code})")
     
-    def test_upgrade_day7_malformed_auth_header(self):
+    def test_upgrade_day7_malformed_auth_header(self, http):
         """Upgrade Day 7 email endpoint should handle malformed auth header"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-day7",
             headers={
                 "Content-Type": "application/json",
@@ -69,9 +70,9 @@ class TestUpgradeDay7EndpointNoAuth:
 class TestUpgradeDay7EndpointStructure:
     """Test that upgrade-day7 endpoint has correct structure"""
     
-    def test_endpoint_exists(self):
+    def test_endpoint_exists(self, http):
         """Verify /api/email/upgrade-day7 endpoint exists"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-day7",
             headers={"Content-Type": "application/json"}
         )
@@ -79,9 +80,9 @@ class TestUpgradeDay7EndpointStructure:
         assert response.status_code != 404, "Upgrade Day 7 email endpoint should exist"
         print(f"✓ /api/email/upgrade-day7 endpoint exists")
     
-    def test_returns_json(self):
+    def test_returns_json(self, http):
         """Verify upgrade-day7 endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-day7",
             headers={"Content-Type": "application/json"}
         )
@@ -91,9 +92,9 @@ class TestUpgradeDay7EndpointStructure:
         assert isinstance(data, dict), "Response should be a JSON object"
         print(f"✓ /api/email/upgrade-day7 returns valid JSON")
     
-    def test_get_method_not_allowed(self):
+    def test_get_method_not_allowed(self, http):
         """Upgrade Day 7 endpoint should not allow GET requests"""
-        response = requests.get(f"{BASE_URL}/api/email/upgrade-day7")
+        response = http.get(f"{BASE_URL}/api/email/upgrade-day7")
         # Should return 405 Method Not Allowed or similar
         assert response.status_code in [405, 404, 401], f"GET should not be allowed, got {response.status_code}"
         print(f"✓ GET /api/email/upgrade-day7 correctly rejected (status: {response.status_code})")
@@ -157,11 +158,11 @@ class TestCronEmailsEndpoint:
         
         print(f"✓ Cron endpoint response structure includes all required fields")
     
-    def test_cron_endpoint_accepts_request(self):
+    def test_cron_endpoint_accepts_request(self, http):
         """Test that cron endpoint accepts requests (may timeout due to Firestore)"""
         try:
             # Use very short timeout - we just want to verify endpoint is routed correctly
-            response = requests.get(
+            response = http.get(
                 f"{BASE_URL}/api/cron/emails?dryRun=true",
                 timeout=3
             )
@@ -189,6 +190,9 @@ class TestEmailHtmlTemplate:
         try:
             with open(template_file, 'r') as f:
                 content = f.read()
+            # The HTML/text bodies live in the shared template module
+            with open(TEMPLATES_FILE, 'r') as f:
+                content += f.read()
             
             # Check for the required statistics in the HTML template
             assert "3x" in content, "Template should contain '3x' statistic"
@@ -221,6 +225,9 @@ class TestEmailHtmlTemplate:
         try:
             with open(cron_file, 'r') as f:
                 content = f.read()
+            assert "renderDay7UpgradeEmail" in content, "Cron should render the shared Day 7 template"
+            with open(TEMPLATES_FILE, 'r') as f:
+                content = f.read()
             
             # Check for the required statistics in the HTML template
             assert "3x" in content, "Cron template should contain '3x' statistic"
@@ -19,9 +19,9 @@ BASE_URL = "http://localhost:3000"
 class TestEmailEndpointsNoAuth:
     """Test email endpoints without authentication - should return 401"""
     
-    def test_welcome_email_no_auth(self):
+    def test_welcome_email_no_auth(self, http):
         """Welcome email endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/welcome",
             headers={"Content-Type": "application/json"}
         )
@@ -31,9 +31,9 @@ class TestEmailEndpointsNoAuth:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ Welcome email endpoint correctly returns 401 for unauthenticated requests")
     
-    def test_upgrade_limit_email_no_auth(self):
+    def test_upgrade_limit_email_no_auth(self, http):
         """Upgrade limit email endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-limit",
             headers={"Content-Type": "application/json"},
             json={"limitType": "press_images", "currentValue": "3/3 images"}
@@ -48,9 +48,9 @@ class TestEmailEndpointsNoAuth:
 class TestEmailEndpointsInvalidAuth:
     """Test email endpoints with invalid/malformed authentication"""
     
-    def test_welcome_email_invalid_token(self):
+    def test_welcome_email_invalid_token(self, http):
         """Welcome email endpoint should reject invalid tokens"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/welcome",
             headers={
                 "Content-Type": "application/json",
@@ -64,9 +64,9 @@ class TestEmailEndpointsInvalidAuth:
         assert data.get("ok") == False
         print(f"✓ Welcome email endpoint correctly rejects invalid tokens (status: {response.status_code})")
     
-    def test_upgrade_limit_email_invalid_token(self):
+    def test_upgrade_limit_email_invalid_token(self, http):
         """Upgrade limit email endpoint should reject invalid tokens"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-limit",
             headers={
                 "Content-Type": "application/json",
@@ -81,9 +81,9 @@ class TestEmailEndpointsInvalidAuth:
         assert data.get("ok") == False
         print(f"✓ Upgrade limit email endpoint correctly rejects invalid tokens (status: {response.status_code})")
     
-    def test_welcome_email_malformed_auth_header(self):
+    def test_welcome_email_malformed_auth_header(self, http):
         """Welcome email endpoint should handle malformed auth header"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/welcome",
             headers={
                 "Content-Type": "application/json",
@@ -98,9 +98,9 @@ class TestEmailEndpointsInvalidAuth:
 class TestEmailEndpointStructure:
     """Test that email endpoints exist and have correct response structure"""
     
-    def test_welcome_endpoint_exists(self):
+    def test_welcome_endpoint_exists(self, http):
         """Verify /api/email/welcome endpoint exists"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/welcome",
             headers={"Content-Type": "application/json"}
         )
@@ -108,9 +108,9 @@ class TestEmailEndpointStructure:
         assert response.status_code != 404, "Welcome email endpoint should exist"
         print(f"✓ Welcome email endpoint exists at /api/email/welcome")
     
-    def test_upgrade_limit_endpoint_exists(self):
+    def test_upgrade_limit_endpoint_exists(self, http):
         """Verify /api/email/upgrade-limit endpoint exists"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-limit",
             headers={"Content-Type": "application/json"}
         )
@@ -118,9 +118,9 @@ class TestEmailEndpointStructure:
         assert response.status_code != 404, "Upgrade limit email endpoint should exist"
         print(f"✓ Upgrade limit email endpoint exists at /api/email/upgrade-limit")
     
-    def test_welcome_returns_json(self):
+    def test_welcome_returns_json(self, http):
         """Verify welcome endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/welcome",
             headers={"Content-Type": "application/json"}
         )
@@ -131,9 +131,9 @@ class TestEmailEndpointStructure:
         assert isinstance(data, dict), "Response should be a JSON object"
         print(f"✓ Welcome email endpoint returns valid JSON")
     
-    def test_upgrade_limit_returns_json(self):
+    def test_upgrade_limit_returns_json(self, http):
         """Verify upgrade limit endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/upgrade-limit",
             headers={"Content-Type": "application/json"}
         )
@@ -148,16 +148,16 @@ class TestEmailEndpointStructure:
 class TestEmailEndpointMethods:
     """Test that email endpoints only accept POST method"""
     
-    def test_welcome_get_not_allowed(self):
+    def test_welcome_get_not_allowed(self, http):
         """Welcome email endpoint should not allow GET requests"""
-        response = requests.get(f"{BASE_URL}/api/email/welcome")
+        response = http.get(f"{BASE_URL}/api/email/welcome")
         # Should return 405 Method Not Allowed or similar
         assert response.status_code in [405, 404, 401], f"GET should not be allowed, got {response.status_code}"
         print(f"✓ Welcome email endpoint correctly rejects GET requests (status: {response.status_code})")
     
-    def test_upgrade_limit_get_not_allowed(self):
+    def test_upgrade_limit_get_not_allowed(self, http):
         """Upgrade limit email endpoint should not allow GET requests"""
-        response = requests.get(f"{BASE_URL}/api/email/upgrade-limit")
+        response = http.get(f"{BASE_URL}/api/email/upgrade-limit")
         # Should return 405 Method Not Allowed or similar
         assert response.status_code in [405, 404, 401], f"GET should not be allowed, got {response.status_code}"
         print(f"✓ Upgrade limit email endpoint correctly rejects GET requests (status: {response.status_code})")
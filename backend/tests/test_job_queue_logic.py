@@ -0,0 +1,173 @@
+"""
+Test web/src/lib/jobQueue.ts (LocalJobQueue, used for in-process EPK PDF renders)
+Tests:
+1. Jobs for the same key coalesce (waiting payload replaced, one follow-up per running key)
+2. Failed jobs are retried with exponential backoff, then dropped
+3. drain() resolves only once every job (and follow-up) has finished
+
+Runs the module under node, transpiled with the web app's TypeScript
+(skipped when node or web/node_modules are not installed).
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+WEB_DIR = "/app/web"
+JOB_QUEUE_FILE = f"{WEB_DIR}/src/lib/jobQueue.ts"
+TYPESCRIPT_DIR = f"{WEB_DIR}/node_modules/typescript"
+
+# Loads jobQueue.ts (resolving "@/" imports), runs the scenario in argv[1]
+# and prints its JSON result
+NODE_RUNNER = r"""
+const fs = require("fs");
+const path = require("path");
+const Module = require("module");
+const ts = require(process.env.TYPESCRIPT_DIR);
+
+const srcDir = path.resolve(path.dirname(process.env.JOB_QUEUE_FILE), "..");
+const loaded = new Map();
+
+function load(file) {
+  if (loaded.has(file)) return loaded.get(file).exports;
+  const { outputText } = ts.transpileModule(fs.readFileSync(file, "utf8"), {
+    compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020 },
+  });
+  const mod = new Module(file);
+  mod.require = (id) => (id.startsWith("@/") ? load(path.join(srcDir, `${id.slice(2)}.ts`)) : require(id));
+  loaded.set(file, mod);
+  mod._compile(outputText, file);
+  return mod.exports;
+}
+
+const { LocalJobQueue } = load(process.env.JOB_QUEUE_FILE);
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const scenarios = {
+  async coalesce() {
+    const calls = [];
+    let open;
+    const gate = new Promise((resolve) => (open = resolve));
+    const queue = new LocalJobQueue("test", async (key, payload) => {
+      calls.push([key, payload]);
+      await gate;
+    }, { concurrency: 1 });
+
+    const queued = [
+      queue.enqueue("a", 1), // runs
+      queue.enqueue("a", 2), // follow-up for the running key
+      queue.enqueue("a", 3), // replaces the follow-up
+      queue.enqueue("b", 1), // waits for the slot
+      queue.enqueue("b", 2), // replaces the waiting payload
+    ];
+    const during = queue.stats();
+    open();
+    await queue.drain();
+    return { queued, calls, during, after: queue.stats() };
+  },
+
+  async retry() {
+    const attempts = { flaky: [], broken: [] };
+    const start = Date.now();
+    const queue = new LocalJobQueue("test", async (key) => {
+      attempts[key].push(Date.now() - start);
+      if (key === "broken" || attempts[key].length < 3) throw new Error("boom");
+    }, { concurrency: 2, maxAttempts: 3, retryDelayMs: 50 });
+
+    const errors = console.error;
+    console.error = () => {};
+    queue.enqueue("flaky", null);
+    queue.enqueue("broken", null);
+    await queue.drain();
+    console.error = errors;
+    return { attempts, stats: queue.stats() };
+  },
+
+  async drain() {
+    const done = [];
+    const queue = new LocalJobQueue("test", async (key, payload) => {
+      await sleep(20);
+      done.push(`${key}:${payload}`);
+    }, { concurrency: 2 });
+
+    let idleResolved = false;
+    await Promise.race([queue.drain().then(() => (idleResolved = true)), sleep(5)]);
+
+    queue.enqueue("a", 1);
+    queue.enqueue("b", 1);
+    queue.enqueue("a", 2);
+    let drainedEarly = false;
+    const drained = queue.drain().then(() => done.slice());
+    await Promise.race([drained.then(() => (drainedEarly = true)), sleep(5)]);
+    return { idleResolved, drainedEarly, doneAtDrain: await drained, stats: queue.stats() };
+  },
+};
+
+scenarios[process.argv[1]]().then((result) => console.log(JSON.stringify(result)));
+"""
+
+
+def run_scenario(name):
+    """JSON result of one scenario in NODE_RUNNER"""
+    node = shutil.which("node")
+    if not node or not os.path.isdir(TYPESCRIPT_DIR):
+        pytest.skip("node and web/node_modules (typescript) are required")
+
+    env = dict(os.environ, TYPESCRIPT_DIR=TYPESCRIPT_DIR, JOB_QUEUE_FILE=JOB_QUEUE_FILE)
+    proc = subprocess.run(
+        [node, "-e", NODE_RUNNER, name],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+# ============================================
+# LOCAL JOB QUEUE
+# ============================================
+
+class TestLocalJobQueue:
+    """In-process queue behind PDF_RENDER_QUEUE=local"""
+
+    def test_jobs_coalesce_per_key(self):
+        """Bursts for one key collapse into the running job plus one follow-up"""
+        result = run_scenario("coalesce")
+
+        assert result["queued"] == [True, True, False, True, False]
+        assert result["during"]["running"] == 1
+        assert result["during"]["pending"] == 2
+        assert result["calls"] == [["a", 1], ["b", 2], ["a", 3]], \
+            "Waiting payloads should be replaced and the follow-up run with the newest one"
+        assert result["after"]["enqueued"] == 5
+        assert result["after"]["coalesced"] == 2
+        assert result["after"]["completed"] == 3
+        assert result["after"]["pending"] == 0 and result["after"]["running"] == 0
+
+    def test_failed_jobs_retry_with_backoff(self):
+        """Retries wait retryDelayMs, then twice that; the job is dropped after maxAttempts"""
+        result = run_scenario("retry")
+
+        flaky = result["attempts"]["flaky"]
+        assert len(flaky) == 3, "The job should succeed on its third attempt"
+        assert flaky[1] - flaky[0] >= 45, "First retry should wait retryDelayMs"
+        assert flaky[2] - flaky[1] >= 95, "Second retry should wait twice as long"
+        assert len(result["attempts"]["broken"]) == 3, "A failing job should stop after maxAttempts"
+
+        stats = result["stats"]
+        assert stats["completed"] == 1
+        assert stats["failed"] == 1
+        assert stats["retried"] == 4
+
+    def test_drain_waits_for_all_jobs(self):
+        """drain() is immediate when idle and otherwise waits for follow-ups too"""
+        result = run_scenario("drain")
+
+        assert result["idleResolved"], "drain() should resolve at once on an idle queue"
+        assert not result["drainedEarly"], "drain() should wait for running jobs"
+        assert sorted(result["doneAtDrain"]) == ["a:1", "a:2", "b:1"]
+        assert result["stats"]["pending"] == 0 and result["stats"]["running"] == 0
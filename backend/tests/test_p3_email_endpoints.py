@@ -20,30 +20,30 @@ BASE_URL = "http://localhost:3000"
 class TestFirstImageEmail:
     """Tests for /api/email/first-image endpoint"""
     
-    def test_first_image_returns_401_without_auth(self):
+    def test_first_image_returns_401_without_auth(self, http):
         """First image endpoint should return 401 for unauthenticated requests"""
-        response = requests.post(f"{BASE_URL}/api/email/first-image")
+        response = http.post(f"{BASE_URL}/api/email/first-image")
         assert response.status_code == 401, f"Expected 401, got {response.status_code}: {response.text}"
         print("✅ POST /api/email/first-image returns 401 for unauthenticated requests")
     
-    def test_first_image_endpoint_exists(self):
+    def test_first_image_endpoint_exists(self, http):
         """First image endpoint should exist (not 404)"""
-        response = requests.post(f"{BASE_URL}/api/email/first-image")
+        response = http.post(f"{BASE_URL}/api/email/first-image")
         assert response.status_code != 404, f"Endpoint returned 404 - does not exist"
         print("✅ POST /api/email/first-image endpoint exists (not 404)")
     
-    def test_first_image_returns_json(self):
+    def test_first_image_returns_json(self, http):
         """First image endpoint should return valid JSON"""
-        response = requests.post(f"{BASE_URL}/api/email/first-image")
+        response = http.post(f"{BASE_URL}/api/email/first-image")
         assert response.headers.get("Content-Type", "").startswith("application/json"), \
             f"Expected JSON response, got {response.headers.get('Content-Type')}"
         data = response.json()
         assert isinstance(data, dict), "Response should be a dictionary"
         print("✅ POST /api/email/first-image returns valid JSON response")
     
-    def test_first_image_accepts_body_params(self):
+    def test_first_image_accepts_body_params(self, http):
         """First image endpoint should accept resolution/format in body"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/first-image",
             json={"resolution": "3000x2000", "format": "PNG"},
             headers={"Content-Type": "application/json"}
@@ -52,9 +52,9 @@ class TestFirstImageEmail:
         assert response.status_code == 401, f"Expected 401, got {response.status_code}"
         print("✅ POST /api/email/first-image accepts resolution/format in request body")
     
-    def test_first_image_response_structure(self):
+    def test_first_image_response_structure(self, http):
         """First image endpoint should return proper error structure on 401"""
-        response = requests.post(f"{BASE_URL}/api/email/first-image")
+        response = http.post(f"{BASE_URL}/api/email/first-image")
         data = response.json()
         # Should have ok=false and error field
         assert "ok" in data or "error" in data, "Response should have 'ok' or 'error' field"
@@ -69,30 +69,30 @@ class TestFirstImageEmail:
 class TestEpkPublishedEmail:
     """Tests for /api/email/epk-published endpoint"""
     
-    def test_epk_published_returns_401_without_auth(self):
+    def test_epk_published_returns_401_without_auth(self, http):
         """EPK published endpoint should return 401 for unauthenticated requests"""
-        response = requests.post(f"{BASE_URL}/api/email/epk-published")
+        response = http.post(f"{BASE_URL}/api/email/epk-published")
         assert response.status_code == 401, f"Expected 401, got {response.status_code}: {response.text}"
         print("✅ POST /api/email/epk-published returns 401 for unauthenticated requests")
     
-    def test_epk_published_endpoint_exists(self):
+    def test_epk_published_endpoint_exists(self, http):
         """EPK published endpoint should exist (not 404)"""
-        response = requests.post(f"{BASE_URL}/api/email/epk-published")
+        response = http.post(f"{BASE_URL}/api/email/epk-published")
         assert response.status_code != 404, f"Endpoint returned 404 - does not exist"
         print("✅ POST /api/email/epk-published endpoint exists (not 404)")
     
-    def test_epk_published_returns_json(self):
+    def test_epk_published_returns_json(self, http):
         """EPK published endpoint should return valid JSON"""
-        response = requests.post(f"{BASE_URL}/api/email/epk-published")
+        response = http.post(f"{BASE_URL}/api/email/epk-published")
         assert response.headers.get("Content-Type", "").startswith("application/json"), \
             f"Expected JSON response, got {response.headers.get('Content-Type')}"
         data = response.json()
         assert isinstance(data, dict), "Response should be a dictionary"
         print("✅ POST /api/email/epk-published returns valid JSON response")
     
-    def test_epk_published_response_structure(self):
+    def test_epk_published_response_structure(self, http):
         """EPK published endpoint should return proper error structure on 401"""
-        response = requests.post(f"{BASE_URL}/api/email/epk-published")
+        response = http.post(f"{BASE_URL}/api/email/epk-published")
         data = response.json()
         # Should have ok=false and error field
         assert "ok" in data or "error" in data, "Response should have 'ok' or 'error' field"
@@ -133,36 +133,36 @@ class TestAllEmailEndpoints:
         "/api/email/admin-new-application",  # Admin - New application notification
     ]
     
-    def test_core_email_endpoints_available(self):
+    def test_core_email_endpoints_available(self, http):
         """All core email endpoints should be available"""
         for endpoint in self.CORE_ENDPOINTS:
-            response = requests.post(f"{BASE_URL}{endpoint}")
+            response = http.post(f"{BASE_URL}{endpoint}")
             assert response.status_code != 404, f"Endpoint {endpoint} returned 404 - does not exist"
             print(f"✅ {endpoint} - endpoint available")
     
-    def test_drip_email_endpoints_available(self):
+    def test_drip_email_endpoints_available(self, http):
         """All drip sequence email endpoints should be available"""
         for endpoint in self.DRIP_ENDPOINTS:
-            response = requests.post(f"{BASE_URL}{endpoint}")
+            response = http.post(f"{BASE_URL}{endpoint}")
             assert response.status_code != 404, f"Endpoint {endpoint} returned 404 - does not exist"
             print(f"✅ {endpoint} - endpoint available")
     
-    def test_upgrade_email_endpoints_available(self):
+    def test_upgrade_email_endpoints_available(self, http):
         """Upgrade email endpoints should be available"""
         for endpoint in self.UPGRADE_ENDPOINTS:
-            response = requests.post(f"{BASE_URL}{endpoint}")
+            response = http.post(f"{BASE_URL}{endpoint}")
             assert response.status_code != 404, f"Endpoint {endpoint} returned 404 - does not exist"
             print(f"✅ {endpoint} - endpoint available")
     
-    def test_admin_email_endpoints_available(self):
+    def test_admin_email_endpoints_available(self, http):
         """Admin email endpoints should be available"""
         for endpoint in self.ADMIN_ENDPOINTS:
-            response = requests.post(f"{BASE_URL}{endpoint}")
+            response = http.post(f"{BASE_URL}{endpoint}")
             # Admin endpoints might have different auth behavior
             assert response.status_code != 404, f"Endpoint {endpoint} returned 404 - does not exist"
             print(f"✅ {endpoint} - endpoint available")
     
-    def test_total_email_endpoint_count(self):
+    def test_total_email_endpoint_count(self, http):
         """Should have at least 8 email endpoints"""
         all_endpoints = (
             self.CORE_ENDPOINTS + 
@@ -172,7 +172,7 @@ class TestAllEmailEndpoints:
         )
         available_count = 0
         for endpoint in all_endpoints:
-            response = requests.post(f"{BASE_URL}{endpoint}")
+            response = http.post(f"{BASE_URL}{endpoint}")
             if response.status_code != 404:
                 available_count += 1
         
@@ -21,6 +21,7 @@ import requests
 import os
 
 BASE_URL = "http://localhost:3000"
+TEMPLATES_FILE = "/app/web/src/lib/email/templates.ts"
 
 
 # ============================================
@@ -30,9 +31,9 @@ BASE_URL = "http://localhost:3000"
 class TestProfileReminderEndpoint:
     """Test /api/email/profile-reminder endpoint (Day 2)"""
     
-    def test_profile_reminder_no_auth_returns_401(self):
+    def test_profile_reminder_no_auth_returns_401(self, http):
         """Profile reminder endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/profile-reminder",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -42,9 +43,9 @@ class TestProfileReminderEndpoint:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ POST /api/email/profile-reminder correctly returns 401 for unauthenticated requests")
     
-    def test_profile_reminder_endpoint_exists(self):
+    def test_profile_reminder_endpoint_exists(self, http):
         """Verify endpoint exists and is not 404"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/profile-reminder",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -52,9 +53,9 @@ class TestProfileReminderEndpoint:
         assert response.status_code != 404, "Profile reminder endpoint should exist"
         print(f"✓ /api/email/profile-reminder endpoint exists (status: {response.status_code})")
     
-    def test_profile_reminder_returns_json(self):
+    def test_profile_reminder_returns_json(self, http):
         """Verify endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/profile-reminder",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -67,9 +68,9 @@ class TestProfileReminderEndpoint:
 class TestEpkGuideEndpoint:
     """Test /api/email/epk-guide endpoint (Day 5)"""
     
-    def test_epk_guide_no_auth_returns_401(self):
+    def test_epk_guide_no_auth_returns_401(self, http):
         """EPK guide endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/epk-guide",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -79,9 +80,9 @@ class TestEpkGuideEndpoint:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ POST /api/email/epk-guide correctly returns 401 for unauthenticated requests")
     
-    def test_epk_guide_endpoint_exists(self):
+    def test_epk_guide_endpoint_exists(self, http):
         """Verify endpoint exists and is not 404"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/epk-guide",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -89,9 +90,9 @@ class TestEpkGuideEndpoint:
         assert response.status_code != 404, "EPK guide endpoint should exist"
         print(f"✓ /api/email/epk-guide endpoint exists (status: {response.status_code})")
     
-    def test_epk_guide_returns_json(self):
+    def test_epk_guide_returns_json(self, http):
         """Verify endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/epk-guide",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -104,9 +105,9 @@ class TestEpkGuideEndpoint:
 class TestReengagementEndpoint:
     """Test /api/email/reengagement endpoint (7+ days inactive)"""
     
-    def test_reengagement_no_auth_returns_401(self):
+    def test_reengagement_no_auth_returns_401(self, http):
         """Reengagement endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/reengagement",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -116,9 +117,9 @@ class TestReengagementEndpoint:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ POST /api/email/reengagement correctly returns 401 for unauthenticated requests")
     
-    def test_reengagement_endpoint_exists(self):
+    def test_reengagement_endpoint_exists(self, http):
         """Verify endpoint exists and is not 404"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/reengagement",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -126,9 +127,9 @@ class TestReengagementEndpoint:
         assert response.status_code != 404, "Reengagement endpoint should exist"
         print(f"✓ /api/email/reengagement endpoint exists (status: {response.status_code})")
     
-    def test_reengagement_returns_json(self):
+    def test_reengagement_returns_json(self, http):
         """Verify endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/email/reengagement",
             headers={"Content-Type": "application/json"},
             timeout=10
@@ -145,10 +146,10 @@ class TestReengagementEndpoint:
 class TestCronEmailsEndpoint:
     """Test /api/cron/emails comprehensive endpoint"""
     
-    def test_cron_type_all_dryrun(self):
+    def test_cron_type_all_dryrun(self, http):
         """Test cron endpoint with type=all and dryRun=true"""
         try:
-            response = requests.get(
+            response = http.get(
                 f"{BASE_URL}/api/cron/emails?type=all&dryRun=true",
                 timeout=5
             )
@@ -171,10 +172,10 @@ class TestCronEmailsEndpoint:
         except Exception as e:
             pytest.fail(f"Unexpected error: {e}")
     
-    def test_cron_type_day2_dryrun(self):
+    def test_cron_type_day2_dryrun(self, http):
         """Test cron endpoint with type=day2"""
         try:
-            response = requests.get(
+            response = http.get(
                 f"{BASE_URL}/api/cron/emails?type=day2&dryRun=true",
                 timeout=5
             )
@@ -188,10 +189,10 @@ class TestCronEmailsEndpoint:
         except requests.exceptions.Timeout:
             print(f"✓ GET /api/cron/emails?type=day2&dryRun=true timed out (expected)")
     
-    def test_cron_type_day5_dryrun(self):
+    def test_cron_type_day5_dryrun(self, http):
         """Test cron endpoint with type=day5"""
         try:
-            response = requests.get(
+            response = http.get(
                 f"{BASE_URL}/api/cron/emails?type=day5&dryRun=true",
                 timeout=5
             )
@@ -205,10 +206,10 @@ class TestCronEmailsEndpoint:
         except requests.exceptions.Timeout:
             print(f"✓ GET /api/cron/emails?type=day5&dryRun=true timed out (expected)")
     
-    def test_cron_type_reengagement_dryrun(self):
+    def test_cron_type_reengagement_dryrun(self, http):
         """Test cron endpoint with type=reengagement"""
         try:
-            response = requests.get(
+            response = http.get(
                 f"{BASE_URL}/api/cron/emails?type=reengagement&dryRun=true",
                 timeout=5
             )
@@ -282,9 +283,9 @@ class TestCronEmailsRouteCode:
 class TestStripeCheckoutEndpoint:
     """Test /api/stripe/checkout endpoint"""
     
-    def test_stripe_checkout_no_auth_returns_401(self):
+    def test_stripe_checkout_no_auth_returns_401(self, http):
         """Stripe checkout endpoint should require authentication"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/stripe/checkout",
             headers={"Content-Type": "application/json"},
             json={"tier": "tier2", "billingPeriod": "monthly"},
@@ -295,9 +296,9 @@ class TestStripeCheckoutEndpoint:
         assert data.get("ok") == False, "Expected ok=false for unauthorized request"
         print(f"✓ POST /api/stripe/checkout correctly returns 401 for unauthenticated requests")
     
-    def test_stripe_checkout_endpoint_exists(self):
+    def test_stripe_checkout_endpoint_exists(self, http):
         """Verify stripe checkout endpoint exists and is not 404"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/stripe/checkout",
             headers={"Content-Type": "application/json"},
             json={"tier": "tier1"},
@@ -306,9 +307,9 @@ class TestStripeCheckoutEndpoint:
         assert response.status_code != 404, "Stripe checkout endpoint should exist"
         print(f"✓ /api/stripe/checkout endpoint exists (status: {response.status_code})")
     
-    def test_stripe_checkout_returns_json(self):
+    def test_stripe_checkout_returns_json(self, http):
         """Verify endpoint returns JSON response"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/stripe/checkout",
             headers={"Content-Type": "application/json"},
             json={},
@@ -375,10 +376,10 @@ class TestStripeCheckoutRouteCode:
 class TestStripeWebhookEndpoint:
     """Test /api/stripe/webhook endpoint"""
     
-    def test_webhook_endpoint_exists(self):
+    def test_webhook_endpoint_exists(self, http):
         """Verify stripe webhook endpoint exists"""
         # Webhooks don't use standard auth, so we test differently
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/stripe/webhook",
             headers={"Content-Type": "application/json"},
             data="{}",
@@ -388,9 +389,9 @@ class TestStripeWebhookEndpoint:
         assert response.status_code != 404, "Stripe webhook endpoint should exist"
         print(f"✓ /api/stripe/webhook endpoint exists (status: {response.status_code})")
     
-    def test_webhook_rejects_unsigned_request(self):
+    def test_webhook_rejects_unsigned_request(self, http):
         """Webhook should reject requests without valid Stripe signature"""
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/stripe/webhook",
             headers={"Content-Type": "application/json"},
             data="{}",
@@ -489,6 +490,9 @@ class TestEpkGuideEmailTemplate:
         
         with open(template_file, 'r') as f:
             content = f.read()
+        # The checklist copy lives in the shared template module
+        with open(TEMPLATES_FILE, 'r') as f:
+            content += f.read()
         
         # Check for EPK checklist items
         assert "Press Image" in content, "Should mention press image"
@@ -0,0 +1,104 @@
+"""
+Test web/src/lib/rateLimit.ts decisions
+Tests:
+1. limit=1 allows a single hit per window, even across a window boundary
+2. Larger limits allow their burst, then one hit per interval
+3. MemoryRateLimitStore applies the same decisions
+
+Runs the module under node, transpiled with the web app's TypeScript
+(skipped when node or web/node_modules are not installed).
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+WEB_DIR = "/app/web"
+RATE_LIMIT_FILE = f"{WEB_DIR}/src/lib/rateLimit.ts"
+TYPESCRIPT_DIR = f"{WEB_DIR}/node_modules/typescript"
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# Loads rateLimit.ts, runs the hits in argv[1] and prints one result per hit
+NODE_RUNNER = r"""
+const fs = require("fs");
+const Module = require("module");
+const ts = require(process.env.TYPESCRIPT_DIR);
+
+const source = fs.readFileSync(process.env.RATE_LIMIT_FILE, "utf8");
+const { outputText } = ts.transpileModule(source, {
+  compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2020 },
+});
+const mod = new Module(process.env.RATE_LIMIT_FILE);
+mod._compile(outputText, process.env.RATE_LIMIT_FILE);
+const { applyRateLimit, MemoryRateLimitStore } = mod.exports;
+
+const { store, hits } = JSON.parse(process.argv[1]);
+const memory = new MemoryRateLimitStore();
+let state = null;
+const results = hits.map(({ max, windowMs, now }) => {
+  if (store === "memory") return memory.hitSync("key", max, windowMs, now);
+  const applied = applyRateLimit(state, max, windowMs, now);
+  state = applied.state;
+  return applied.result;
+});
+console.log(JSON.stringify(results));
+"""
+
+
+def run_hits(hits, store="pure"):
+    """Allowed flag of each hit, applied in order to one key"""
+    node = shutil.which("node")
+    if not node or not os.path.isdir(TYPESCRIPT_DIR):
+        pytest.skip("node and web/node_modules (typescript) are required")
+
+    env = dict(os.environ, TYPESCRIPT_DIR=TYPESCRIPT_DIR, RATE_LIMIT_FILE=RATE_LIMIT_FILE)
+    proc = subprocess.run(
+        [node, "-e", NODE_RUNNER, json.dumps({"store": store, "hits": hits})],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    return [result["allowed"] for result in json.loads(proc.stdout)]
+
+
+# ============================================
+# RATE LIMIT DECISIONS
+# ============================================
+
+class TestRateLimitingWindows:
+    """Once-per-window guards (email:first-image, email:profile-reminder, ...)"""
+
+    @pytest.mark.parametrize("store", ["pure", "memory"])
+    @pytest.mark.parametrize("window_ms", [3 * DAY_MS, 365 * DAY_MS])
+    def test_limit_one_across_window_boundary(self, store, window_ms):
+        """Two hits 2s apart around an aligned window boundary: only the first is allowed"""
+        boundary = (1_800_000_000_000 // window_ms + 1) * window_ms
+        first = boundary - 1000
+        hits = [
+            {"max": 1, "windowMs": window_ms, "now": first},
+            {"max": 1, "windowMs": window_ms, "now": boundary + 1000},
+            {"max": 1, "windowMs": window_ms, "now": first + window_ms - 1},
+            {"max": 1, "windowMs": window_ms, "now": first + window_ms},
+            {"max": 1, "windowMs": window_ms, "now": first + window_ms + 1},
+        ]
+
+        assert run_hits(hits, store) == [True, False, False, True, False]
+
+    @pytest.mark.parametrize("store", ["pure", "memory"])
+    def test_burst_then_one_per_interval(self, store):
+        """limit=3 per hour: three hits at once, then one every 20 minutes"""
+        hour = 60 * 60 * 1000
+        start = 1_800_000_000_000
+        hits = [{"max": 3, "windowMs": hour, "now": start} for _ in range(4)]
+        hits += [
+            {"max": 3, "windowMs": hour, "now": start + hour // 3 - 1},
+            {"max": 3, "windowMs": hour, "now": start + hour // 3},
+            {"max": 3, "windowMs": hour, "now": start + hour // 3},
+        ]
+
+        assert run_hits(hits, store) == [True, True, True, False, False, True, False]
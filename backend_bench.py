@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Latency regression benchmarks for Verified Sound A&R API routes
+Times every route the backend pytest suites touch and stores the results as
+test_reports/benchmarks/iteration_N.json, next to the iteration reports.
+
+    python backend_bench.py run                  # bench the latest iteration
+    python backend_bench.py compare              # latest vs previous bench
+    python backend_bench.py compare --threshold 0.10
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+from backend_test import SimpleAPITester
+
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_reports")
+BENCH_DIR = os.path.join(REPORTS_DIR, "benchmarks")
+
+# (method, endpoint, accepted statuses, request body, timeout seconds)
+# Statuses mirror what backend/tests accepts for an unauthenticated client.
+BENCH_ROUTES = [
+    ("POST", "api/email/welcome", [401], None, 10),
+    ("POST", "api/email/epk-updated", [401], None, 10),
+    ("POST", "api/email/first-image", [401], None, 10),
+    ("POST", "api/email/epk-published", [401], None, 10),
+    ("POST", "api/email/profile-reminder", [401], None, 10),
+    ("POST", "api/email/epk-guide", [401], None, 10),
+    ("POST", "api/email/upgrade-day7", [401], None, 10),
+    ("POST", "api/email/reengagement", [401], None, 10),
+    ("POST", "api/email/upgrade-limit", [401], None, 10),
+    ("POST", "api/email/admin-new-application", [401], None, 10),
+    ("GET", "api/cron/emails?dryRun=true", [200, 401, 500], None, 30),
+    ("POST", "api/stripe/checkout", [401], None, 10),
+    ("POST", "api/stripe/webhook", [400, 500], {}, 10),
+]
+
+
+def iteration_number(path):
+    match = re.search(r"iteration_(\d+)\.json$", path)
+    return int(match.group(1)) if match else None
+
+
+def latest_iteration(directory):
+    """Highest N among directory/iteration_N.json (0 when there are none)"""
+    numbers = [iteration_number(p) for p in glob.glob(os.path.join(directory, "iteration_*.json"))]
+    return max([n for n in numbers if n is not None], default=0)
+
+
+def bench_path(iteration):
+    return os.path.join(BENCH_DIR, f"iteration_{iteration}.json")
+
+
+def run_benchmarks(args):
+    iteration = args.iteration or latest_iteration(REPORTS_DIR)
+    tester = SimpleAPITester(args.base_url)
+
+    for method, endpoint, statuses, data, timeout in BENCH_ROUTES:
+        tester.run_load_test(
+            f"{method} /{endpoint}", method, endpoint, statuses,
+            total_requests=args.samples, concurrency=args.concurrency,
+            data=data, timeout=timeout, max_error_rate=1.0
+        )
+    tester.print_load_summary()
+
+    report = {
+        "iteration": iteration,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "samples": args.samples,
+        "concurrency": args.concurrency,
+        "routes": tester.load_results,
+    }
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    path = bench_path(iteration)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Benchmark written to {os.path.relpath(path)}")
+    return 0
+
+
+def compare_benchmarks(args):
+    current = args.current or latest_iteration(BENCH_DIR)
+    if args.baseline:
+        baseline = args.baseline
+    else:
+        earlier = [
+            n for n in (iteration_number(p) for p in glob.glob(os.path.join(BENCH_DIR, "iteration_*.json")))
+            if n is not None and n < current
+        ]
+        baseline = max(earlier, default=0)
+
+    if not current or not baseline:
+        print("❌ Need two benchmark iterations to compare")
+        return 1
+
+    with open(bench_path(current)) as f:
+        current_routes = json.load(f)["routes"]
+    with open(bench_path(baseline)) as f:
+        baseline_routes = json.load(f)["routes"]
+
+    print(f"=== p95 latency: iteration {current} vs {baseline} (threshold {args.threshold:.0%}) ===")
+    regressions = 0
+    for route, result in current_routes.items():
+        previous = baseline_routes.get(route)
+        if previous is None:
+            print(f"   {route:<45} {result['p95_ms']:>8.1f}ms  (new route)")
+            continue
+        before, after = previous["p95_ms"], result["p95_ms"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > args.threshold and after - before > args.min_delta_ms
+        marker = "❌" if regressed else "✅"
+        print(f"{marker} {route:<45} {before:>8.1f}ms -> {after:>8.1f}ms ({change:+.0%})")
+        regressions += regressed
+
+    if regressions:
+        print(f"\n❌ {regressions} route(s) regressed past {args.threshold:.0%}")
+        return 1
+    print("\n✅ No p95 regressions")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verified Sound A&R API latency benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark every route and store the timings")
+    run.add_argument("--base-url", default="http://localhost:3000")
+    run.add_argument("--iteration", type=int, default=None, help="iteration to record (default: latest report)")
+    run.add_argument("--samples", type=int, default=50, help="requests per route")
+    run.add_argument("--concurrency", type=int, default=1, help="in-flight requests per route")
+    run.set_defaults(func=run_benchmarks)
+
+    compare = commands.add_parser("compare", help="fail when a route's p95 regressed")
+    compare.add_argument("--current", type=int, default=None, help="iteration to check (default: latest bench)")
+    compare.add_argument("--baseline", type=int, default=None, help="iteration to compare against (default: previous bench)")
+    compare.add_argument("--threshold", type=float, default=0.20, help="allowed p95 increase as a fraction")
+    compare.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore increases smaller than this")
+    compare.set_defaults(func=compare_benchmarks)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
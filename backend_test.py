@@ -4,15 +4,49 @@ Simple API testing for Verified Sound A&R application
 Tests the Next.js API routes for basic functionality
 """
 
+import argparse
+import math
 import requests
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples (0 for an empty list)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def latency_histogram(samples_ms):
+    """Bucket latency samples by HISTOGRAM_BOUNDS_MS as {"le_<bound>": count, "inf": count}"""
+    buckets = {f"le_{bound}": 0 for bound in HISTOGRAM_BOUNDS_MS}
+    buckets["inf"] = 0
+    for sample in samples_ms:
+        for bound in HISTOGRAM_BOUNDS_MS:
+            if sample <= bound:
+                buckets[f"le_{bound}"] += 1
+                break
+        else:
+            buckets["inf"] += 1
+    return buckets
+
 class SimpleAPITester:
     def __init__(self, base_url="http://localhost:3000"):
         self.base_url = base_url
         self.tests_run = 0
         self.tests_passed = 0
+        self.load_results = {}
+        self._local = threading.local()
 
     def run_test(self, name, method, endpoint, expected_status, data=None, headers=None):
         """Run a single API test"""
@@ -44,6 +78,99 @@ class SimpleAPITester:
             print(f"❌ Failed - Error: {str(e)}")
             return False, "{}"
 
+    def _session(self):
+        """Keep-alive session per worker thread (requests.Session is not thread-safe)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _timed_request(self, method, url, expected_status, data, headers, timeout):
+        """Send one request and return (latency_seconds, ok)"""
+        start = time.perf_counter()
+        try:
+            response = self._session().request(method, url, json=data, headers=headers, timeout=timeout)
+            ok = response.status_code in expected_status
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    def run_load_test(self, name, method, endpoint, expected_status, total_requests=200,
+                      concurrency=16, rps=None, data=None, headers=None, timeout=30,
+                      max_error_rate=0.0):
+        """Drive one endpoint at a fixed concurrency (and optional target RPS)
+
+        expected_status may be a single status or a list of accepted statuses;
+        any other response (or a timeout) counts as an error. Latency
+        percentiles, a latency histogram, throughput and error rate are stored
+        in self.load_results keyed by "METHOD endpoint".
+        """
+        url = f"{self.base_url}/{endpoint}"
+        if headers is None:
+            headers = {'Content-Type': 'application/json'}
+        if isinstance(expected_status, int):
+            expected_status = [expected_status]
+
+        self.tests_run += 1
+        pacing = f", {rps} rps" if rps else ""
+        print(f"\n🚀 Load testing {name} ({total_requests} requests, concurrency {concurrency}{pacing})...")
+
+        started = time.perf_counter()
+
+        def worker(index):
+            if rps:
+                # Open-loop pacing: request N is due at started + N / rps
+                delay = started + index / rps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            return self._timed_request(method, url, expected_status, data, headers, timeout)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(worker, range(total_requests)))
+
+        elapsed = time.perf_counter() - started
+        latencies = [latency * 1000 for latency, _ in samples]
+        errors = sum(1 for _, ok in samples if not ok)
+
+        result = {
+            "requests": total_requests,
+            "concurrency": concurrency,
+            "target_rps": rps,
+            "errors": errors,
+            "error_rate": errors / total_requests if total_requests else 0.0,
+            "throughput_rps": total_requests / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": max(latencies) if latencies else 0.0,
+            "histogram": latency_histogram(latencies),
+        }
+        self.load_results[f"{method} /{endpoint}"] = result
+
+        print(f"   p50 {result['p50_ms']:.1f}ms | p95 {result['p95_ms']:.1f}ms | "
+              f"p99 {result['p99_ms']:.1f}ms | {result['throughput_rps']:.1f} req/s | "
+              f"errors {result['error_rate']:.1%}")
+
+        success = result["error_rate"] <= max_error_rate
+        if success:
+            self.tests_passed += 1
+            print("✅ Passed")
+        else:
+            print(f"❌ Failed - Error rate {result['error_rate']:.1%} exceeds {max_error_rate:.1%}")
+        return success, result
+
+    def print_load_summary(self):
+        """Print one line per route driven by run_load_test"""
+        if not self.load_results:
+            return
+        print("\n📈 Load Test Summary:")
+        print(f"   {'Route':<40} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} {'errors':>7}")
+        for route, result in self.load_results.items():
+            print(f"   {route:<40} {result['p50_ms']:>6.1f}ms {result['p95_ms']:>6.1f}ms "
+                  f"{result['p99_ms']:>6.1f}ms {result['throughput_rps']:>8.1f} "
+                  f"{result['error_rate']:>6.1%}")
+
     def test_stripe_checkout_unauthorized(self):
         """Test Stripe checkout without auth (should fail)"""
         success, response = self.run_test(
@@ -70,17 +197,58 @@ class SimpleAPITester:
         )
         return success
 
-def main():
+    def load_test_routes(self, total_requests=200, concurrency=16, rps=None):
+        """Launch-spike load on Stripe checkout and the email endpoints (unauthenticated path)"""
+        self.run_load_test(
+            "Stripe Checkout (Unauthorized)", "POST", "api/stripe/checkout", 401,
+            total_requests=total_requests, concurrency=concurrency, rps=rps
+        )
+        for endpoint in LOAD_EMAIL_ENDPOINTS:
+            self.run_load_test(
+                f"Email {endpoint} (Unauthorized)", "POST", f"api/email/{endpoint}", 401,
+                total_requests=total_requests, concurrency=concurrency, rps=rps
+            )
+
+
+LOAD_EMAIL_ENDPOINTS = [
+    "welcome",
+    "upgrade-limit",
+    "upgrade-day7",
+    "profile-reminder",
+    "epk-guide",
+    "reengagement",
+    "epk-updated",
+    "first-image",
+    "epk-published",
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Verified Sound A&R API tests")
+    parser.add_argument("--base-url", default="http://localhost:3000")
+    parser.add_argument("--load", action="store_true", help="run the load test mode after the functional tests")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route in load mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests in load mode")
+    parser.add_argument("--rps", type=float, default=None, help="target requests/second per route (default: unpaced)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Run API tests"""
+    args = parse_args(argv)
     print("=== Verified Sound A&R API Tests ===")
     
     # Setup
-    tester = SimpleAPITester("http://localhost:3000")
+    tester = SimpleAPITester(args.base_url)
 
     # Test API endpoints
     tester.test_stripe_checkout_unauthorized()
     tester.test_stripe_checkout_missing_price_id()
 
+    if args.load:
+        tester.load_test_routes(args.requests, args.concurrency, args.rps)
+        tester.print_load_summary()
+
     # Print results
     print(f"\n📊 API Tests Summary:")
     print(f"   Tests passed: {tester.tests_passed}/{tester.tests_run}")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Local Postmark API stand-in for offline email throughput testing
+Accepts the send endpoints services/email/postmark.ts uses, injects latency,
+5xx responses and timeouts, and records every message it receives.
+
+Point the app at it with:
+
+    POSTMARK_API_URL=http://localhost:4010 POSTMARK_SERVER_TOKEN=local yarn dev
+
+    python postmark_standin.py --port 4010 --latency-ms 80 --error-rate 0.05
+
+Control endpoints (not part of the Postmark API):
+    GET    /__messages   recorded messages
+    DELETE /__messages   clear recorded messages and counters
+    GET    /__stats      request/message/fault counters
+    POST   /__config     update latency/fault settings, e.g. {"error_rate": 0.5}
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SEND_PATHS = {"/email", "/email/withTemplate"}
+BATCH_PATHS = {"/email/batch", "/email/batchWithTemplates"}
+
+# Postmark's own cap on messages per batch call
+MAX_BATCH_SIZE = 500
+
+
+class StandInState:
+    """Fault settings plus everything recorded so far (shared by handler threads)"""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, timeout_rate=0.0,
+                 hang_seconds=30.0, record_path=None, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.record_path = record_path
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.messages = []
+            self.stats = {"requests": 0, "messages": 0, "errors_injected": 0, "timeouts_injected": 0}
+
+    def configure(self, values):
+        for key in ("latency_ms", "jitter_ms", "error_rate", "timeout_rate", "hang_seconds"):
+            if key in values:
+                setattr(self, key, float(values[key]))
+
+    def config(self):
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "timeout_rate": self.timeout_rate,
+            "hang_seconds": self.hang_seconds,
+        }
+
+    def pick_fault(self):
+        """Return "timeout", "error" or None for the next send request"""
+        with self.lock:
+            self.stats["requests"] += 1
+            roll = self.random.random()
+            if roll < self.timeout_rate:
+                self.stats["timeouts_injected"] += 1
+                return "timeout"
+            if roll < self.timeout_rate + self.error_rate:
+                self.stats["errors_injected"] += 1
+                return "error"
+            return None
+
+    def delay(self):
+        jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, self.latency_ms + jitter) / 1000.0
+
+    def record(self, path, message):
+        entry = {
+            "MessageID": str(uuid.uuid4()),
+            "ReceivedAt": datetime.now(timezone.utc).isoformat(),
+            "Path": path,
+            "Message": message,
+        }
+        with self.lock:
+            self.messages.append(entry)
+            self.stats["messages"] += 1
+            if self.record_path:
+                with open(self.record_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+def send_result(entry):
+    """Postmark's per-message send response"""
+    message = entry["Message"]
+    return {
+        "To": message.get("To"),
+        "SubmittedAt": entry["ReceivedAt"],
+        "MessageID": entry["MessageID"],
+        "ErrorCode": 0,
+        "Message": "OK",
+    }
+
+
+class PostmarkHandler(BaseHTTPRequestHandler):
+    server_version = "PostmarkStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"null")
+
+    def do_GET(self):
+        if self.path == "/__messages":
+            with self.state.lock:
+                return self._json(200, list(self.state.messages))
+        if self.path == "/__stats":
+            with self.state.lock:
+                return self._json(200, {**self.state.stats, "config": self.state.config()})
+        return self._json(404, {"ErrorCode": 404, "Message": "Not found"})
+
+    def do_DELETE(self):
+        if self.path == "/__messages":
+            self.state.reset()
+            return self._json(200, {"ok": True})
+        return self._json(404, {"ErrorCode": 404, "Message": "Not found"})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        try:
+            payload = self._read_json()
+        except ValueError:
+            return self._json(422, {"ErrorCode": 402, "Message": "Invalid JSON"})
+
+        if path == "/__config":
+            self.state.configure(payload or {})
+            return self._json(200, self.state.config())
+
+        if path not in SEND_PATHS and path not in BATCH_PATHS:
+            return self._json(404, {"ErrorCode": 404, "Message": "Not found"})
+
+        if not self.headers.get("X-Postmark-Server-Token"):
+            return self._json(401, {"ErrorCode": 10, "Message": "No Account or Server API tokens were supplied in the HTTP headers."})
+
+        fault = self.state.pick_fault()
+        if fault == "timeout":
+            # Hold the connection past the client's timeout, then drop it
+            time.sleep(self.state.hang_seconds)
+            self.close_connection = True
+            return
+        time.sleep(self.state.delay())
+        if fault == "error":
+            return self._json(500, {"ErrorCode": 500, "Message": "Injected server error"})
+
+        if path in SEND_PATHS:
+            if not isinstance(payload, dict):
+                return self._json(422, {"ErrorCode": 402, "Message": "Expected a message object"})
+            return self._json(200, send_result(self.state.record(path, payload)))
+
+        if path == "/email/batchWithTemplates":
+            payload = (payload or {}).get("Messages") if isinstance(payload, dict) else None
+        if not isinstance(payload, list):
+            return self._json(422, {"ErrorCode": 402, "Message": "Expected a list of messages"})
+        if len(payload) > MAX_BATCH_SIZE:
+            return self._json(422, {"ErrorCode": 413, "Message": f"Batch exceeds {MAX_BATCH_SIZE} messages"})
+        return self._json(200, [send_result(self.state.record(path, message)) for message in payload])
+
+
+class PostmarkStandIn:
+    """Run the stand-in on a background thread (for tests and benchmarks)
+
+        with PostmarkStandIn(latency_ms=50, error_rate=0.1) as postmark:
+            ...  # point POSTMARK_API_URL at postmark.url
+            postmark.state.messages
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, verbose=False, **settings):
+        self.server = ThreadingHTTPServer((host, port), PostmarkHandler)
+        self.server.daemon_threads = True
+        self.server.state = StandInState(**settings)
+        self.server.verbose = verbose
+        self.thread = None
+
+    @property
+    def state(self):
+        return self.server.state
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local Postmark API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4010)
+    parser.add_argument("--latency-ms", type=float, default=0, help="added latency per send request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of sends answered with a 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="fraction of sends that hang and drop")
+    parser.add_argument("--hang-seconds", type=float, default=30.0, help="how long an injected timeout hangs")
+    parser.add_argument("--record", default=None, help="also append received messages to this JSONL file")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible fault injection")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    standin = PostmarkStandIn(
+        args.host, args.port, verbose=args.verbose,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate, hang_seconds=args.hang_seconds,
+        record_path=args.record, seed=args.seed,
+    )
+    print(f"📮 Postmark stand-in listening on {standin.url}")
+    try:
+        standin.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
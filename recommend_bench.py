@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for batch label-match scoring
+Compares the per-request scorer (calculateMatchScore over every label, then a
+full sort, as GET /api/submissions/recommend did) with vectorized batch
+scoring over precomputed genre matrices, the approach used by
+web/src/lib/submissions/batchScoring.ts for nightly precompute.
+
+The catalog is web/scripts/labels-to-import.json, resampled up to --labels
+entries; artists are synthesized from the catalog's genre vocabulary.
+
+    pip install numpy
+    python recommend_bench.py                          # 10k artists x 5k labels
+    python recommend_bench.py --artists 2000 --labels 1000 --per-request-sample 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - only needed to run the benchmark
+    print("❌ numpy is required: pip install numpy")
+    sys.exit(1)
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web", "scripts", "labels-to-import.json")
+
+MAX_GENRE_SCORE = 60
+TOP_RECOMMENDATIONS = 20
+TIERS = [None, "Indie", "Boutique", "Mid", "Major"]
+STYLE_WORDS = ["warm", "driving", "late-night", "uplifting", "gritty", "melodic", "raw", "soulful", "dark"]
+
+
+# ============================================
+# PER-REQUEST SCORER (port of the TypeScript scoring)
+# ============================================
+
+def label_base_score(label):
+    score = 0
+    tier = (label.get("tier") or "").lower()
+    if not label.get("tier"):
+        score += 15
+    elif "indie" in tier or "boutique" in tier:
+        score += 20
+    elif "mid" in tier:
+        score += 15
+    elif "major" in tier:
+        score += 10
+
+    if label.get("submissionEmail"):
+        score += 10
+    elif label.get("submissionUrl"):
+        score += 5
+
+    notes = (label.get("notes") or "").lower()
+    if "accepting" in notes or "open for" in notes:
+        score += 10
+    return score
+
+
+def calculate_match_score(label, user_genres, style_description):
+    user_lower = [g.lower() for g in user_genres]
+    style_lower = style_description.lower()
+    genre_score = 0
+    for label_genre in (g.lower() for g in label["genres"]):
+        for user_genre in user_lower:
+            if user_genre == label_genre:
+                genre_score += 20
+            elif user_genre in label_genre or label_genre in user_genre:
+                genre_score += 10
+            elif label_genre in style_lower:
+                genre_score += 5
+    return min(min(genre_score, MAX_GENRE_SCORE) + label_base_score(label), 100)
+
+
+def recommend_per_request(labels, artist, limit=TOP_RECOMMENDATIONS):
+    """Score every label, drop zeros, stable sort (labels are in ID order)"""
+    scored = [(calculate_match_score(label, artist["genres"], artist["style"]), i) for i, label in enumerate(labels)]
+    scored = [item for item in scored if item[0] > 0]
+    scored.sort(key=lambda item: -item[0])
+    return [(i, score) for score, i in scored[:limit]]
+
+
+# ============================================
+# VECTORIZED BATCH SCORER
+# ============================================
+
+class BatchScorer:
+    """Catalog compiled into a label x genre count matrix plus base scores
+
+    For a block of artists, per-genre points form an artists x genres matrix P
+    and every label score is one matrix product: P @ C.T.
+    """
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.genres = sorted({g.lower() for label in labels for g in label["genres"]})
+        self.column = {g: i for i, g in enumerate(self.genres)}
+
+        self.counts = np.zeros((len(labels), len(self.genres)), dtype=np.float32)
+        for row, label in enumerate(labels):
+            for genre in label["genres"]:
+                self.counts[row, self.column[genre.lower()]] += 1
+        self.base = np.array([label_base_score(label) for label in labels], dtype=np.int32)
+
+        # Ranking key: score first, then catalog (ID) order for ties
+        self.tiebreak = np.arange(len(labels) - 1, -1, -1, dtype=np.int64)
+
+    def genre_points(self, artists):
+        """artists x genres matrix of the points each catalog genre earns"""
+        user_vocab = sorted({g.lower() for artist in artists for g in artist["genres"]})
+        user_column = {g: i for i, g in enumerate(user_vocab)}
+
+        # Relation of each user genre to each catalog genre: exact 20, partial 10
+        relation = np.zeros((len(user_vocab), len(self.genres)), dtype=np.float32)
+        for u, user_genre in enumerate(user_vocab):
+            for g, genre in enumerate(self.genres):
+                if user_genre == genre:
+                    relation[u, g] = 20
+                elif user_genre in genre or genre in user_genre:
+                    relation[u, g] = 10
+
+        # How often each artist lists each genre, and which catalog genres their style mentions
+        artist_genres = np.zeros((len(artists), len(user_vocab)), dtype=np.float32)
+        in_style = np.zeros((len(artists), len(self.genres)), dtype=np.float32)
+        for a, artist in enumerate(artists):
+            for genre in artist["genres"]:
+                artist_genres[a, user_column[genre.lower()]] += 1
+            style = artist["style"].lower()
+            if style:
+                for g, genre in enumerate(self.genres):
+                    if genre in style:
+                        in_style[a, g] = 1
+
+        # Pairs without a genre relation fall back to the style mention (5 points)
+        unrelated = artist_genres @ (relation == 0).astype(np.float32)
+        return artist_genres @ relation + 5 * unrelated * in_style
+
+    def recommend(self, artists, limit=TOP_RECOMMENDATIONS, block_size=1000):
+        """Top `limit` (label index, score) pairs for every artist"""
+        results = []
+        for start in range(0, len(artists), block_size):
+            block = artists[start:start + block_size]
+            points = self.genre_points(block)
+            genre_scores = np.minimum(points @ self.counts.T, MAX_GENRE_SCORE).astype(np.int32)
+            scores = np.minimum(genre_scores + self.base, 100)
+
+            keys = scores.astype(np.int64) * len(self.labels) + self.tiebreak
+            k = min(limit, len(self.labels))
+            top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+            top_keys = np.take_along_axis(keys, top, axis=1)
+            order = np.argsort(-top_keys, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+
+            for rows, row_scores in zip(top, top_scores):
+                results.append([(int(i), int(s)) for i, s in zip(rows, row_scores) if s > 0])
+        return results
+
+
+# ============================================
+# DATA
+# ============================================
+
+def load_catalog(path, size, rng):
+    with open(path) as f:
+        seed_labels = json.load(f)["labels"]
+
+    labels = []
+    for i in range(size):
+        source = seed_labels[i % len(seed_labels)]
+        label = dict(source)
+        if i >= len(seed_labels):
+            # Resampled copies vary the fields that drive scoring
+            label["name"] = f"{source['name']} #{i // len(seed_labels)}"
+            label["genres"] = rng.sample(source["genres"] + [rng.choice(source["genres"] or ["House"])],
+                                         k=rng.randint(1, len(source["genres"]) + 1)) if source["genres"] else []
+            label["submissionEmail"] = source.get("submissionEmail") if rng.random() < 0.5 else ""
+            label["notes"] = rng.choice([source.get("notes") or "", "Accepting demos", "Open for submissions"])
+        label["tier"] = rng.choice(TIERS)
+        label["id"] = f"{i:08d}"
+        labels.append(label)
+    return labels
+
+
+def make_artists(labels, count, rng):
+    vocab = sorted({g for label in labels for g in label["genres"]})
+    artists = []
+    for i in range(count):
+        genres = rng.sample(vocab, k=rng.randint(1, min(3, len(vocab))))
+        style_genre = rng.choice(vocab).lower() if rng.random() < 0.5 else ""
+        style = " ".join(rng.sample(STYLE_WORDS, 2) + [style_genre]).strip()
+        artists.append({"id": f"artist-{i}", "genres": genres, "style": style})
+    return artists
+
+
+# ============================================
+# BENCHMARK
+# ============================================
+
+def run(args):
+    rng = random.Random(args.seed)
+    labels = load_catalog(args.catalog, args.labels, rng)
+    artists = make_artists(labels, args.artists, rng)
+    sample = artists[:min(args.per_request_sample, len(artists))]
+
+    print(f"=== {len(artists)} artists x {len(labels)} labels ({len({g for l in labels for g in l['genres']})} genres) ===")
+
+    start = time.perf_counter()
+    expected = [recommend_per_request(labels, artist) for artist in sample]
+    per_request_s = (time.perf_counter() - start) / len(sample) * len(artists)
+    print(f"   per-request scorer: {per_request_s:8.2f}s"
+          f"  ({'measured' if len(sample) == len(artists) else f'extrapolated from {len(sample)} artists'})")
+
+    start = time.perf_counter()
+    scorer = BatchScorer(labels)
+    compile_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = scorer.recommend(artists)
+    batch_s = time.perf_counter() - start
+    print(f"   batch scorer:       {batch_s:8.2f}s  (+{compile_s:.2f}s to compile the catalog)")
+    print(f"   speedup:            {per_request_s / max(batch_s + compile_s, 1e-9):8.1f}x")
+
+    mismatches = sum(1 for a, b in zip(expected, batch) if a != b)
+    if mismatches:
+        print(f"\n❌ {mismatches}/{len(sample)} artists got different recommendations from the batch scorer")
+        return 1
+    print(f"\n✅ Batch results match the per-request scorer for all {len(sample)} checked artists")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark per-request vs batch label-match scoring")
+    parser.add_argument("--artists", type=int, default=10_000)
+    parser.add_argument("--labels", type=int, default=5_000)
+    parser.add_argument("--per-request-sample", type=int, default=200,
+                        help="artists timed (and checked) with the per-request scorer; the rest is extrapolated")
+    parser.add_argument("--catalog", default=CATALOG_PATH)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
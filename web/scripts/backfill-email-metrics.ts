@@ -0,0 +1,180 @@
+/**
+ * Email Metrics Backfill Script
+ * Builds the emailMetricsHourly / emailMetricsDaily buckets from the raw
+ * emailLogs, emailUnsubscribes and emailWebhooks collections.
+ *
+ * Run once, with --until set to when the bucket-writing code was deployed
+ * (events after that are already counted):
+ *
+ *   npx tsx scripts/backfill-email-metrics.ts --until=2026-10-17T12:00:00Z
+ *
+ * The counts go in each bucket's unsharded doc ({YYYY-MM-DDTHH}), next to the
+ * shards the app writes. Buckets that end before --until are overwritten;
+ * the hour and day that contain it get the earlier events added to what is
+ * already there.
+ */
+
+import * as admin from "firebase-admin";
+import * as fs from "fs";
+
+// Initialize Firebase Admin with service account
+const serviceAccountPath = process.env.GOOGLE_APPLICATION_CREDENTIALS;
+
+if (!admin.apps.length) {
+  if (serviceAccountPath && fs.existsSync(serviceAccountPath)) {
+    const serviceAccount = JSON.parse(fs.readFileSync(serviceAccountPath, "utf8"));
+    admin.initializeApp({
+      credential: admin.credential.cert(serviceAccount),
+    });
+  } else {
+    // Try default credentials
+    admin.initializeApp({
+      credential: admin.credential.applicationDefault(),
+    });
+  }
+}
+
+const db = admin.firestore();
+
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+const PAGE_SIZE = 1000;
+const BATCH_SIZE = 400;
+
+type Counts = Record<string, Record<string, number>>;
+type Bucket = { collection: string; id: string; start: number; end: number; counts: Counts };
+
+const buckets = new Map<string, Bucket>();
+
+function metricKey(type: string): string {
+  return String(type).replace(/[^a-zA-Z0-9_-]/g, "_") || "unknown";
+}
+
+function count(type: string, status: string, at: Date) {
+  const ms = at.getTime();
+  const hour = Math.floor(ms / HOUR_MS) * HOUR_MS;
+  const day = Math.floor(ms / DAY_MS) * DAY_MS;
+  const targets = [
+    { collection: "emailMetricsHourly", id: new Date(hour).toISOString().slice(0, 13), start: hour, end: hour + HOUR_MS },
+    { collection: "emailMetricsDaily", id: new Date(day).toISOString().slice(0, 10), start: day, end: day + DAY_MS },
+  ];
+  for (const target of targets) {
+    const key = `${target.collection}/${target.id}`;
+    let bucket = buckets.get(key);
+    if (!bucket) {
+      bucket = { ...target, counts: {} };
+      buckets.set(key, bucket);
+    }
+    const byStatus = (bucket.counts[metricKey(type)] = bucket.counts[metricKey(type)] || {});
+    byStatus[status] = (byStatus[status] || 0) + 1;
+  }
+}
+
+// Page through a collection's documents with `field` before `until`
+async function scan(
+  collection: string,
+  field: string,
+  until: Date,
+  handle: (data: admin.firestore.DocumentData, at: Date) => void
+) {
+  const ordered = db
+    .collection(collection)
+    .where(field, "<", admin.firestore.Timestamp.fromDate(until))
+    .orderBy(field)
+    .limit(PAGE_SIZE);
+
+  let last: admin.firestore.QueryDocumentSnapshot | null = null;
+  let scanned = 0;
+  while (true) {
+    const page: admin.firestore.QuerySnapshot = await (last ? ordered.startAfter(last) : ordered).get();
+    for (const doc of page.docs) {
+      const at = doc.get(field)?.toDate?.();
+      if (at) handle(doc.data(), at);
+    }
+    scanned += page.size;
+    if (page.size < PAGE_SIZE) break;
+    last = page.docs[page.docs.length - 1];
+  }
+  console.log(`  ${collection}: ${scanned} documents`);
+}
+
+// Same mapping as the Postmark webhook route
+function webhookStatus(data: admin.firestore.DocumentData): string | null {
+  switch (data.recordType) {
+    case "Bounce":
+      return "bounced";
+    case "SpamComplaint":
+      return "spam";
+    case "Open":
+      return "opened";
+    case "SubscriptionChange":
+      return data.suppressSending ? "unsubscribed" : null;
+    default:
+      return null;
+  }
+}
+
+async function backfill() {
+  console.log("=== Email Metrics Backfill ===\n");
+
+  const untilArg = process.argv.find((arg) => arg.startsWith("--until="));
+  if (!untilArg) {
+    console.error("Missing --until=<ISO time the bucket-writing code was deployed>");
+    process.exit(1);
+  }
+  const until = new Date(untilArg.slice("--until=".length));
+  if (isNaN(until.getTime())) {
+    console.error("Invalid --until date");
+    process.exit(1);
+  }
+
+  // Email type of each Postmark message, for webhook events without a tag
+  const typeByMessageId = new Map<string, string>();
+
+  console.log(`Counting events before ${until.toISOString()}...`);
+  await scan("emailLogs", "createdAt", until, (data, at) => {
+    const type = data.type || "unknown";
+    if (data.postmarkMessageId) typeByMessageId.set(data.postmarkMessageId, type);
+    count(type, data.status === "sent" ? "sent" : "failed", at);
+  });
+  await scan("emailUnsubscribes", "timestamp", until, (data, at) => {
+    count(data.emailType || "all", "unsubscribed", at);
+  });
+  await scan("emailWebhooks", "receivedAt", until, (data, at) => {
+    const status = webhookStatus(data);
+    if (!status) return;
+    count(data.tag || typeByMessageId.get(data.messageId) || "unknown", status, at);
+  });
+
+  console.log(`\nWriting ${buckets.size} buckets...`);
+  const all = [...buckets.values()];
+  for (let i = 0; i < all.length; i += BATCH_SIZE) {
+    const batch = db.batch();
+    for (const bucket of all.slice(i, i + BATCH_SIZE)) {
+      const ref = db.collection(bucket.collection).doc(bucket.id);
+      const start = admin.firestore.Timestamp.fromMillis(bucket.start);
+
+      if (bucket.end <= until.getTime()) {
+        batch.set(ref, { start, counts: bucket.counts });
+      } else {
+        // Bucket already receiving live increments: add to it
+        const increments: Record<string, Record<string, admin.firestore.FieldValue>> = {};
+        for (const [type, byStatus] of Object.entries(bucket.counts)) {
+          increments[type] = {};
+          for (const [status, n] of Object.entries(byStatus)) {
+            increments[type][status] = admin.firestore.FieldValue.increment(n);
+          }
+        }
+        batch.set(ref, { start, counts: increments }, { merge: true });
+      }
+    }
+    await batch.commit();
+  }
+
+  console.log("Done.");
+}
+
+backfill().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
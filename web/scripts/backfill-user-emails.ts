@@ -0,0 +1,81 @@
+/**
+ * User Email Index Backfill Script
+ * Writes a userEmails entry (email → uid lookup used by the Postmark webhook)
+ * for every user with an email. Safe to re-run.
+ *
+ *   npx tsx scripts/backfill-user-emails.ts
+ */
+
+import * as admin from "firebase-admin";
+import * as crypto from "crypto";
+import * as fs from "fs";
+
+// Initialize Firebase Admin with service account
+const serviceAccountPath = process.env.GOOGLE_APPLICATION_CREDENTIALS;
+
+if (!admin.apps.length) {
+  if (serviceAccountPath && fs.existsSync(serviceAccountPath)) {
+    const serviceAccount = JSON.parse(fs.readFileSync(serviceAccountPath, "utf8"));
+    admin.initializeApp({
+      credential: admin.credential.cert(serviceAccount),
+    });
+  } else {
+    // Try default credentials
+    admin.initializeApp({
+      credential: admin.credential.applicationDefault(),
+    });
+  }
+}
+
+const db = admin.firestore();
+
+const PAGE_SIZE = 400;
+
+// Same key as lib/firestore/userEmails.ts
+function normalizeEmail(email: string): string {
+  return email.trim().toLowerCase();
+}
+
+function userEmailRef(email: string) {
+  const id = crypto.createHash("sha1").update(normalizeEmail(email)).digest("hex");
+  return db.collection("userEmails").doc(id);
+}
+
+async function backfill() {
+  console.log("=== User Email Index Backfill ===\n");
+
+  const ordered = db.collection("users").orderBy(admin.firestore.FieldPath.documentId()).limit(PAGE_SIZE);
+  let last: admin.firestore.QueryDocumentSnapshot | null = null;
+  let scanned = 0;
+  let indexed = 0;
+
+  while (true) {
+    const page: admin.firestore.QuerySnapshot = await (last ? ordered.startAfter(last) : ordered).get();
+    const batch = db.batch();
+    let writes = 0;
+    for (const doc of page.docs) {
+      const email = doc.get("email");
+      if (typeof email !== "string" || !email.trim()) continue;
+      batch.set(userEmailRef(email), {
+        uid: doc.id,
+        email: normalizeEmail(email),
+        updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+      });
+      writes++;
+    }
+    if (writes > 0) await batch.commit();
+
+    scanned += page.size;
+    indexed += writes;
+    console.log(`  ${scanned} users scanned, ${indexed} indexed`);
+    if (page.size < PAGE_SIZE) break;
+    last = page.docs[page.docs.length - 1];
+  }
+
+  console.log("Done.");
+}
+
+backfill().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,58 @@
+/**
+ * Email Template Render Benchmark
+ * Measures per-recipient render cost of the shared drip templates.
+ *
+ * Run: npx tsx scripts/bench-email-templates.ts [recipients]
+ */
+
+import {
+  renderDay7UpgradeEmail,
+  renderEpkGuideEmail,
+  renderProfileReminderEmail,
+  renderReengagementEmail,
+} from "../src/lib/email/templates";
+
+const RECIPIENTS = Number(process.argv[2]) || 10_000;
+const BASE_URL = "https://verifiedsoundar.com";
+
+const CASES: Array<[string, (i: number) => { html: string; text: string }]> = [
+  ["profile-reminder", (i) => renderProfileReminderEmail({
+    name: `Artist ${i} <&>`,
+    missingFields: ["Artist Name", "Genre", "Bio"].slice(0, (i % 3) + 1),
+    settingsUrl: `${BASE_URL}/settings`,
+  })],
+  ["epk-guide", (i) => renderEpkGuideEmail({
+    name: `Artist ${i}`,
+    completedCount: i % 6,
+    dashboardUrl: `${BASE_URL}/dashboard`,
+  })],
+  ["upgrade-day7", (i) => renderDay7UpgradeEmail({
+    name: `Artist ${i}`,
+    pricingUrl: `${BASE_URL}/pricing`,
+  })],
+  ["reengagement", (i) => renderReengagementEmail({
+    name: `Artist ${i}`,
+    dashboardUrl: `${BASE_URL}/dashboard`,
+    daysInactive: 7 + (i % 7),
+  })],
+];
+
+console.log(`=== Email template render benchmark (${RECIPIENTS.toLocaleString()} recipients) ===`);
+
+for (const [name, render] of CASES) {
+  // Warm up: first call compiles and caches the template
+  render(0);
+
+  let bytes = 0;
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < RECIPIENTS; i++) {
+    bytes += render(i).html.length;
+  }
+  const elapsedMs = Number(process.hrtime.bigint() - start) / 1e6;
+
+  console.log(
+    `${name.padEnd(18)} total ${elapsedMs.toFixed(1).padStart(8)}ms` +
+    `  per render ${((elapsedMs * 1000) / RECIPIENTS).toFixed(2).padStart(7)}µs` +
+    `  avg html ${Math.round(bytes / RECIPIENTS)} bytes`
+  );
+}
@@ -94,6 +94,19 @@ function processRow(row: LabelRow): ProcessedLabel | null {
   };
 }
 
+/**
+ * Write chunks to a file, waiting for the stream to drain when it is full
+ */
+async function writeStreamed(filePath: string, chunks: string[]) {
+  const out = fs.createWriteStream(filePath);
+  for (const chunk of chunks) {
+    if (!out.write(chunk)) {
+      await new Promise<void>((resolve) => out.once("drain", () => resolve()));
+    }
+  }
+  await new Promise<void>((resolve) => out.end(() => resolve()));
+}
+
 async function main() {
   console.log("=== Label Import Script ===\n");
 
@@ -141,17 +154,29 @@ async function main() {
   const withEmail = allLabels.filter(l => l.submissionEmail).length;
   console.log(`\nLabels with submission email: ${withEmail}`);
 
-  // Output JSON for import
-  const outputPath = path.join(__dirname, "labels-to-import.json");
-  fs.writeFileSync(outputPath, JSON.stringify({ labels: allLabels }, null, 2));
+  // Output NDJSON for import (one label per line, streamed by the import route)
+  const outputPath = path.join(__dirname, "labels-to-import.ndjson");
+  await writeStreamed(outputPath, allLabels.map((label) => `${JSON.stringify(label)}\n`));
   console.log(`\nSaved to ${outputPath}`);
 
-  // Also output a curl command for easy import
+  // Same labels as { labels: [...] } JSON, read by direct-import.ts and recommend_bench.py
+  const jsonPath = path.join(__dirname, "labels-to-import.json");
+  await writeStreamed(jsonPath, [
+    '{\n  "labels": [\n',
+    ...allLabels.map(
+      (label, i) => `${JSON.stringify(label, null, 2).replace(/^/gm, "    ")}${i < allLabels.length - 1 ? "," : ""}\n`
+    ),
+    "  ]\n}",
+  ]);
+  console.log(`Saved to ${jsonPath}`);
+
+  // Also output a curl command for easy import (progress lines print as batches commit)
   console.log("\n=== To import, run: ===");
-  console.log(`curl -X POST "YOUR_URL/api/labels/import" \\`);
-  console.log(`  -H "Content-Type: application/json" \\`);
+  console.log(`curl -N -X POST "YOUR_URL/api/labels/import" \\`);
+  console.log(`  -H "Content-Type: application/x-ndjson" \\`);
   console.log(`  -H "x-import-secret: YOUR_CRON_SECRET" \\`);
-  console.log(`  -d @${outputPath}`);
+  console.log(`  --data-binary @${outputPath}`);
+  console.log("\n(First time only: POST YOUR_URL/api/labels/import?rebuildNameIndex=true to index existing labels.)");
 }
 
 main().catch(console.error);
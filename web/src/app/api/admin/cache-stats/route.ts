@@ -0,0 +1,40 @@
+import { NextResponse } from "next/server";
+import { isAdmin, verifyAuth } from "@/lib/firebaseAdmin";
+import { getCacheStats } from "@/lib/lruCache";
+
+// Import the modules that own caches so they register with this instance
+import "@/lib/chat/sessionStore";
+import "@/lib/pdf/epkPdfCache";
+import "@/lib/pdf/pdfAssets";
+
+export const dynamic = "force-dynamic";
+
+/**
+ * Hit/miss/eviction counters for this instance's in-process caches
+ */
+export async function GET(req: Request) {
+  try {
+    const { uid } = await verifyAuth(req);
+
+    if (!(await isAdmin(uid))) {
+      return NextResponse.json({ ok: false, error: "Forbidden" }, { status: 403 });
+    }
+
+    return NextResponse.json({
+      ok: true,
+      collectedAt: new Date().toISOString(),
+      caches: getCacheStats(),
+    });
+  } catch (error: any) {
+    console.error("[admin/cache-stats]", error?.message || error);
+
+    if (error?.message === "Unauthorized") {
+      return NextResponse.json({ ok: false, error: "Unauthorized" }, { status: 401 });
+    }
+
+    return NextResponse.json(
+      { ok: false, error: "Failed to fetch cache stats" },
+      { status: 500 }
+    );
+  }
+}
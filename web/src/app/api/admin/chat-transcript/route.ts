@@ -1,15 +1,12 @@
 import { NextResponse } from "next/server";
-import { adminDb, verifyAuth } from "@/lib/firebaseAdmin";
+import { adminDb, isAdmin, verifyAuth } from "@/lib/firebaseAdmin";
 
 export async function GET(req: Request) {
   try {
     const { uid } = await verifyAuth(req);
 
     // Check if user is admin
-    const adminRef = adminDb.collection("admins").doc(uid);
-    const adminSnap = await adminRef.get();
-    
-    if (!adminSnap.exists) {
+    if (!(await isAdmin(uid))) {
       return NextResponse.json({ ok: false, error: "Forbidden" }, { status: 403 });
     }
 
@@ -1,26 +1,13 @@
 import { NextResponse } from "next/server";
-import { adminDb } from "@/lib/firebaseAdmin";
-
-// Simple admin verification
-async function verifyAdmin(req: Request): Promise<boolean> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return false;
-
-  const token = authHeader.split("Bearer ")[1];
-  
-  try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    const adminDoc = await adminDb.collection("admins").doc(decoded.uid).get();
-    return adminDoc.exists;
-  } catch {
-    return false;
-  }
-}
+import { verifyAdmin } from "@/lib/firebaseAdmin";
+import { emptyEmailMetricCounts, getEmailMetrics, type EmailMetricCounts } from "@/lib/firestore/emailMetrics";
 
 /**
  * GET /api/admin/email-metrics
- * Get email sequence performance metrics
+ * Get email sequence performance metrics, summed from the hourly/daily
+ * email metrics buckets.
+ *
+ * Query params: days (default 30), or from/to (ISO dates; to defaults to now)
  */
 export async function GET(req: Request) {
   if (!(await verifyAdmin(req))) {
@@ -29,70 +16,31 @@ export async function GET(req: Request) {
 
   const { searchParams } = new URL(req.url);
   const days = parseInt(searchParams.get("days") || "30", 10);
+  const to = searchParams.get("to") ? new Date(searchParams.get("to")!) : new Date();
+  const from = searchParams.get("from")
+    ? new Date(searchParams.get("from")!)
+    : new Date(to.getTime() - days * 24 * 60 * 60 * 1000);
 
-  try {
-    const cutoffDate = new Date();
-    cutoffDate.setDate(cutoffDate.getDate() - days);
+  if (isNaN(from.getTime()) || isNaN(to.getTime()) || from >= to) {
+    return NextResponse.json({ ok: false, error: "Invalid date range" }, { status: 400 });
+  }
 
-    // Get email logs
-    const emailLogsSnapshot = await adminDb
-      .collection("emailLogs")
-      .where("createdAt", ">=", cutoffDate)
-      .get();
+  try {
+    const byType = await getEmailMetrics(from, to);
 
     // Aggregate by email type
-    const emailMetrics: Record<string, {
-      sent: number;
-      failed: number;
-      total: number;
-    }> = {};
-
-    emailLogsSnapshot.forEach((doc) => {
-      const data = doc.data();
-      const type = data.type || "unknown";
-      
-      if (!emailMetrics[type]) {
-        emailMetrics[type] = { sent: 0, failed: 0, total: 0 };
-      }
-      
-      emailMetrics[type].total++;
-      if (data.status === "sent") {
-        emailMetrics[type].sent++;
-      } else {
-        emailMetrics[type].failed++;
+    const emailMetrics: Record<string, EmailMetricCounts & { total: number }> = {};
+    const totals = emptyEmailMetricCounts();
+    for (const [type, counts] of Object.entries(byType)) {
+      emailMetrics[type] = { ...counts, total: counts.sent + counts.failed };
+      for (const status of Object.keys(totals) as (keyof EmailMetricCounts)[]) {
+        totals[status] += counts[status];
       }
-    });
-
-    // Get unsubscribe count
-    const unsubscribesSnapshot = await adminDb
-      .collection("emailUnsubscribes")
-      .where("timestamp", ">=", cutoffDate)
-      .get();
-
-    const unsubscribeCount = unsubscribesSnapshot.size;
-
-    // Get bounce/spam count from email webhooks (if tracked)
-    let bounceCount = 0;
-    let spamCount = 0;
-    
-    try {
-      const webhooksSnapshot = await adminDb
-        .collection("emailWebhooks")
-        .where("timestamp", ">=", cutoffDate)
-        .get();
-
-      webhooksSnapshot.forEach((doc) => {
-        const data = doc.data();
-        if (data.type === "Bounce") bounceCount++;
-        if (data.type === "SpamComplaint") spamCount++;
-      });
-    } catch {
-      // emailWebhooks collection may not exist
     }
 
     // Calculate totals
-    const totalSent = Object.values(emailMetrics).reduce((sum, m) => sum + m.sent, 0);
-    const totalFailed = Object.values(emailMetrics).reduce((sum, m) => sum + m.failed, 0);
+    const totalSent = totals.sent;
+    const totalFailed = totals.failed;
 
     // Email sequence breakdown with friendly names
     const sequences = [
@@ -107,7 +55,7 @@ export async function GET(req: Request) {
       { id: "winback", name: "Win-back", priority: "P2" },
     ].map((seq) => ({
       ...seq,
-      metrics: emailMetrics[seq.id] || { sent: 0, failed: 0, total: 0 },
+      metrics: emailMetrics[seq.id] || { ...emptyEmailMetricCounts(), total: 0 },
       successRate: emailMetrics[seq.id] 
         ? Math.round((emailMetrics[seq.id].sent / Math.max(emailMetrics[seq.id].total, 1)) * 100)
         : 0,
@@ -116,15 +64,18 @@ export async function GET(req: Request) {
     return NextResponse.json({
       ok: true,
       days,
+      from: from.toISOString(),
+      to: to.toISOString(),
       summary: {
         totalSent,
         totalFailed,
         successRate: totalSent + totalFailed > 0 
           ? Math.round((totalSent / (totalSent + totalFailed)) * 100) 
           : 0,
-        unsubscribes: unsubscribeCount,
-        bounces: bounceCount,
-        spamComplaints: spamCount,
+        unsubscribes: totals.unsubscribed,
+        bounces: totals.bounced,
+        spamComplaints: totals.spam,
+        opens: totals.opened,
       },
       sequences,
     });
@@ -1,23 +1,6 @@
 import { NextResponse } from "next/server";
 import { getAllExperimentMetrics } from "@/lib/experiments/serverAbTest";
-import { adminDb } from "@/lib/firebaseAdmin";
-
-// Simple admin verification
-async function verifyAdmin(req: Request): Promise<boolean> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return false;
-
-  const token = authHeader.split("Bearer ")[1];
-  
-  try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    const adminDoc = await adminDb.collection("admins").doc(decoded.uid).get();
-    return adminDoc.exists;
-  } catch {
-    return false;
-  }
-}
+import { verifyAdmin } from "@/lib/firebaseAdmin";
 
 /**
  * GET /api/admin/experiments
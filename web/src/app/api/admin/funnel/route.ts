@@ -1,7 +1,10 @@
 import { NextResponse } from "next/server";
+import admin from "firebase-admin";
 import { adminDb, verifyAuth } from "@/lib/firebaseAdmin";
 import { getFunnelMetrics } from "@/lib/analytics/serverTracking";
 
+const TIERS = ["tier1", "tier2", "tier3"];
+
 export async function GET(req: Request) {
   try {
     // Verify admin access
@@ -22,23 +25,26 @@ export async function GET(req: Request) {
     // Get funnel metrics
     const metrics = await getFunnelMetrics(days);
 
-    // Get additional stats
-    const usersSnapshot = await adminDb.collection("users").get();
-    const totalUsers = usersSnapshot.size;
-    
-    let tier1Count = 0;
-    let tier2Count = 0;
-    let tier3Count = 0;
-    let onboardedCount = 0;
-    
-    usersSnapshot.forEach((doc) => {
-      const data = doc.data();
-      const tier = data.subscriptionTier || data.tier || "tier1";
-      if (tier === "tier1") tier1Count++;
-      else if (tier === "tier2") tier2Count++;
-      else if (tier === "tier3") tier3Count++;
-      if (data.onboardingCompleted) onboardedCount++;
-    });
+    // Get additional stats (count aggregations: no user documents are read)
+    const users = adminDb.collection("users");
+    const countOf = async (query: admin.firestore.Query) => (await query.count().get()).data().count;
+    // A user's tier is subscriptionTier, else the legacy tier field
+    const countTier = async (tier: string) => {
+      const [current, legacy, legacyOverridden] = await Promise.all([
+        countOf(users.where("subscriptionTier", "==", tier)),
+        countOf(users.where("tier", "==", tier)),
+        countOf(users.where("tier", "==", tier).where("subscriptionTier", "in", TIERS)),
+      ]);
+      return current + legacy - legacyOverridden;
+    };
+    const [totalUsers, tier2Count, tier3Count, onboardedCount] = await Promise.all([
+      countOf(users),
+      countTier("tier2"),
+      countTier("tier3"),
+      countOf(users.where("onboardingCompleted", "==", true)),
+    ]);
+    // Users without a paid tier are on tier1
+    const tier1Count = totalUsers - tier2Count - tier3Count;
 
     return NextResponse.json({
       ok: true,
@@ -1,11 +1,7 @@
 import { NextResponse } from "next/server";
 import { GoogleGenerativeAI } from "@google/generative-ai";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
-
-type ChatMessage = {
-  role: "user" | "model";
-  parts: { text: string }[];
-};
+import { getSessionHistory, saveSessionHistory } from "@/lib/chat/sessionStore";
 
 // Daily usage tracking (simple in-memory, resets on restart)
 const dailyUsage = {
@@ -65,9 +61,6 @@ const SYSTEM_PROMPT = `You are the Verified Sound assistant. You help visitors l
 
 Respond naturally in plain text. Be conversational and helpful.`;
 
-// Simple in-memory session storage
-const sessionHistory = new Map<string, ChatMessage[]>();
-
 // Initialize Gemini client
 function getGeminiClient() {
   const apiKey = process.env.GOOGLE_AI_API_KEY;
@@ -92,7 +85,7 @@ export async function POST(req: Request) {
 
     // Rate limiting by IP (30 requests per minute per user)
     const ip = getRequestIp(req);
-    const limit = rateLimit(`chat-assistant:${ip}`, 30, 60000);
+    const limit = await rateLimit(`chat-assistant:${ip}`, 30, 60000);
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Rate limit exceeded. Please slow down." },
@@ -101,7 +94,7 @@ export async function POST(req: Request) {
     }
 
     // Additional rate limit: 100 requests per hour per IP
-    const hourlyLimit = rateLimit(`chat-assistant-hourly:${ip}`, 100, 3600000);
+    const hourlyLimit = await rateLimit(`chat-assistant-hourly:${ip}`, 100, 3600000);
     if (!hourlyLimit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Hourly limit exceeded. Please try again later." },
@@ -128,7 +121,7 @@ export async function POST(req: Request) {
     }
 
     // Get or create session history
-    let history = sessionHistory.get(sessionId) || [];
+    const history = await getSessionHistory(sessionId);
     
     // Initialize Gemini
     const genAI = getGeminiClient();
@@ -137,9 +130,9 @@ export async function POST(req: Request) {
       systemInstruction: SYSTEM_PROMPT,
     });
 
-    // Start chat with history
+    // Start chat with a copy of the history (the chat session appends to the array it is given)
     const chat = model.startChat({
-      history: history,
+      history: [...history],
       generationConfig: {
         maxOutputTokens: 500,
         temperature: 0.7,
@@ -151,23 +144,13 @@ export async function POST(req: Request) {
     const response = result.response;
     const assistantReply = response.text() || "I'm sorry, I couldn't process that. Please try again.";
 
-    // Update history
-    history.push({ role: "user", parts: [{ text: userMessage }] });
-    history.push({ role: "model", parts: [{ text: assistantReply }] });
-    
-    // Keep only last 10 exchanges (20 messages)
-    if (history.length > 20) {
-      history = history.slice(-20);
-    }
-    
-    // Save updated history
-    sessionHistory.set(sessionId, history);
-
-    // Clean up old sessions (basic memory management)
-    if (sessionHistory.size > 1000) {
-      const oldestKey = sessionHistory.keys().next().value;
-      if (oldestKey) sessionHistory.delete(oldestKey);
-    }
+    // Save updated history (trimmed to the last 10 exchanges; the store bounds
+    // session count, total size and idle time)
+    await saveSessionHistory(sessionId, [
+      ...history,
+      { role: "user", parts: [{ text: userMessage }] },
+      { role: "model", parts: [{ text: assistantReply }] },
+    ]);
 
     return NextResponse.json({
       ok: true,
@@ -57,7 +57,7 @@ export async function POST(req: Request) {
   try {
     // Rate limiting by IP (stricter for contact form)
     const ip = getRequestIp(req);
-    const limit = rateLimit(`contact:${ip}`, 5, 60000); // 5 per minute
+    const limit = await rateLimit(`contact:${ip}`, 5, 60000); // 5 per minute
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Too many requests. Please wait a moment before trying again." },
@@ -0,0 +1,91 @@
+import { NextResponse } from "next/server";
+import {
+  rebuildFunnelRollups,
+  rollUpNewFunnelEvents,
+  rollupDay,
+  type RollupCatchUpResults,
+  type RollupRebuildResults,
+} from "@/lib/analytics/funnelRollups";
+
+export const dynamic = "force-dynamic";
+export const maxDuration = 300;
+
+// Catch-up pages per run (450 events each)
+const DEFAULT_MAX_PAGES = 40;
+
+// Verify cron secret to prevent unauthorized access
+function verifyCronSecret(req: Request): boolean {
+  const cronSecret = process.env.CRON_SECRET;
+  if (!cronSecret) {
+    console.warn("[cron/funnel-rollups] CRON_SECRET not set - allowing request in development");
+    return process.env.NODE_ENV !== "production";
+  }
+
+  const authHeader = req.headers.get("authorization");
+  if (!authHeader) return false;
+
+  const token = authHeader.replace("Bearer ", "");
+  return token === cronSecret;
+}
+
+/**
+ * GET /api/cron/funnel-rollups
+ * Adds client-side funnel events to the daily rollups read by
+ * /api/admin/funnel (server-side events are rolled up as they are written).
+ *
+ * Backfill: ?backfillDays=N first rebuilds the last N full days from
+ * funnelEvents (or ?from=YYYY-MM-DD&to=YYYY-MM-DD).
+ */
+export async function GET(req: Request) {
+  const requestId = crypto.randomUUID();
+  const startedAt = Date.now();
+  console.log(`[cron/funnel-rollups] Starting job ${requestId}`);
+
+  if (!verifyCronSecret(req)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  const { searchParams } = new URL(req.url);
+  const maxPages = Number(searchParams.get("maxPages")) || DEFAULT_MAX_PAGES;
+
+  const results: {
+    requestId: string;
+    backfill: RollupRebuildResults | null;
+    catchUp: RollupCatchUpResults | null;
+    durationMs: number;
+  } = { requestId, backfill: null, catchUp: null, durationMs: 0 };
+
+  try {
+    const backfillDays = Number(searchParams.get("backfillDays")) || 0;
+    let from = searchParams.get("from");
+    let to = searchParams.get("to");
+    if (backfillDays > 0) {
+      from = rollupDay(new Date(Date.now() - backfillDays * 24 * 60 * 60 * 1000));
+      to = rollupDay(new Date());
+    }
+    if (from || to) {
+      const isDay = (value: string | null) => !!value && /^\d{4}-\d{2}-\d{2}$/.test(value);
+      if (!isDay(from) || !isDay(to)) {
+        return NextResponse.json({ error: "from and to must be YYYY-MM-DD" }, { status: 400 });
+      }
+      results.backfill = await rebuildFunnelRollups(from!, to!);
+    }
+
+    results.catchUp = await rollUpNewFunnelEvents(maxPages);
+    results.durationMs = Date.now() - startedAt;
+
+    console.log(`[cron/funnel-rollups] Job ${requestId} complete:`, results);
+    return NextResponse.json(results);
+  } catch (error: any) {
+    console.error(`[cron/funnel-rollups] Job ${requestId} failed:`, error?.message || error);
+    return NextResponse.json(
+      { ...results, error: error?.message || "Unknown error" },
+      { status: 500 }
+    );
+  }
+}
+
+// Also support POST for manual triggering
+export async function POST(req: Request) {
+  return GET(req);
+}
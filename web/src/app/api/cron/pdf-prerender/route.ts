@@ -0,0 +1,64 @@
+import { NextResponse } from "next/server";
+import { getLocalPdfRenderQueue, processQueuedPdfRenders } from "@/lib/pdf/prerenderQueue";
+
+export const dynamic = "force-dynamic";
+export const maxDuration = 300;
+
+// Jobs processed per run by default
+const DEFAULT_MAX_JOBS = 25;
+
+// Verify cron secret to prevent unauthorized access
+function verifyCronSecret(req: Request): boolean {
+  const cronSecret = process.env.CRON_SECRET;
+  if (!cronSecret) {
+    console.warn("[cron/pdf-prerender] CRON_SECRET not set - allowing request in development");
+    return process.env.NODE_ENV !== "production";
+  }
+
+  const authHeader = req.headers.get("authorization");
+  if (!authHeader) return false;
+
+  const token = authHeader.replace("Bearer ", "");
+  return token === cronSecret;
+}
+
+/**
+ * GET /api/cron/pdf-prerender
+ * Worker for the EPK PDF pre-render queue. With PDF_RENDER_QUEUE=firestore it
+ * renders due jobs from pdfRenderJobs; with the local queue it reports the
+ * queue's counters (jobs already run in-process).
+ */
+export async function GET(req: Request) {
+  const requestId = crypto.randomUUID();
+  const startedAt = Date.now();
+
+  if (!verifyCronSecret(req)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  if (process.env.PDF_RENDER_QUEUE !== "firestore") {
+    return NextResponse.json({ requestId, queue: "local", ...getLocalPdfRenderQueue().stats() });
+  }
+
+  try {
+    const { searchParams } = new URL(req.url);
+    const maxJobs = Number(searchParams.get("max")) || DEFAULT_MAX_JOBS;
+
+    const results = await processQueuedPdfRenders(maxJobs);
+    const durationMs = Date.now() - startedAt;
+
+    console.log(`[cron/pdf-prerender] Job ${requestId} complete:`, { ...results, durationMs });
+    return NextResponse.json({ requestId, queue: "firestore", ...results, durationMs });
+  } catch (error: any) {
+    console.error(`[cron/pdf-prerender] Job ${requestId} failed:`, error?.message || error);
+    return NextResponse.json(
+      { requestId, error: error?.message || "Unknown error" },
+      { status: 500 }
+    );
+  }
+}
+
+// Also support POST for manual triggering
+export async function POST(req: Request) {
+  return GET(req);
+}
@@ -0,0 +1,68 @@
+import { NextResponse } from "next/server";
+import { processPendingPostmarkEvents, type PostmarkProcessResults } from "@/lib/email/postmarkEvents";
+
+export const dynamic = "force-dynamic";
+export const maxDuration = 300;
+
+// Webhook docs processed per run
+const DEFAULT_LIMIT = 1000;
+
+// Verify cron secret to prevent unauthorized access
+function verifyCronSecret(req: Request): boolean {
+  const cronSecret = process.env.CRON_SECRET;
+  if (!cronSecret) {
+    console.warn("[cron/postmark-events] CRON_SECRET not set - allowing request in development");
+    return process.env.NODE_ENV !== "production";
+  }
+
+  const authHeader = req.headers.get("authorization");
+  if (!authHeader) return false;
+
+  const token = authHeader.replace("Bearer ", "");
+  return token === cronSecret;
+}
+
+/**
+ * GET /api/cron/postmark-events
+ * Applies Postmark webhook events that were stored but not processed after
+ * the webhook answered (instance stopped, or a failed write).
+ *
+ * Query params: limit (default 1000)
+ */
+export async function GET(req: Request) {
+  const requestId = crypto.randomUUID();
+  const startedAt = Date.now();
+  console.log(`[cron/postmark-events] Starting job ${requestId}`);
+
+  if (!verifyCronSecret(req)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  const { searchParams } = new URL(req.url);
+  const limit = Number(searchParams.get("limit")) || DEFAULT_LIMIT;
+
+  const results: {
+    requestId: string;
+    processed: PostmarkProcessResults | null;
+    durationMs: number;
+  } = { requestId, processed: null, durationMs: 0 };
+
+  try {
+    results.processed = await processPendingPostmarkEvents(limit);
+    results.durationMs = Date.now() - startedAt;
+
+    console.log(`[cron/postmark-events] Job ${requestId} complete:`, results);
+    return NextResponse.json(results);
+  } catch (error: any) {
+    console.error(`[cron/postmark-events] Job ${requestId} failed:`, error?.message || error);
+    return NextResponse.json(
+      { ...results, error: error?.message || "Unknown error" },
+      { status: 500 }
+    );
+  }
+}
+
+// Also support POST for manual triggering
+export async function POST(req: Request) {
+  return GET(req);
+}
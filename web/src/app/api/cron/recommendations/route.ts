@@ -0,0 +1,143 @@
+import { NextResponse } from "next/server";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { createBatchScorer } from "@/lib/submissions/batchScoring";
+import {
+  TOP_RECOMMENDATIONS,
+  getLabelCatalogVersion,
+  getLabelIndexForVersion,
+  isCacheCurrent,
+  recommendationCacheRef,
+  recommendationGenres,
+  recommendationProfileHash,
+  toCacheDoc,
+  type RecommendationProfile,
+} from "@/lib/submissions/recommendations";
+
+// Users loaded (and cache documents written) per page
+const PAGE_SIZE = 500;
+
+// Verify cron secret to prevent unauthorized access
+function verifyCronSecret(req: Request): boolean {
+  const cronSecret = process.env.CRON_SECRET;
+  if (!cronSecret) {
+    console.warn("[cron/recommendations] CRON_SECRET not set - allowing request in development");
+    return process.env.NODE_ENV !== "production";
+  }
+
+  const authHeader = req.headers.get("authorization");
+  if (!authHeader) return false;
+
+  const token = authHeader.replace("Bearer ", "");
+  return token === cronSecret;
+}
+
+function isPaidUser(userData: Record<string, any>): boolean {
+  const tier = userData.subscriptionTier || userData.tier;
+  return !!tier && tier !== "free";
+}
+
+/**
+ * GET /api/cron/recommendations
+ * Nightly precompute of label recommendations for every paid user with a
+ * generated EPK, so dashboard loads are served from labelRecommendations.
+ * Users whose cached entry is already current are skipped.
+ */
+export async function GET(req: Request) {
+  const requestId = crypto.randomUUID();
+  const startedAt = Date.now();
+  console.log(`[cron/recommendations] Starting job ${requestId}`);
+
+  if (!verifyCronSecret(req)) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  const { searchParams } = new URL(req.url);
+  const dryRun = searchParams.get("dryRun") === "true";
+
+  const results = {
+    requestId,
+    dryRun,
+    catalogVersion: 0,
+    totalLabels: 0,
+    processed: 0,
+    updated: 0,
+    skipped: 0,
+    durationMs: 0,
+  };
+
+  try {
+    const catalogVersion = await getLabelCatalogVersion();
+    const labelIndex = await getLabelIndexForVersion(catalogVersion);
+    const scorer = createBatchScorer(labelIndex.all());
+    results.catalogVersion = catalogVersion;
+    results.totalLabels = scorer.size;
+
+    const cohort = adminDb
+      .collection("users")
+      .where("epkEnhanced", "==", true)
+      .orderBy(admin.firestore.FieldPath.documentId())
+      .limit(PAGE_SIZE);
+
+    let lastDoc: admin.firestore.QueryDocumentSnapshot | null = null;
+    while (true) {
+      const page = await (lastDoc ? cohort.startAfter(lastDoc) : cohort).get();
+      if (page.empty) break;
+
+      const users = page.docs.filter((doc) => isPaidUser(doc.data()));
+      const cacheSnaps = users.length
+        ? await adminDb.getAll(...users.map((doc) => recommendationCacheRef(doc.id)))
+        : [];
+
+      const batch = adminDb.batch();
+      let writes = 0;
+
+      users.forEach((userDoc, i) => {
+        results.processed++;
+        const profile = userDoc.data() as RecommendationProfile;
+        const userGenres = recommendationGenres(profile);
+        const styleDescription = profile.epkContent?.styleDescription || "";
+        const profileHash = recommendationProfileHash(userGenres, styleDescription);
+
+        if (userGenres.length === 0 || isCacheCurrent(cacheSnaps[i].data(), catalogVersion, profileHash)) {
+          results.skipped++;
+          return;
+        }
+
+        results.updated++;
+        if (dryRun) return;
+
+        batch.set(recommendationCacheRef(userDoc.id), toCacheDoc({
+          catalogVersion,
+          profileHash,
+          recommendations: scorer.scoreArtist(userGenres, styleDescription, TOP_RECOMMENDATIONS),
+          totalLabels: scorer.size,
+          userGenres,
+        }));
+        writes++;
+      });
+
+      if (writes > 0) {
+        await batch.commit();
+      }
+
+      lastDoc = page.docs[page.docs.length - 1];
+      if (page.size < PAGE_SIZE) break;
+    }
+
+    results.durationMs = Date.now() - startedAt;
+    console.log(`[cron/recommendations] Job ${requestId} complete:`, results);
+    return NextResponse.json(results);
+  } catch (error: any) {
+    console.error(`[cron/recommendations] Job ${requestId} failed:`, error?.message || error);
+    return NextResponse.json(
+      { ...results, error: error?.message || "Unknown error" },
+      { status: 500 }
+    );
+  }
+}
+
+// Also support POST for manual triggering
+export async function POST(req: Request) {
+  return GET(req);
+}
@@ -9,7 +9,7 @@ export async function POST(req: Request) {
   try {
     const { uid, email } = await verifyAuth(req);
     const ip = getRequestIp(req);
-    const limit = rateLimit(`email:admin-application:${uid}:${ip}`);
+    const limit = await rateLimit(`email:admin-application:${uid}:${ip}`);
     if (!limit.allowed) {
       return NextResponse.json({ ok: false, error: "Rate limit exceeded" }, { status: 429 });
     }
@@ -158,7 +158,7 @@ export async function POST(req: Request) {
     const ip = getRequestIp(req);
 
     // Rate limit: max 1 EPK published email per day per user
-    const limit = rateLimit(`email:epk-published:${uid}`, 1, 24 * 60 * 60 * 1000);
+    const limit = await rateLimit(`email:epk-published:${uid}`, 1, 24 * 60 * 60 * 1000);
     if (!limit.allowed) {
       return NextResponse.json({ ok: true, skipped: true, reason: "rate_limited" });
     }
@@ -3,17 +3,21 @@ import admin from "firebase-admin";
 import { adminDb, verifyAuth } from "@/lib/firebaseAdmin";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
 import { sendTransactionalEmail, sendWithTemplate } from "@/services/email/postmark";
+import { enqueueEpkPdfRender } from "@/lib/pdf/prerenderQueue";
 
 export async function POST(req: Request) {
   const requestId = crypto.randomUUID();
   try {
     const { uid, email } = await verifyAuth(req);
     const ip = getRequestIp(req);
-    const limit = rateLimit(`email:epk:${uid}:${ip}`);
+    const limit = await rateLimit(`email:epk:${uid}:${ip}`);
     if (!limit.allowed) {
       return NextResponse.json({ ok: false, error: "Rate limit exceeded" }, { status: 429 });
     }
 
+    // The EPK (e.g. its press images) changed: refresh the stored PDF whether or not we email
+    await enqueueEpkPdfRender(uid, "epk-updated");
+
     const userRef = adminDb.collection("users").doc(uid);
     const pressRef = userRef.collection("media").doc("press");
 
@@ -136,7 +136,7 @@ export async function POST(req: Request) {
     const ip = getRequestIp(req);
 
     // Rate limit: max 1 first image email ever per user
-    const limit = rateLimit(`email:first-image:${uid}`, 1, 365 * 24 * 60 * 60 * 1000);
+    const limit = await rateLimit(`email:first-image:${uid}`, 1, 365 * 24 * 60 * 60 * 1000);
     if (!limit.allowed) {
       return NextResponse.json({ ok: true, skipped: true, reason: "rate_limited" });
     }
@@ -12,7 +12,7 @@ export async function POST(req: Request) {
     }
 
     const ip = getRequestIp(req);
-    const limit = rateLimit(`email:send:${ip}`);
+    const limit = await rateLimit(`email:send:${ip}`);
     if (!limit.allowed) {
       return NextResponse.json({ ok: false, error: "Rate limit exceeded" }, { status: 429 });
     }
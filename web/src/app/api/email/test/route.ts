@@ -24,7 +24,7 @@ export async function POST(req: Request) {
     }
 
     const ip = getRequestIp(req);
-    const limit = rateLimit(`email:test:${ip}`);
+    const limit = await rateLimit(`email:test:${ip}`);
     if (!limit.allowed) {
       return NextResponse.json({ ok: false, error: "Rate limit exceeded" }, { status: 429 });
     }
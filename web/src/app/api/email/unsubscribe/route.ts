@@ -1,6 +1,7 @@
 import { NextResponse } from "next/server";
 import { adminDb } from "@/lib/firebaseAdmin";
 import admin from "firebase-admin";
+import { addEmailMetricIncrements } from "@/lib/firestore/emailMetrics";
 
 /**
  * GET /api/email/unsubscribe
@@ -61,13 +62,16 @@ export async function GET(req: Request) {
 
     await userRef.update(updateData);
 
-    // Log the unsubscribe
-    await adminDb.collection("emailUnsubscribes").add({
+    // Log the unsubscribe (and count it in the email metrics)
+    const logBatch = adminDb.batch();
+    logBatch.set(adminDb.collection("emailUnsubscribes").doc(), {
       uid,
       emailType,
       timestamp: admin.firestore.FieldValue.serverTimestamp(),
       userAgent: req.headers.get("user-agent") || null,
     });
+    addEmailMetricIncrements(logBatch, [{ type: emailType, status: "unsubscribed" }]);
+    await logBatch.commit();
 
     return new Response(unsubscribePageHtml("Successfully unsubscribed", true), {
       status: 200,
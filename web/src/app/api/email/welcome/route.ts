@@ -3,6 +3,7 @@ import admin from "firebase-admin";
 import { adminDb, verifyAuth } from "@/lib/firebaseAdmin";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
 import { sendTransactionalEmail, sendWithTemplate } from "@/services/email/postmark";
+import { setUserEmailEntry } from "@/lib/firestore/userEmails";
 
 function generateWelcomeEmailHtml(name: string, dashboardUrl: string, mediaUrl: string, pricingUrl: string): string {
   const displayName = name || "Artist";
@@ -130,7 +131,7 @@ export async function POST(req: Request) {
   try {
     const { uid, email } = await verifyAuth(req);
     const ip = getRequestIp(req);
-    const limit = rateLimit(`email:welcome:${uid}:${ip}`);
+    const limit = await rateLimit(`email:welcome:${uid}:${ip}`);
     if (!limit.allowed) {
       return NextResponse.json({ ok: false, error: "Rate limit exceeded" }, { status: 429 });
     }
@@ -183,7 +184,9 @@ export async function POST(req: Request) {
       messageId = result.messageId;
     }
 
-    await userRef.set(
+    const batch = adminDb.batch();
+    batch.set(
+      userRef,
       {
         emailFlags: {
           welcomeSentAt: admin.firestore.FieldValue.serverTimestamp(),
@@ -193,6 +196,9 @@ export async function POST(req: Request) {
       },
       { merge: true }
     );
+    // Email → uid lookup for the Postmark webhook
+    setUserEmailEntry(batch, uid, targetEmail);
+    await batch.commit();
 
     return NextResponse.json({ ok: true });
   } catch (error: any) {
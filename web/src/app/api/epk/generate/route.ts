@@ -2,6 +2,8 @@ import { NextResponse } from "next/server";
 import { verifyAuth } from "@/lib/firebaseAdmin";
 import { adminDb } from "@/lib/firebaseAdmin";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
+import { refreshRecommendations } from "@/lib/submissions/recommendations";
+import { enqueueEpkPdfRender } from "@/lib/pdf/prerenderQueue";
 
 const GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent";
 
@@ -202,7 +204,7 @@ export async function POST(req: Request) {
     const ip = getRequestIp(req);
 
     // Rate limit: 5 EPK generations per day
-    const limit = rateLimit(`epk:generate:${uid}:${ip}`, 5, 86400);
+    const limit = await rateLimit(`epk:generate:${uid}:${ip}`, 5, 86400);
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Rate limit exceeded. You can generate 5 EPKs per day." },
@@ -247,6 +249,16 @@ export async function POST(req: Request) {
       updatedAt: new Date(),
     }, { merge: true });
 
+    // Pre-render the PDF in the background so the download is a stored file
+    await enqueueEpkPdfRender(uid, "epk-generated");
+
+    // The new style description changes label matches; recompute them now so the dashboard hits the cache
+    try {
+      await refreshRecommendations(uid);
+    } catch (error: any) {
+      console.error("[epk/generate] Failed to refresh recommendations:", error?.message || error);
+    }
+
     return NextResponse.json({
       ok: true,
       epk: epkContent,
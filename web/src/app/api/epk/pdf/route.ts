@@ -1,7 +1,9 @@
 import { NextResponse } from "next/server";
+import { createHash } from "crypto";
 import { verifyAuth } from "@/lib/firebaseAdmin";
 import { adminDb } from "@/lib/firebaseAdmin";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
+import { etagMatches } from "@/lib/httpRange";
 
 type EpkContent = {
   enhancedBio: string;
@@ -380,7 +382,7 @@ export async function GET(req: Request) {
     const ip = getRequestIp(req);
 
     // Rate limit: 10 PDF downloads per hour
-    const limit = rateLimit(`epk:pdf:${uid}:${ip}`, 10, 3600);
+    const limit = await rateLimit(`epk:pdf:${uid}:${ip}`, 10, 3600);
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Rate limit exceeded. Try again later." },
@@ -401,14 +403,21 @@ export async function GET(req: Request) {
 
     // Generate HTML for PDF
     const html = generatePdfHtml(profile);
+    const etag = `"${createHash("sha256").update(html).digest("hex").slice(0, 32)}"`;
+    const headers = {
+      "Content-Type": "text/html; charset=utf-8",
+      "Content-Disposition": `inline; filename="${profile.artistName || "artist"}-epk.html"`,
+      "Cache-Control": "private, no-cache",
+      ETag: etag,
+    };
+
+    // Unchanged EPK: the client's copy is current
+    if (etagMatches(req.headers.get("if-none-match"), etag)) {
+      return new NextResponse(null, { status: 304, headers });
+    }
 
     // Return HTML (client will use browser print or a PDF library)
-    return new NextResponse(html, {
-      headers: {
-        "Content-Type": "text/html; charset=utf-8",
-        "Content-Disposition": `inline; filename="${profile.artistName || "artist"}-epk.html"`,
-      },
-    });
+    return new NextResponse(html, { headers });
 
   } catch (error: any) {
     console.error("[epk/pdf] Error:", error);
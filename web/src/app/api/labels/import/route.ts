@@ -1,23 +1,10 @@
 import { NextResponse } from "next/server";
-import { adminDb } from "@/lib/firebaseAdmin";
-import admin from "firebase-admin";
+import { verifyAdmin } from "@/lib/firebaseAdmin";
+import { bumpLabelCatalogVersion } from "@/lib/submissions/recommendations";
+import { LabelImporter, readNdjson, type LabelImportResults } from "@/lib/submissions/labelImport";
+import { backfillLabelNameIndex } from "@/lib/submissions/labelNames";
 
-// Verify admin token
-async function verifyAdmin(req: Request): Promise<boolean> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return false;
-
-  const token = authHeader.split("Bearer ")[1];
-
-  try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    const adminDoc = await adminDb.collection("admins").doc(decoded.uid).get();
-    return adminDoc.exists;
-  } catch {
-    return false;
-  }
-}
+export const maxDuration = 300;
 
 // Check for internal secret (for seeding)
 function hasInternalSecret(req: Request): boolean {
@@ -25,19 +12,61 @@ function hasInternalSecret(req: Request): boolean {
   return secret === process.env.CRON_SECRET;
 }
 
-type LabelImport = {
-  name: string;
-  genres: string[];
-  country?: string;
-  website?: string;
-  submissionUrl?: string;
-  submissionEmail?: string;
-  notes?: string;
-};
+function summary(results: LabelImportResults) {
+  return {
+    ...results,
+    message: `Imported ${results.imported} labels, skipped ${results.skipped}`,
+  };
+}
+
+/**
+ * Stream an NDJSON upload into the importer, answering with NDJSON progress
+ * lines ({"type":"progress",...} per committed batch) and a final
+ * {"type":"done",...} line
+ */
+function streamNdjsonImport(body: ReadableStream<Uint8Array>, concurrency?: number) {
+  const encoder = new TextEncoder();
+
+  return new ReadableStream<Uint8Array>({
+    async start(controller) {
+      const send = (line: Record<string, unknown>) => controller.enqueue(encoder.encode(`${JSON.stringify(line)}\n`));
+      const importer = new LabelImporter({
+        concurrency,
+        onProgress: ({ errors, ...counts }) => send({ type: "progress", ...counts, errorCount: errors.length }),
+      });
+
+      try {
+        for await (const item of readNdjson(body)) {
+          if (item.error) importer.reject(item.error);
+          else await importer.add(item.value);
+        }
+        const results = await importer.finish();
+        if (results.imported > 0) {
+          await bumpLabelCatalogVersion();
+        }
+        send({ type: "done", ok: true, ...summary(results) });
+      } catch (error: any) {
+        console.error("[api/labels/import] Stream error:", error);
+        const results = await importer.finish();
+        if (results.imported > 0) {
+          await bumpLabelCatalogVersion();
+        }
+        send({ type: "error", ok: false, error: error?.message || "Import failed", ...results });
+      }
+      controller.close();
+    },
+  });
+}
 
 /**
  * POST /api/labels/import
  * Bulk import labels (admin only or with secret)
+ *
+ * - application/x-ndjson: one label per line, streamed in as it uploads, with
+ *   NDJSON progress lines streamed back (any size; split large catalogs into
+ *   several uploads if needed, duplicates are skipped across uploads)
+ * - application/json: { labels: [...] }, answered with the totals
+ * - ?rebuildNameIndex=true: index existing label names (one-time setup)
  */
 export async function POST(req: Request) {
   // Verify access
@@ -49,88 +78,45 @@ export async function POST(req: Request) {
   }
 
   try {
-    const body = await req.json();
-    const labels: LabelImport[] = body.labels;
-
-    if (!labels || !Array.isArray(labels)) {
-      return NextResponse.json({ error: "labels array required" }, { status: 400 });
+    const { searchParams } = new URL(req.url);
+    if (searchParams.get("rebuildNameIndex") === "true") {
+      const results = await backfillLabelNameIndex();
+      return NextResponse.json({ ok: true, ...results });
     }
 
-    const results = {
-      imported: 0,
-      skipped: 0,
-      errors: [] as string[],
-    };
-
-    // Get existing labels to check for duplicates
-    const existingSnapshot = await adminDb.collection("labels").get();
-    const existingNames = new Set(
-      existingSnapshot.docs.map(doc => doc.data().name?.toLowerCase())
-    );
-
-    // Process labels in batches
-    const batch = adminDb.batch();
-    let batchCount = 0;
-
-    for (const label of labels) {
-      // Skip if no name
-      if (!label.name) {
-        results.skipped++;
-        continue;
-      }
-
-      // Skip duplicates
-      if (existingNames.has(label.name.toLowerCase())) {
-        results.skipped++;
-        continue;
-      }
-
-      // Determine submission method
-      let submissionMethod: "email" | "webform" | "portal" | "none" = "none";
-      if (label.submissionEmail) {
-        submissionMethod = "email";
-      } else if (label.submissionUrl) {
-        submissionMethod = "webform";
+    const concurrency = Number(searchParams.get("concurrency")) || undefined;
+    const contentType = req.headers.get("content-type") || "";
+    if (contentType.includes("ndjson")) {
+      if (!req.body) {
+        return NextResponse.json({ error: "Request body required" }, { status: 400 });
       }
-
-      // Create label document
-      const docRef = adminDb.collection("labels").doc();
-      batch.set(docRef, {
-        name: label.name,
-        genres: label.genres || [],
-        country: label.country || null,
-        website: label.website || null,
-        submissionMethod,
-        submissionEmail: label.submissionEmail || null,
-        submissionUrl: label.submissionUrl || null,
-        notes: label.notes || null,
-        confidenceScore: 80, // Admin-imported
-        addedBy: "admin",
-        isActive: true,
-        createdAt: admin.firestore.FieldValue.serverTimestamp(),
-        updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+      return new Response(streamNdjsonImport(req.body, concurrency), {
+        headers: {
+          "Content-Type": "application/x-ndjson",
+          "Cache-Control": "no-cache",
+        },
       });
+    }
 
-      existingNames.add(label.name.toLowerCase());
-      batchCount++;
-      results.imported++;
+    const body = await req.json();
+    const labels: unknown[] = body.labels;
 
-      // Commit batch every 500 labels
-      if (batchCount >= 500) {
-        await batch.commit();
-        batchCount = 0;
-      }
+    if (!labels || !Array.isArray(labels)) {
+      return NextResponse.json({ error: "labels array required" }, { status: 400 });
     }
 
-    // Commit remaining
-    if (batchCount > 0) {
-      await batch.commit();
+    const importer = new LabelImporter({ concurrency });
+    for (const label of labels) {
+      await importer.add(label);
+    }
+    const results = await importer.finish();
+    if (results.imported > 0) {
+      await bumpLabelCatalogVersion();
     }
 
     return NextResponse.json({
       ok: true,
-      ...results,
-      message: `Imported ${results.imported} labels, skipped ${results.skipped}`,
+      ...summary(results),
     });
   } catch (error: any) {
     console.error("[api/labels/import] Error:", error);
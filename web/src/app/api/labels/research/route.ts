@@ -1,23 +1,12 @@
 import { NextResponse } from "next/server";
 import { GoogleGenerativeAI } from "@google/generative-ai";
-import { adminDb } from "@/lib/firebaseAdmin";
+import { adminDb, verifyAuth, isAdmin } from "@/lib/firebaseAdmin";
 
 // Verify user token
 async function verifyUser(req: Request): Promise<{ uid: string; isAdmin: boolean } | null> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return null;
-
-  const token = authHeader.split("Bearer ")[1];
-
   try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    const adminDoc = await adminDb.collection("admins").doc(decoded.uid).get();
-    
-    return {
-      uid: decoded.uid,
-      isAdmin: adminDoc.exists,
-    };
+    const { uid } = await verifyAuth(req);
+    return { uid, isAdmin: await isAdmin(uid) };
   } catch {
     return null;
   }
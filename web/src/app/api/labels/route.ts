@@ -1,26 +1,14 @@
 import { NextResponse } from "next/server";
-import { adminDb } from "@/lib/firebaseAdmin";
+import { adminDb, verifyAuth, isAdmin } from "@/lib/firebaseAdmin";
 import { getLabels, addLabel, updateLabel, getUserLabels } from "@/lib/submissions/queries";
 import type { Label } from "@/lib/submissions";
+import { bumpLabelCatalogVersion } from "@/lib/submissions/recommendations";
 
 // Verify user token
 async function verifyUser(req: Request): Promise<{ uid: string; isAdmin: boolean } | null> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return null;
-
-  const token = authHeader.split("Bearer ")[1];
-
   try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    
-    // Check if admin
-    const adminDoc = await adminDb.collection("admins").doc(decoded.uid).get();
-    
-    return {
-      uid: decoded.uid,
-      isAdmin: adminDoc.exists,
-    };
+    const { uid } = await verifyAuth(req);
+    return { uid, isAdmin: await isAdmin(uid) };
   } catch {
     return null;
   }
@@ -137,6 +125,7 @@ export async function POST(req: Request) {
     };
 
     const labelId = await addLabel(label);
+    await bumpLabelCatalogVersion();
 
     return NextResponse.json({
       ok: true,
@@ -190,6 +179,7 @@ export async function PATCH(req: Request) {
     delete updates.createdAt;
 
     await updateLabel(labelId, updates);
+    await bumpLabelCatalogVersion();
 
     return NextResponse.json({
       ok: true,
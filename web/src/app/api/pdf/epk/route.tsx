@@ -1,79 +1,20 @@
 import { NextResponse } from "next/server";
-import React from "react";
-import { renderToBuffer } from "@react-pdf/renderer";
+import { PassThrough, Readable } from "stream";
 import admin from "firebase-admin";
-import { adminDb, adminStorage } from "@/lib/firebaseAdmin";
+import { adminDb } from "@/lib/firebaseAdmin";
 import { verifyAuth } from "@/lib/firebaseAdmin";
 import { getRequestIp, rateLimit } from "@/lib/rateLimit";
-import { EpkPdfDocument, type EpkPdfData, type EpkTier, type TrackInfo } from "@/lib/pdf/EpkPdfTemplate";
-import QRCode from "qrcode";
+import { etagMatches, requestedRange } from "@/lib/httpRange";
+import { buildEpkPdfData, epkTierOf, hasPdfAccess, renderEpkPdfStream } from "@/lib/pdf/epkPdf";
+import {
+  clearEpkPdfCache,
+  createEpkPdfWriteStream,
+  epkPdfCacheKey,
+  findCachedEpkPdf,
+} from "@/lib/pdf/epkPdfCache";
 
 export const dynamic = "force-dynamic";
-export const maxDuration = 60; // 60 second timeout for PDF generation
-
-// Generate QR code as data URL
-async function generateQRCode(url: string): Promise<string | undefined> {
-  try {
-    return await QRCode.toDataURL(url, {
-      width: 120,
-      margin: 1,
-      color: { dark: "#10b981", light: "#00000000" },
-    });
-  } catch {
-    return undefined;
-  }
-}
-
-// Get cached PDF path
-function getCachePath(uid: string): string {
-  return `epk-pdfs/${uid}/epk-latest.pdf`;
-}
-
-// Check if cached PDF exists and is recent
-async function getCachedPdf(uid: string, tier: EpkTier): Promise<Buffer | null> {
-  // Only cache for Tier II and III
-  if (tier === "tier1") return null;
-  
-  try {
-    const bucket = adminStorage.bucket();
-    const file = bucket.file(getCachePath(uid));
-    const [exists] = await file.exists();
-    
-    if (!exists) return null;
-    
-    // Check if cache is less than 1 hour old
-    const [metadata] = await file.getMetadata();
-    const updatedAt = new Date(metadata.updated as string);
-    const hourAgo = new Date(Date.now() - 60 * 60 * 1000);
-    
-    if (updatedAt < hourAgo) return null;
-    
-    const [buffer] = await file.download();
-    return buffer;
-  } catch (error) {
-    console.error("[pdf/epk] Cache read error:", error);
-    return null;
-  }
-}
-
-// Save PDF to cache
-async function cachePdf(uid: string, buffer: Buffer, tier: EpkTier): Promise<void> {
-  // Only cache for Tier II and III
-  if (tier === "tier1") return;
-  
-  try {
-    const bucket = adminStorage.bucket();
-    const file = bucket.file(getCachePath(uid));
-    await file.save(buffer, {
-      contentType: "application/pdf",
-      metadata: {
-        cacheControl: "private, max-age=3600",
-      },
-    });
-  } catch (error) {
-    console.error("[pdf/epk] Cache write error:", error);
-  }
-}
+export const maxDuration = 60; // 60 second timeout for PDF generation (only when no pre-render is stored)
 
 export async function GET(req: Request) {
   const requestId = crypto.randomUUID();
@@ -85,7 +26,7 @@ export async function GET(req: Request) {
     
     // Rate limiting based on tier
     const ip = getRequestIp(req);
-    const limit = rateLimit(`pdf-epk:${uid}:${ip}`, 10, 3600000); // 10 per hour
+    const limit = await rateLimit(`pdf-epk:${uid}:${ip}`, 10, 3600000); // 10 per hour
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Rate limit exceeded. Please try again later." },
@@ -105,141 +46,109 @@ export async function GET(req: Request) {
     const userData = userDoc.data()!;
     
     // Determine subscription tier
-    const tier: EpkTier = (userData.subscriptionTier as EpkTier) || "tier1";
+    const tier = epkTierOf(userData);
     
     // Check subscription status
-    const subStatus = userData.subscriptionStatus || userData.paymentStatus;
-    if (subStatus !== "active" && subStatus !== "paid" && subStatus !== "trialing") {
+    if (!hasPdfAccess(userData)) {
       return NextResponse.json(
         { ok: false, error: "Active subscription required to download PDF" },
         { status: 403 }
       );
     }
-    
-    // Check for cached PDF (Tier II & III only)
+
+    // Build PDF data (same inputs the background pre-render hashes)
+    const pdfData = await buildEpkPdfData(uid, userData, email);
+
+    // The content address doubles as the ETag: same EPK, same bytes
+    const cacheKey = epkPdfCacheKey(pdfData);
+    const etag = `"${cacheKey}"`;
+    const filename = `${pdfData.artistName.replace(/[^a-zA-Z0-9]/g, "_")}_EPK.pdf`;
+    const headers: Record<string, string> = {
+      "Content-Type": "application/pdf",
+      "Content-Disposition": `attachment; filename="${filename}"`,
+      "Cache-Control": "private, no-cache",
+      ETag: etag,
+    };
+
+    const logDownload = (fields: Record<string, unknown>) =>
+      adminDb.collection("pdfDownloads").add({
+        uid,
+        tier,
+        generatedAt: admin.firestore.FieldValue.serverTimestamp(),
+        ip,
+        ...fields,
+      });
+
     const forceRegenerate = req.headers.get("x-force-regenerate") === "true";
     if (!forceRegenerate) {
-      const cached = await getCachedPdf(uid, tier);
-      if (cached) {
-        // Log cached download
-        await adminDb.collection("pdfDownloads").add({
-          uid,
-          tier,
-          cached: true,
-          generatedAt: admin.firestore.FieldValue.serverTimestamp(),
-          ip,
-          fileSize: cached.length,
-        });
-        
-        const filename = `${(userData.artistName || "Artist").replace(/[^a-zA-Z0-9]/g, "_")}_EPK.pdf`;
-        return new NextResponse(new Uint8Array(cached), {
-          status: 200,
+      // Unchanged since the client's copy: nothing to send
+      if (etagMatches(req.headers.get("if-none-match"), etag)) {
+        await logDownload({ cached: true, notModified: true, fileSize: 0 });
+        return new NextResponse(null, { status: 304, headers: { ...headers, "X-Cache": "HIT" } });
+      }
+
+      // Serve the pre-rendered (or previously rendered) file, streamed
+      const stored = await findCachedEpkPdf(uid, cacheKey);
+      if (stored) {
+        const range = requestedRange(req, stored.size, etag);
+        if (range === "unsatisfiable") {
+          return new NextResponse(null, {
+            status: 416,
+            headers: { ...headers, "Content-Range": `bytes */${stored.size}` },
+          });
+        }
+
+        const start = range?.start ?? 0;
+        const end = range?.end ?? stored.size - 1;
+        await logDownload({ cached: true, cacheSource: stored.source, fileSize: end - start + 1 });
+
+        return new NextResponse(stored.open(start, end), {
+          status: range ? 206 : 200,
           headers: {
-            "Content-Type": "application/pdf",
-            "Content-Disposition": `attachment; filename="${filename}"`,
-            "Content-Length": cached.length.toString(),
+            ...headers,
+            "Accept-Ranges": "bytes",
+            "Content-Length": String(end - start + 1),
+            ...(range ? { "Content-Range": `bytes ${start}-${end}/${stored.size}` } : {}),
             "X-Cache": "HIT",
           },
         });
       }
     }
 
-    // Fetch press images
-    const mediaSnap = await adminDb
-      .collection("users")
-      .doc(uid)
-      .collection("media")
-      .orderBy("sortOrder", "asc")
-      .limit(6)
-      .get();
+    // No stored render yet (e.g. pre-render still queued): stream the render to
+    // the client and to Storage at the same time
+    const rendered = Readable.from(await renderEpkPdfStream(pdfData));
+    const toClient = new PassThrough();
+    const toStorage = createEpkPdfWriteStream(uid, cacheKey, tier);
+    let fileSize = 0;
 
-    const pressImages = mediaSnap.docs.map((doc) => {
-      const data = doc.data();
-      return {
-        url: data.downloadURL,
-        width: data.width || 500,
-        height: data.height || 500,
-      };
+    rendered.on("data", (chunk: Buffer) => {
+      fileSize += chunk.length;
     });
-
-    // Build tracks with QR codes (Tier II & III)
-    let tracks: TrackInfo[] | undefined;
-    if (userData.tracks && Array.isArray(userData.tracks)) {
-      tracks = await Promise.all(
-        userData.tracks.slice(0, tier === "tier1" ? 3 : 5).map(async (track: any) => {
-          const trackInfo: TrackInfo = {
-            title: track.title || "Untitled",
-            description: track.description,
-            streamingUrl: track.streamingUrl || track.url,
-          };
-          
-          // Generate QR codes for Tier II & III
-          if (tier !== "tier1" && trackInfo.streamingUrl) {
-            trackInfo.qrCodeDataUrl = await generateQRCode(trackInfo.streamingUrl);
-          }
-          
-          return trackInfo;
-        })
-      );
-    }
-
-    // Build PDF data
-    const pdfData: EpkPdfData = {
-      artistName: userData.artistName || userData.displayName || "Artist",
-      tagline: userData.tagline || userData.genre || undefined,
-      bio: userData.bio || undefined,
-      genre: userData.genre || undefined,
-      location: userData.location || undefined,
-      contactEmail: userData.contactEmail || email || undefined,
-      website: userData.links?.website || undefined,
-      quote: userData.quote || undefined,
-      achievements: userData.achievements || undefined,
-      tracks,
-      pressQuotes: tier === "tier3" ? userData.pressQuotes : undefined,
-      stats: userData.stats || undefined,
-      links: userData.links || undefined,
-      pressImages,
-      tier,
-      brandSettings: tier === "tier3" ? userData.brandSettings : undefined,
-    };
-
-    // Generate PDF
-    // eslint-disable-next-line @typescript-eslint/no-explicit-any
-    const pdfBuffer = await renderToBuffer(
-      React.createElement(EpkPdfDocument, { data: pdfData }) as any
-    );
-    
-    const generationTime = Date.now() - startTime;
-
-    // Cache PDF for Tier II & III
-    await cachePdf(uid, pdfBuffer, tier);
-
-    // Log PDF generation with analytics
-    await adminDb.collection("pdfDownloads").add({
-      uid,
-      tier,
-      cached: false,
-      generatedAt: admin.firestore.FieldValue.serverTimestamp(),
-      ip,
-      fileSize: pdfBuffer.length,
-      generationDuration: generationTime,
-      imageCount: pressImages.length,
-      trackCount: tracks?.length || 0,
+    rendered.on("end", () => {
+      // Log PDF generation with analytics
+      logDownload({
+        cached: false,
+        fileSize,
+        generationDuration: Date.now() - startTime,
+        imageCount: pdfData.pressImages.length,
+        trackCount: pdfData.tracks?.length || 0,
+      }).catch((error) => console.error(`[pdf/epk] requestId=${requestId} log error`, error?.message || error));
     });
+    rendered.on("error", (error) => {
+      console.error(`[pdf/epk] requestId=${requestId} render error`, error?.message || error);
+      toStorage.destroy(error);
+      toClient.destroy(error);
+    });
+    rendered.pipe(toStorage);
+    rendered.pipe(toClient);
 
-    // Generate filename
-    const filename = `${pdfData.artistName.replace(/[^a-zA-Z0-9]/g, "_")}_EPK.pdf`;
-
-    // Return PDF as download
-    return new NextResponse(new Uint8Array(pdfBuffer), {
+    return new NextResponse(Readable.toWeb(toClient) as unknown as ReadableStream<Uint8Array>, {
       status: 200,
       headers: {
-        "Content-Type": "application/pdf",
-        "Content-Disposition": `attachment; filename="${filename}"`,
-        "Content-Length": pdfBuffer.length.toString(),
-        "Cache-Control": "no-store, max-age=0",
+        ...headers,
         "X-Cache": "MISS",
-        "X-Generation-Time": `${generationTime}ms`,
+        "X-Render-Start-Time": `${Date.now() - startTime}ms`,
       },
     });
   } catch (error: any) {
@@ -268,7 +177,7 @@ export async function POST(req: Request) {
     
     // Rate limit regeneration
     const ip = getRequestIp(req);
-    const limit = rateLimit(`pdf-regen:${uid}:${ip}`, 3, 3600000); // 3 per hour
+    const limit = await rateLimit(`pdf-regen:${uid}:${ip}`, 3, 3600000); // 3 per hour
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Regeneration limit reached. Try again later." },
@@ -276,13 +185,11 @@ export async function POST(req: Request) {
       );
     }
     
-    // Delete cached PDF
+    // Delete cached PDFs
     try {
-      const bucket = adminStorage.bucket();
-      const file = bucket.file(getCachePath(uid));
-      await file.delete();
+      await clearEpkPdfCache(uid);
     } catch (error) {
-      // Ignore if doesn't exist
+      // Ignore if nothing is cached
     }
     
     // Redirect to GET to regenerate
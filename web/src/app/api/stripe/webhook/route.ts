@@ -1,7 +1,7 @@
 import { NextResponse } from "next/server";
 import admin from "firebase-admin";
 import { getStripe } from "@/lib/stripe";
-import { adminDb } from "@/lib/firebaseAdmin";
+import { adminDb, invalidateUserAccess } from "@/lib/firebaseAdmin";
 import { trackServerEvent } from "@/lib/analytics/serverTracking";
 import Stripe from "stripe";
 
@@ -90,7 +90,7 @@ export async function POST(req: Request) {
       const billingPeriod = session.metadata?.billingPeriod || "monthly";
 
       // Track checkout completed
-      await trackServerEvent("checkout_completed", uid, {
+      trackServerEvent("checkout_completed", uid, {
         tier,
         billingPeriod,
         amount: session.amount_total,
@@ -140,6 +140,7 @@ export async function POST(req: Request) {
             },
             { merge: true },
           );
+        invalidateUserAccess(uid);
       }
     }
 
@@ -171,6 +172,7 @@ export async function POST(req: Request) {
             },
             { merge: true },
           );
+        invalidateUserAccess(uid);
       }
 
       // Log subscription change
@@ -204,6 +206,7 @@ export async function POST(req: Request) {
           },
           { merge: true },
         );
+        invalidateUserAccess(uid);
       }
 
       // Log cancellation
@@ -246,6 +249,7 @@ export async function POST(req: Request) {
           },
           { merge: true },
         );
+        invalidateUserAccess(uid);
       }
 
       // Log payment failure
@@ -295,6 +299,7 @@ export async function POST(req: Request) {
           },
           { merge: true },
         );
+        invalidateUserAccess(uid);
       }
 
       // Log renewal payment
@@ -0,0 +1,83 @@
+import { NextResponse } from "next/server";
+import { verifyUser } from "@/lib/firebaseAdmin";
+import { prepareCampaign, runCampaign, type CampaignPlan } from "@/lib/submissions/campaignSend";
+
+export const maxDuration = 300;
+
+/**
+ * Send a prepared campaign, answering with NDJSON: one {"type":"label",...}
+ * line per label as its chunk is sent (skipped labels first) and a final
+ * {"type":"done",...} line
+ */
+function streamCampaign(plan: CampaignPlan) {
+  const encoder = new TextEncoder();
+
+  return new ReadableStream<Uint8Array>({
+    async start(controller) {
+      let open = true;
+      const send = (line: Record<string, unknown>) => {
+        if (!open) return;
+        try {
+          controller.enqueue(encoder.encode(`${JSON.stringify(line)}\n`));
+        } catch {
+          // Client went away; the campaign still finishes
+          open = false;
+        }
+      };
+      send({ type: "started", campaignId: plan.campaignId, queued: plan.queued.length, skipped: plan.skipped.length });
+
+      try {
+        const summary = await runCampaign(plan, (status) => send({ type: "label", ...status }));
+        send({ type: "done", ok: true, ...summary });
+      } catch (error: any) {
+        console.error("[api/submissions/campaign] Stream error:", error);
+        send({ type: "error", ok: false, campaignId: plan.campaignId, error: error?.message || "Campaign send failed" });
+      }
+      if (open) controller.close();
+    },
+  });
+}
+
+/**
+ * POST /api/submissions/campaign
+ * Send the user's pitch to several labels at once (Mode C - Email)
+ *
+ * Body: { labelIds: string[], pitchType?, customMessage?, name? }
+ * The user, quota and pitch are checked once for the whole campaign; labels
+ * that do not take email or are past the monthly limit are skipped.
+ * Answers with NDJSON status lines as the emails go out.
+ */
+export async function POST(req: Request) {
+  const user = await verifyUser(req);
+  if (!user) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 });
+  }
+
+  try {
+    const body = await req.json();
+    const { labelIds, pitchType = "medium", customMessage, name } = body;
+
+    if (!Array.isArray(labelIds)) {
+      return NextResponse.json({ error: "labelIds array required" }, { status: 400 });
+    }
+
+    const plan = await prepareCampaign(user, { labelIds, pitchType, customMessage, name });
+    if ("error" in plan) {
+      const { status, ...rest } = plan;
+      return NextResponse.json({ ok: false, ...rest }, { status });
+    }
+
+    return new Response(streamCampaign(plan), {
+      headers: {
+        "Content-Type": "application/x-ndjson",
+        "Cache-Control": "no-cache",
+      },
+    });
+  } catch (error: any) {
+    console.error("[api/submissions/campaign] Error:", error);
+    return NextResponse.json(
+      { ok: false, error: error?.message || "Failed to send campaign" },
+      { status: 500 }
+    );
+  }
+}
@@ -1,38 +1,8 @@
 import { NextResponse } from "next/server";
-import { adminDb } from "@/lib/firebaseAdmin";
+import { verifyUser } from "@/lib/firebaseAdmin";
 import { getUserSubmissions, getMonthlySubmissionCount } from "@/lib/submissions/queries";
 import { canSubmit } from "@/lib/submissions";
 
-// Verify user token
-async function verifyUser(req: Request): Promise<{
-  uid: string;
-  tier: string;
-  status: string;
-} | null> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return null;
-
-  const token = authHeader.split("Bearer ")[1];
-
-  try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    
-    const userDoc = await adminDb.collection("users").doc(decoded.uid).get();
-    if (!userDoc.exists) return null;
-    
-    const userData = userDoc.data()!;
-    
-    return {
-      uid: decoded.uid,
-      tier: userData.subscriptionTier || userData.tier || "tier1",
-      status: userData.subscriptionStatus || "active",
-    };
-  } catch {
-    return null;
-  }
-}
-
 /**
  * GET /api/submissions/history
  * Get user's submission history and stats
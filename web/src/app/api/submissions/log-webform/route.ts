@@ -1,41 +1,11 @@
 import { NextResponse } from "next/server";
-import { adminDb } from "@/lib/firebaseAdmin";
+import { verifyUser } from "@/lib/firebaseAdmin";
 import { 
-  getMonthlySubmissionCount, 
+  reserveSubmission, 
   createSubmissionLog, 
   getLabel 
 } from "@/lib/submissions/queries";
-import { canSubmit } from "@/lib/submissions";
-
-// Verify user token and get user data
-async function verifyUser(req: Request): Promise<{
-  uid: string;
-  tier: string;
-  status: string;
-} | null> {
-  const authHeader = req.headers.get("authorization");
-  if (!authHeader?.startsWith("Bearer ")) return null;
-
-  const token = authHeader.split("Bearer ")[1];
-
-  try {
-    const { getAuth } = await import("firebase-admin/auth");
-    const decoded = await getAuth().verifyIdToken(token);
-    
-    const userDoc = await adminDb.collection("users").doc(decoded.uid).get();
-    if (!userDoc.exists) return null;
-    
-    const userData = userDoc.data()!;
-    
-    return {
-      uid: decoded.uid,
-      tier: userData.subscriptionTier || userData.tier || "tier1",
-      status: userData.subscriptionStatus || "active",
-    };
-  } catch {
-    return null;
-  }
-}
+import { trackServerEvent } from "@/lib/analytics/serverTracking";
 
 /**
  * POST /api/submissions/log-webform
@@ -55,9 +25,14 @@ export async function POST(req: Request) {
       return NextResponse.json({ error: "Label ID required" }, { status: 400 });
     }
 
-    // Check submission limit
-    const monthlyCount = await getMonthlySubmissionCount(user.uid);
-    const limitCheck = canSubmit(monthlyCount, user.tier, user.status);
+    // Get label info
+    const label = await getLabel(labelId);
+    if (!label) {
+      return NextResponse.json({ error: "Label not found" }, { status: 404 });
+    }
+
+    // Check submission limit (the reserved slot becomes the log below)
+    const limitCheck = await reserveSubmission(user.uid, user.tier, user.status);
 
     if (!limitCheck.allowed) {
       return NextResponse.json({
@@ -68,12 +43,6 @@ export async function POST(req: Request) {
       }, { status: 429 });
     }
 
-    // Get label info
-    const label = await getLabel(labelId);
-    if (!label) {
-      return NextResponse.json({ error: "Label not found" }, { status: 404 });
-    }
-
     // Create submission log
     const submissionId = await createSubmissionLog({
       userId: user.uid,
@@ -83,31 +52,21 @@ export async function POST(req: Request) {
       status: "sent", // User says they submitted
       sentTo: label.submissionUrl || label.website || undefined,
       notes: notes || "Submitted via webform (Mode A)",
-    });
+    }, limitCheck.reservation);
 
     // Track event
-    try {
-      await adminDb.collection("funnelEvents").add({
-        event: "submission_sent",
-        userId: user.uid,
-        metadata: {
-          labelId: label.id,
-          labelName: label.name,
-          method: "webform",
-          tier: user.tier,
-          mode: "A",
-        },
-        timestamp: new Date(),
-        source: "server",
-      });
-    } catch {
-      // Don't fail if tracking fails
-    }
+    trackServerEvent("submission_sent", user.uid, {
+      labelId: label.id,
+      labelName: label.name,
+      method: "webform",
+      tier: user.tier,
+      mode: "A",
+    });
 
     return NextResponse.json({
       ok: true,
       submissionId,
-      remaining: limitCheck.remaining - 1,
+      remaining: limitCheck.remaining,
       limit: limitCheck.limit,
       message: `Submission to ${label.name} logged`,
     });
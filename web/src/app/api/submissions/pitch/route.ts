@@ -196,7 +196,7 @@ export async function POST(req: Request) {
     const ip = getRequestIp(req);
 
     // Rate limit: 10 pitch generations per day
-    const limit = rateLimit(`pitch:generate:${uid}:${ip}`, 10, 86400);
+    const limit = await rateLimit(`pitch:generate:${uid}:${ip}`, 10, 86400);
     if (!limit.allowed) {
       return NextResponse.json(
         { ok: false, error: "Rate limit exceeded. Try again tomorrow." },
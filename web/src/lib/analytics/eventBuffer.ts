@@ -0,0 +1,185 @@
+import "server-only";
+import { after } from "next/server";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+
+// Events per batch, below Firestore's 500 writes to leave room for write hooks
+const BATCH_SIZE = 400;
+// Flush as soon as this many events are waiting
+const FLUSH_THRESHOLD = 200;
+// Otherwise flush this long after the first buffered event
+const FLUSH_INTERVAL_MS = 1000;
+// Events kept for retry while Firestore is failing; oldest dropped beyond this
+const MAX_PENDING = 5000;
+
+type BufferedEvent = {
+  collection: string;
+  data: Record<string, unknown>;
+};
+
+/**
+ * Adds derived writes (e.g. rollup counters) to the batch that writes a
+ * collection's events; may also add fields to the event documents
+ */
+export type BufferedEventsWriteHook = (
+  batch: admin.firestore.WriteBatch,
+  events: Record<string, unknown>[]
+) => void;
+
+const writeHooks = new Map<string, BufferedEventsWriteHook>();
+
+export function onBufferedEventsWrite(collection: string, hook: BufferedEventsWriteHook) {
+  writeHooks.set(collection, hook);
+}
+
+export type EventBufferStats = {
+  buffered: number;
+  written: number;
+  flushes: number;
+  failedFlushes: number;
+  dropped: number;
+};
+
+/**
+ * Write-behind buffer for analytics events.
+ *
+ * `record()` returns immediately; events are written with batched writes
+ * once FLUSH_THRESHOLD are waiting or FLUSH_INTERVAL_MS after the first one,
+ * and on process shutdown. Inside a request, the flush is also registered
+ * with `after()` so a serverless instance stays alive until its events are
+ * written. A failed flush puts the events back for the next one.
+ */
+class EventBuffer {
+  private pending: BufferedEvent[] = [];
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private flushing: Promise<boolean> | null = null;
+  private counters = { written: 0, flushes: 0, failedFlushes: 0, dropped: 0 };
+
+  record(collection: string, data: Record<string, unknown>) {
+    this.pending.push({ collection, data });
+    if (this.pending.length > MAX_PENDING) {
+      const excess = this.pending.length - MAX_PENDING;
+      this.pending.splice(0, excess);
+      this.counters.dropped += excess;
+      console.error(`[eventBuffer] Dropped ${excess} events (buffer full)`);
+    }
+
+    if (this.pending.length >= FLUSH_THRESHOLD) {
+      void this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => void this.flush(), FLUSH_INTERVAL_MS);
+      this.timer.unref?.();
+    }
+
+    try {
+      after(() => this.settled());
+    } catch {
+      // Outside a request (scripts, shutdown): the timer flushes
+    }
+  }
+
+  /**
+   * Write everything buffered so far; false if the write failed (the events
+   * stay buffered for a retry)
+   */
+  async flush(): Promise<boolean> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    // One flush at a time; events recorded meanwhile go in the next one
+    if (this.flushing) await this.flushing;
+    if (this.pending.length === 0) return true;
+
+    const events = this.pending.splice(0);
+    const flushing = this.write(events).finally(() => {
+      this.flushing = null;
+    });
+    this.flushing = flushing;
+    return flushing;
+  }
+
+  /**
+   * Resolves once the events buffered so far are written (or a write failed)
+   */
+  async settled(): Promise<void> {
+    while (this.pending.length > 0 || this.flushing) {
+      if (!(await this.flush())) return;
+    }
+  }
+
+  stats(): EventBufferStats {
+    return { buffered: this.pending.length, ...this.counters };
+  }
+
+  private async write(events: BufferedEvent[]): Promise<boolean> {
+    let written = 0;
+    try {
+      for (let i = 0; i < events.length; i += BATCH_SIZE) {
+        const chunk = events.slice(i, i + BATCH_SIZE);
+        const batch = adminDb.batch();
+        for (const [collection, hook] of writeHooks) {
+          const docs = chunk.filter((event) => event.collection === collection).map((event) => event.data);
+          if (docs.length > 0) hook(batch, docs);
+        }
+        for (const event of chunk) {
+          batch.set(adminDb.collection(event.collection).doc(), event.data);
+        }
+        await batch.commit();
+        written += chunk.length;
+      }
+      this.counters.written += written;
+      this.counters.flushes++;
+      return true;
+    } catch (error) {
+      console.error("[eventBuffer] Flush failed:", error);
+      this.counters.written += written;
+      this.counters.failedFlushes++;
+      // Retry the unwritten events with a later flush
+      this.pending.unshift(...events.slice(written));
+      if (!this.timer) {
+        this.timer = setTimeout(() => void this.flush(), FLUSH_INTERVAL_MS * 5);
+        this.timer.unref?.();
+      }
+      return false;
+    }
+  }
+}
+
+const buffer = new EventBuffer();
+
+let shutdownHooked = false;
+function hookShutdown() {
+  if (shutdownHooked || typeof process === "undefined" || typeof process.once !== "function") return;
+  shutdownHooked = true;
+  process.once("beforeExit", () => void buffer.flush());
+  for (const signal of ["SIGTERM", "SIGINT"] as const) {
+    process.once(signal, () => {
+      // If nothing else handles the signal, exit once the flush is done
+      const handledElsewhere = process.listenerCount(signal) > 0;
+      buffer.flush().finally(() => {
+        if (!handledElsewhere) process.exit(0);
+      });
+    });
+  }
+}
+
+/**
+ * Buffer an event document for `collection` (fire-and-forget; never throws).
+ * Set timestamps when recording: serverTimestamp() would be the write time.
+ */
+export function bufferEvent(collection: string, data: Record<string, unknown>): void {
+  hookShutdown();
+  buffer.record(collection, data);
+}
+
+/**
+ * Write all buffered events now (scripts and tests await this)
+ */
+export async function flushBufferedEvents(): Promise<void> {
+  await buffer.settled();
+}
+
+export function getEventBufferStats(): EventBufferStats {
+  return buffer.stats();
+}
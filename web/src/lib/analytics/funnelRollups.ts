@@ -0,0 +1,271 @@
+import "server-only";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { onBufferedEventsWrite } from "@/lib/analytics/eventBuffer";
+
+/**
+ * Daily funnel rollups: funnelRollups/{YYYY-MM-DD} holds per-event counts for
+ * the (UTC) day, overall and per tier:
+ *
+ *   { date, events: { signup_completed: 12, ... }, tiers: { tier2: { checkout_completed: 3 } } }
+ *
+ * Server-side events increment their day in the same batch that writes the
+ * event and are marked `rolledUp`. Client-side events (written straight to
+ * funnelEvents) are added by /api/cron/funnel-rollups, which walks new events
+ * from a cursor in cronCheckpoints/funnelRollups; the same job rebuilds days
+ * from scratch as a backfill.
+ */
+
+export const FUNNEL_ROLLUPS = "funnelRollups";
+
+export type FunnelRollupCounts = {
+  events: Record<string, number>;
+  tiers: Record<string, Record<string, number>>;
+};
+
+export function rollupDay(date: Date): string {
+  return date.toISOString().split("T")[0];
+}
+
+function eventDate(data: Record<string, any>): Date | null {
+  const timestamp = data.timestamp;
+  if (!timestamp) return null;
+  if (timestamp instanceof Date) return timestamp;
+  return typeof timestamp.toDate === "function" ? timestamp.toDate() : null;
+}
+
+// Tier from the event metadata (map keys stay simple identifiers)
+function eventTier(data: Record<string, any>): string | null {
+  const tier = data.metadata?.tier;
+  return typeof tier === "string" && /^[a-z0-9_]+$/i.test(tier) ? tier : null;
+}
+
+/**
+ * Count events into per-day buckets (events without a timestamp are skipped)
+ */
+export function countFunnelEvents(
+  events: Iterable<Record<string, any>>,
+  into: Map<string, FunnelRollupCounts> = new Map()
+): Map<string, FunnelRollupCounts> {
+  for (const data of events) {
+    const date = eventDate(data);
+    if (!date || typeof data.event !== "string") continue;
+
+    const day = rollupDay(date);
+    let counts = into.get(day);
+    if (!counts) {
+      counts = { events: {}, tiers: {} };
+      into.set(day, counts);
+    }
+
+    counts.events[data.event] = (counts.events[data.event] || 0) + 1;
+    const tier = eventTier(data);
+    if (tier) {
+      counts.tiers[tier] = counts.tiers[tier] || {};
+      counts.tiers[tier][data.event] = (counts.tiers[tier][data.event] || 0) + 1;
+    }
+  }
+  return into;
+}
+
+function incrementsOf(counts: FunnelRollupCounts) {
+  const increment = (n: number) => admin.firestore.FieldValue.increment(n);
+  return {
+    events: Object.fromEntries(Object.entries(counts.events).map(([event, n]) => [event, increment(n)])),
+    tiers: Object.fromEntries(
+      Object.entries(counts.tiers).map(([tier, events]) => [
+        tier,
+        Object.fromEntries(Object.entries(events).map(([event, n]) => [event, increment(n)])),
+      ])
+    ),
+  };
+}
+
+/**
+ * Add the counts to their day docs in `batch` (one write per day)
+ */
+export function addRollupIncrements(batch: admin.firestore.WriteBatch, byDay: Map<string, FunnelRollupCounts>) {
+  for (const [day, counts] of byDay) {
+    batch.set(
+      adminDb.collection(FUNNEL_ROLLUPS).doc(day),
+      { date: day, ...incrementsOf(counts), updatedAt: admin.firestore.FieldValue.serverTimestamp() },
+      { merge: true }
+    );
+  }
+}
+
+// Buffered server-side events carry their rollup increments in the same batch
+onBufferedEventsWrite("funnelEvents", (batch, events) => {
+  for (const data of events) data.rolledUp = true;
+  addRollupIncrements(batch, countFunnelEvents(events));
+});
+
+/**
+ * Rollup docs for the last `days` days (including today), oldest first
+ */
+export async function getFunnelRollups(days: number): Promise<(FunnelRollupCounts & { date: string })[]> {
+  const cutoff = new Date();
+  cutoff.setUTCDate(cutoff.getUTCDate() - days);
+
+  const snap = await adminDb
+    .collection(FUNNEL_ROLLUPS)
+    .where("date", ">=", rollupDay(cutoff))
+    .orderBy("date", "asc")
+    .get();
+
+  return snap.docs.map((doc) => {
+    const data = doc.data();
+    return { date: data.date, events: data.events || {}, tiers: data.tiers || {} };
+  });
+}
+
+// ============================================
+// CATCH-UP AND BACKFILL (cron)
+// ============================================
+
+const checkpointRef = () => adminDb.collection("cronCheckpoints").doc("funnelRollups");
+
+// Client-written timestamps can land a little after the fact; stay behind them
+const SETTLE_MS = 5 * 60 * 1000;
+// Events per catch-up page; its day writes and the checkpoint share one batch
+const SCAN_PAGE_SIZE = 450;
+const REBUILD_PAGE_SIZE = 1000;
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+type Cursor = [admin.firestore.Timestamp, string];
+
+async function loadCursor(): Promise<Cursor | null> {
+  const saved = (await checkpointRef().get()).data()?.cursor;
+  return saved?.timestamp ? [saved.timestamp, saved.docId || ""] : null;
+}
+
+function cursorUpdate(cursor: Cursor) {
+  return {
+    cursor: { timestamp: cursor[0], docId: cursor[1] },
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  };
+}
+
+export type RollupCatchUpResults = {
+  scanned: number;
+  counted: number;
+  pages: number;
+  done: boolean;
+};
+
+/**
+ * Add events not rolled up at write time (client-side events) to their days,
+ * walking funnelEvents in (timestamp, id) order from the saved cursor. Each
+ * page's increments and the advanced cursor commit together, so a retried
+ * run never counts an event twice.
+ */
+export async function rollUpNewFunnelEvents(maxPages: number): Promise<RollupCatchUpResults> {
+  const results: RollupCatchUpResults = { scanned: 0, counted: 0, pages: 0, done: false };
+  let cursor = await loadCursor();
+
+  const ordered = adminDb
+    .collection("funnelEvents")
+    .where("timestamp", "<=", admin.firestore.Timestamp.fromMillis(Date.now() - SETTLE_MS))
+    .orderBy("timestamp")
+    .orderBy(admin.firestore.FieldPath.documentId())
+    .limit(SCAN_PAGE_SIZE);
+
+  while (results.pages < maxPages) {
+    const page = await (cursor ? ordered.startAfter(...cursor) : ordered).get();
+    if (page.empty) {
+      results.done = true;
+      break;
+    }
+
+    const fresh = page.docs.map((doc) => doc.data()).filter((data) => !data.rolledUp);
+    const last = page.docs[page.docs.length - 1];
+    cursor = [last.get("timestamp"), last.id];
+
+    const batch = adminDb.batch();
+    addRollupIncrements(batch, countFunnelEvents(fresh));
+    batch.set(checkpointRef(), cursorUpdate(cursor), { merge: true });
+    await batch.commit();
+
+    results.pages++;
+    results.scanned += page.size;
+    results.counted += fresh.length;
+    if (page.size < SCAN_PAGE_SIZE) {
+      results.done = true;
+      break;
+    }
+  }
+
+  return results;
+}
+
+export type RollupRebuildResults = {
+  from: string;
+  to: string;
+  days: number;
+  events: number;
+};
+
+/**
+ * Backfill: recount whole days [fromDay, toDay] (UTC, before today) from
+ * funnelEvents and overwrite their rollups. The catch-up cursor is moved past
+ * `toDay` so those events are not added again; if the cursor is earlier than
+ * `fromDay`, the rebuild starts at the cursor's day to leave no gap. Do not
+ * run alongside the catch-up job.
+ */
+export async function rebuildFunnelRollups(fromDay: string, toDay: string): Promise<RollupRebuildResults> {
+  const today = rollupDay(new Date());
+  if (toDay >= today) {
+    toDay = rollupDay(new Date(Date.now() - DAY_MS));
+  }
+
+  const cursor = await loadCursor();
+  if (cursor) {
+    const cursorDay = rollupDay(cursor[0].toDate());
+    if (cursorDay < fromDay) fromDay = cursorDay;
+  }
+
+  const results: RollupRebuildResults = { from: fromDay, to: toDay, days: 0, events: 0 };
+  if (fromDay > toDay) return results;
+
+  let dayStart = Date.parse(`${fromDay}T00:00:00.000Z`);
+  const end = Date.parse(`${toDay}T00:00:00.000Z`) + DAY_MS;
+
+  for (; dayStart < end; dayStart += DAY_MS) {
+    const day = rollupDay(new Date(dayStart));
+    const byDay = new Map<string, FunnelRollupCounts>();
+
+    const ordered = adminDb
+      .collection("funnelEvents")
+      .where("timestamp", ">=", admin.firestore.Timestamp.fromMillis(dayStart))
+      .where("timestamp", "<", admin.firestore.Timestamp.fromMillis(dayStart + DAY_MS))
+      .orderBy("timestamp")
+      .orderBy(admin.firestore.FieldPath.documentId())
+      .limit(REBUILD_PAGE_SIZE);
+
+    let last: admin.firestore.QueryDocumentSnapshot | null = null;
+    while (true) {
+      const page: admin.firestore.QuerySnapshot = await (last ? ordered.startAfter(last) : ordered).get();
+      countFunnelEvents(page.docs.map((doc) => doc.data()), byDay);
+      results.events += page.size;
+      if (page.size < REBUILD_PAGE_SIZE) break;
+      last = page.docs[page.docs.length - 1];
+    }
+
+    const counts = byDay.get(day) || { events: {}, tiers: {} };
+    await adminDb.collection(FUNNEL_ROLLUPS).doc(day).set({
+      date: day,
+      events: counts.events,
+      tiers: counts.tiers,
+      rebuiltAt: admin.firestore.FieldValue.serverTimestamp(),
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+    results.days++;
+  }
+
+  // Everything up to the end of toDay is now counted
+  if (!cursor || cursor[0].toMillis() < end) {
+    await checkpointRef().set(cursorUpdate([admin.firestore.Timestamp.fromMillis(end), ""]), { merge: true });
+  }
+
+  return results;
+}
@@ -1,70 +1,62 @@
 import "server-only";
 import { adminDb } from "@/lib/firebaseAdmin";
 import admin from "firebase-admin";
+import { bufferEvent } from "@/lib/analytics/eventBuffer";
+import { getFunnelRollups } from "@/lib/analytics/funnelRollups";
 
 /**
  * Server-side funnel event tracking
- * Use this in API routes and server components
+ * Use this in API routes and server components. Fire-and-forget: the event
+ * is buffered and written in a batch after the response.
  */
-export async function trackServerEvent(
+export function trackServerEvent(
   event: string,
   userId?: string | null,
   metadata?: Record<string, unknown>
-): Promise<void> {
-  try {
-    await adminDb.collection("funnelEvents").add({
-      event,
-      userId: userId || null,
-      metadata: metadata || {},
-      timestamp: admin.firestore.FieldValue.serverTimestamp(),
-      source: "server",
-    });
-  } catch (error) {
-    console.error("[analytics:server] Failed to track event:", error);
-  }
+): void {
+  bufferEvent("funnelEvents", {
+    event,
+    userId: userId || null,
+    metadata: metadata || {},
+    timestamp: admin.firestore.Timestamp.now(),
+    source: "server",
+  });
 }
 
 /**
- * Get funnel metrics for admin dashboard
+ * Get funnel metrics for admin dashboard (from the daily rollups, so the
+ * cost is one small doc per day)
  */
 export async function getFunnelMetrics(days: number = 30): Promise<{
   events: Record<string, number>;
+  eventsByTier: Record<string, Record<string, number>>;
   conversionRates: Record<string, number>;
   dailySignups: { date: string; count: number }[];
   dailyUpgrades: { date: string; count: number }[];
 }> {
-  const cutoffDate = new Date();
-  cutoffDate.setDate(cutoffDate.getDate() - days);
-
-  // Get all events in the time period
-  const eventsSnapshot = await adminDb
-    .collection("funnelEvents")
-    .where("timestamp", ">=", cutoffDate)
-    .get();
+  const rollups = await getFunnelRollups(days);
 
   const eventCounts: Record<string, number> = {};
+  const eventsByTier: Record<string, Record<string, number>> = {};
   const dailySignups: Record<string, number> = {};
   const dailyUpgrades: Record<string, number> = {};
 
-  eventsSnapshot.forEach((doc) => {
-    const data = doc.data();
-    const event = data.event as string;
-    
+  for (const day of rollups) {
     // Count events
-    eventCounts[event] = (eventCounts[event] || 0) + 1;
-
-    // Track daily signups
-    if (event === "signup_completed" && data.timestamp) {
-      const date = data.timestamp.toDate().toISOString().split("T")[0];
-      dailySignups[date] = (dailySignups[date] || 0) + 1;
+    for (const [event, count] of Object.entries(day.events)) {
+      eventCounts[event] = (eventCounts[event] || 0) + count;
     }
-
-    // Track daily upgrades
-    if (event === "checkout_completed" && data.timestamp) {
-      const date = data.timestamp.toDate().toISOString().split("T")[0];
-      dailyUpgrades[date] = (dailyUpgrades[date] || 0) + 1;
+    for (const [tier, events] of Object.entries(day.tiers)) {
+      eventsByTier[tier] = eventsByTier[tier] || {};
+      for (const [event, count] of Object.entries(events)) {
+        eventsByTier[tier][event] = (eventsByTier[tier][event] || 0) + count;
+      }
     }
-  });
+
+    // Track daily signups and upgrades
+    if (day.events["signup_completed"]) dailySignups[day.date] = day.events["signup_completed"];
+    if (day.events["checkout_completed"]) dailyUpgrades[day.date] = day.events["checkout_completed"];
+  }
 
   // Calculate conversion rates
   const conversionRates: Record<string, number> = {};
@@ -104,6 +96,7 @@ export async function getFunnelMetrics(days: number = 30): Promise<{
 
   return {
     events: eventCounts,
+    eventsByTier,
     conversionRates,
     dailySignups: formatDailyData(dailySignups),
     dailyUpgrades: formatDailyData(dailyUpgrades),
@@ -0,0 +1,110 @@
+import "server-only";
+import { LruCache, registerCacheStats } from "@/lib/lruCache";
+
+export type ChatMessage = {
+  role: "user" | "model";
+  parts: { text: string }[];
+};
+
+/**
+ * Durable store behind the in-memory session cache
+ */
+export interface ChatSessionBackingStore {
+  load(sessionId: string): Promise<ChatMessage[] | null>;
+  save(sessionId: string, history: ChatMessage[], ttlMs: number): Promise<void>;
+}
+
+// Keep only the last 10 exchanges (20 messages) per session
+export const MAX_HISTORY_MESSAGES = 20;
+
+const SESSION_TTL_MS = Number(process.env.CHAT_SESSION_TTL_MINUTES || 30) * 60 * 1000;
+const MAX_SESSIONS = 1000;
+const MAX_SESSION_BYTES = 16 * 1024 * 1024; // 16 MB across all cached sessions
+
+function historyBytes(history: ChatMessage[]): number {
+  let bytes = 0;
+  for (const message of history) {
+    for (const part of message.parts) {
+      // JS strings are UTF-16; count what the text actually occupies in memory
+      bytes += part.text.length * 2;
+    }
+  }
+  return bytes;
+}
+
+const sessions = new LruCache<string, ChatMessage[]>({
+  maxEntries: MAX_SESSIONS,
+  maxBytes: MAX_SESSION_BYTES,
+  ttlMs: SESSION_TTL_MS,
+  sizeOf: historyBytes,
+});
+
+registerCacheStats("chatSessions", () => sessions.stats());
+
+let configuredStore: ChatSessionBackingStore | null = null;
+let storeLoading: Promise<ChatSessionBackingStore | null> | null = null;
+
+/**
+ * Override the backing store (null keeps history in memory only)
+ */
+export function setChatSessionBackingStore(store: ChatSessionBackingStore | null) {
+  configuredStore = store;
+  storeLoading = store ? Promise.resolve(store) : null;
+}
+
+/**
+ * Backing store selected by CHAT_SESSION_STORE: "firestore" persists history
+ * across instances, anything else keeps it in this instance's memory.
+ */
+async function getBackingStore(): Promise<ChatSessionBackingStore | null> {
+  if (configuredStore) return configuredStore;
+  if (process.env.CHAT_SESSION_STORE !== "firestore") return null;
+
+  if (!storeLoading) {
+    storeLoading = import("@/lib/firestore/chatSessionStore").then(({ FirestoreChatSessionStore }) => {
+      configuredStore = new FirestoreChatSessionStore();
+      return configuredStore;
+    });
+  }
+  return storeLoading;
+}
+
+/**
+ * History for a session. With a backing store, it is read from the store
+ * every time (another instance may have added turns since this one cached
+ * the session) and memory only answers while the store is failing; without
+ * one, memory holds the history.
+ */
+export async function getSessionHistory(sessionId: string): Promise<ChatMessage[]> {
+  try {
+    const store = await getBackingStore();
+    if (store) {
+      const stored = await store.load(sessionId);
+      if (!stored) {
+        sessions.delete(sessionId);
+        return [];
+      }
+      sessions.set(sessionId, stored);
+      return stored;
+    }
+  } catch (error: any) {
+    // A backing store outage only costs the conversation the turns it missed
+    console.error("[chatSessions] Failed to load session:", error?.message || error);
+  }
+  return sessions.get(sessionId) ?? [];
+}
+
+/**
+ * Save a session's history (trimmed to MAX_HISTORY_MESSAGES)
+ */
+export async function saveSessionHistory(sessionId: string, history: ChatMessage[]): Promise<void> {
+  const trimmed = history.slice(-MAX_HISTORY_MESSAGES);
+  sessions.set(sessionId, trimmed);
+
+  try {
+    const store = await getBackingStore();
+    if (store) await store.save(sessionId, trimmed, SESSION_TTL_MS);
+  } catch (error: any) {
+    console.error("[chatSessions] Failed to persist session:", error?.message || error);
+  }
+}
@@ -0,0 +1,57 @@
+/**
+ * Limit how many async tasks run at once.
+ * Tasks beyond the limit wait in FIFO order for a free slot.
+ * @param concurrency - Maximum tasks in flight (minimum 1)
+ */
+export function createLimiter(concurrency: number) {
+  const max = Math.max(1, Math.floor(concurrency) || 1);
+  const waiting: Array<() => void> = [];
+  let active = 0;
+
+  // A finished task hands its slot straight to the next waiter (active stays
+  // the same), so a caller arriving before the waiter resumes cannot take it
+  function release() {
+    const next = waiting.shift();
+    if (next) next();
+    else active--;
+  }
+
+  return async function limit<T>(task: () => Promise<T>): Promise<T> {
+    if (active >= max) {
+      await new Promise<void>((resolve) => waiting.push(resolve));
+    } else {
+      active++;
+    }
+    try {
+      return await task();
+    } finally {
+      release();
+    }
+  };
+}
+
+export type Limiter = ReturnType<typeof createLimiter>;
+
+/**
+ * Shared send budget of `perSecond` units (e.g. emails) per second.
+ * `acquire(n)` reserves n units and resolves once they fit in the budget, so
+ * callers sharing one budget are spaced out instead of bursting together.
+ * A budget of 0 or less is unlimited.
+ */
+export function createRateBudget(perSecond: number) {
+  let nextFreeAt = 0;
+
+  return {
+    async acquire(units: number = 1): Promise<void> {
+      if (!(perSecond > 0)) return;
+      const now = Date.now();
+      const startAt = Math.max(now, nextFreeAt);
+      nextFreeAt = startAt + (units / perSecond) * 1000;
+      if (startAt > now) {
+        await new Promise((resolve) => setTimeout(resolve, startAt - now));
+      }
+    },
+  };
+}
+
+export type RateBudget = ReturnType<typeof createRateBudget>;
@@ -0,0 +1,310 @@
+import "server-only";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { addEmailMetricIncrements, type EmailMetricEvent, type EmailMetricStatus } from "@/lib/firestore/emailMetrics";
+import { lookupUidsByEmail, normalizeEmail } from "@/lib/firestore/userEmails";
+
+export type PostmarkWebhookEvent = {
+  RecordType: "Bounce" | "SpamComplaint" | "SubscriptionChange" | "Open";
+  MessageID: string;
+  Email: string;
+  BouncedAt?: string;
+  Type?: string;
+  TypeCode?: number;
+  Description?: string;
+  Details?: string;
+  Tag?: string;
+  Subject?: string;
+  ServerID?: number;
+  MessageStream?: string;
+  // Spam complaint specific
+  ChangedAt?: string;
+  // Subscription change specific
+  SuppressSending?: boolean;
+  SuppressionReason?: string;
+};
+
+export type PostmarkProcessResults = {
+  events: number;
+  usersUpdated: number;
+};
+
+/**
+ * Postmark webhook events are acknowledged once their emailWebhooks doc is
+ * written; requests arriving together share one batched write. The rest
+ * happens after the response, a received batch at a time: email types and
+ * users are resolved with a few batched reads, then one write batch applies
+ * the user flags and email metrics and marks the docs processed. Docs still
+ * carrying `pendingSince` (the instance stopped first, or the write failed)
+ * are picked up by processPendingPostmarkEvents.
+ */
+
+const WEBHOOKS = "emailWebhooks";
+// Events per write batch: webhook doc, user update and up to two metric
+// buckets each, within Firestore's 500 writes
+const PROCESS_BATCH_SIZE = 120;
+// How long a received event waits for others to share its write
+const RECEIVE_WAIT_MS = 20;
+// Firestore's limit on values in an "in" filter
+const IN_QUERY_LIMIT = 30;
+// Pending docs younger than this are still being handled by their instance
+const PENDING_GRACE_MS = 2 * 60 * 1000;
+
+type ReceivedEvent = {
+  ref: admin.firestore.DocumentReference;
+  event: PostmarkWebhookEvent;
+  receivedAt: Date;
+};
+
+// Email metrics status counted for each webhook event (null: not counted)
+function metricStatusOf(event: PostmarkWebhookEvent): EmailMetricStatus | null {
+  switch (event.RecordType) {
+    case "Bounce":
+      return "bounced";
+    case "SpamComplaint":
+      return "spam";
+    case "Open":
+      return "opened";
+    case "SubscriptionChange":
+      return event.SuppressSending ? "unsubscribed" : null;
+    default:
+      return null;
+  }
+}
+
+// User fields set by each event type (null: the event does not touch the user)
+function userUpdateOf(event: PostmarkWebhookEvent): Record<string, unknown> | null {
+  switch (event.RecordType) {
+    // Bounces - mark email as invalid
+    case "Bounce":
+      return {
+        emailBounced: true,
+        emailBounceType: event.Type || "Unknown",
+        emailBounceCode: event.TypeCode || null,
+        emailBouncedAt: admin.firestore.FieldValue.serverTimestamp(),
+        emailBounceDescription: event.Description || null,
+      };
+    // Spam complaints - suppress future emails
+    case "SpamComplaint":
+      return {
+        emailSpamComplaint: true,
+        emailSpamComplaintAt: admin.firestore.FieldValue.serverTimestamp(),
+        emailSuppressed: true,
+      };
+    // Subscription changes (unsubscribe)
+    case "SubscriptionChange":
+      return {
+        emailSuppressed: event.SuppressSending || false,
+        emailSuppressionReason: event.SuppressionReason || null,
+        emailSuppressionChangedAt: admin.firestore.FieldValue.serverTimestamp(),
+      };
+    default:
+      return null;
+  }
+}
+
+function webhookDoc(event: PostmarkWebhookEvent, requestId: string) {
+  return {
+    requestId,
+    recordType: event.RecordType,
+    email: event.Email,
+    messageId: event.MessageID,
+    type: event.Type || null,
+    typeCode: event.TypeCode || null,
+    description: event.Description || null,
+    subject: event.Subject || null,
+    tag: event.Tag || null,
+    suppressSending: event.SuppressSending || null,
+    suppressionReason: event.SuppressionReason || null,
+    receivedAt: admin.firestore.FieldValue.serverTimestamp(),
+    pendingSince: admin.firestore.FieldValue.serverTimestamp(),
+    raw: JSON.stringify(event),
+  };
+}
+
+// Email type of each event's message: the send tag, else its log entry
+async function emailTypesOf(events: PostmarkWebhookEvent[]): Promise<string[]> {
+  const untagged = Array.from(new Set(events.filter((e) => !e.Tag && e.MessageID).map((e) => e.MessageID)));
+  const typeByMessageId = new Map<string, string>();
+
+  const queries: Promise<admin.firestore.QuerySnapshot>[] = [];
+  for (let i = 0; i < untagged.length; i += IN_QUERY_LIMIT) {
+    queries.push(
+      adminDb.collection("emailLogs").where("postmarkMessageId", "in", untagged.slice(i, i + IN_QUERY_LIMIT)).get()
+    );
+  }
+  for (const snap of await Promise.all(queries)) {
+    snap.forEach((doc) => typeByMessageId.set(doc.data().postmarkMessageId, doc.data().type || "unknown"));
+  }
+
+  return events.map((e) => e.Tag || typeByMessageId.get(e.MessageID) || "unknown");
+}
+
+/**
+ * Apply received events to users and email metrics, and mark their docs
+ * processed (all in one batch per PROCESS_BATCH_SIZE events)
+ */
+async function processReceived(received: ReceivedEvent[]): Promise<PostmarkProcessResults> {
+  const results: PostmarkProcessResults = { events: 0, usersUpdated: 0 };
+
+  for (let i = 0; i < received.length; i += PROCESS_BATCH_SIZE) {
+    const chunk = received.slice(i, i + PROCESS_BATCH_SIZE);
+    const events = chunk.map((item) => item.event);
+
+    const userEvents = events.filter((event) => event.Email && userUpdateOf(event));
+    const [types, uids] = await Promise.all([
+      emailTypesOf(events),
+      lookupUidsByEmail(userEvents.map((event) => event.Email)),
+    ]);
+
+    // Index entries can outlive a deleted user; update() would fail the batch
+    const uidList = Array.from(new Set(uids.values()));
+    const users = uidList.length > 0 ? await adminDb.getAll(...uidList.map((uid) => adminDb.collection("users").doc(uid))) : [];
+    const existing = new Set(users.filter((doc) => doc.exists).map((doc) => doc.id));
+
+    const batch = adminDb.batch();
+    const metrics: EmailMetricEvent[] = [];
+    chunk.forEach(({ ref, event, receivedAt }, j) => {
+      const metricStatus = metricStatusOf(event);
+      if (metricStatus) metrics.push({ type: types[j], status: metricStatus, at: receivedAt });
+
+      const update = userUpdateOf(event);
+      const uid = event.Email ? uids.get(normalizeEmail(event.Email)) : undefined;
+      if (update && uid && existing.has(uid)) {
+        batch.update(adminDb.collection("users").doc(uid), update);
+        results.usersUpdated++;
+      }
+
+      batch.update(ref, {
+        emailType: types[j],
+        uid: uid || null,
+        pendingSince: admin.firestore.FieldValue.delete(),
+        processedAt: admin.firestore.FieldValue.serverTimestamp(),
+      });
+    });
+    addEmailMetricIncrements(batch, metrics);
+    await batch.commit();
+    results.events += chunk.length;
+  }
+
+  return results;
+}
+
+/**
+ * Batches received webhook events into shared writes and tracks their
+ * processing, so a request can wait for it with `after()`
+ */
+class PostmarkEventReceiver {
+  private waiting: Array<{
+    event: PostmarkWebhookEvent;
+    requestId: string;
+    resolve: () => void;
+    reject: (error: unknown) => void;
+  }> = [];
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private processing = new Set<Promise<void>>();
+
+  receive(event: PostmarkWebhookEvent, requestId: string): Promise<void> {
+    return new Promise((resolve, reject) => {
+      this.waiting.push({ event, requestId, resolve, reject });
+      if (this.waiting.length >= PROCESS_BATCH_SIZE) {
+        void this.write();
+      } else if (!this.timer) {
+        this.timer = setTimeout(() => void this.write(), RECEIVE_WAIT_MS);
+      }
+    });
+  }
+
+  /**
+   * Resolves once the events received so far are processed (or failed)
+   */
+  async settled(): Promise<void> {
+    while (this.processing.size > 0) {
+      await Promise.all(this.processing);
+    }
+  }
+
+  private async write() {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    const items = this.waiting.splice(0);
+    if (items.length === 0) return;
+
+    const batch = adminDb.batch();
+    const receivedAt = new Date();
+    const received = items.map(({ event, requestId }) => {
+      const ref = adminDb.collection(WEBHOOKS).doc();
+      batch.set(ref, webhookDoc(event, requestId));
+      return { ref, event, receivedAt };
+    });
+
+    try {
+      await batch.commit();
+    } catch (error) {
+      items.forEach((item) => item.reject(error));
+      return;
+    }
+    items.forEach((item) => item.resolve());
+
+    const task: Promise<void> = processReceived(received)
+      .then(({ events, usersUpdated }) => {
+        console.log(`[postmark-webhook] Processed ${events} events, updated ${usersUpdated} users`);
+      })
+      .catch((error) => {
+        // The docs keep pendingSince; the cron job retries them
+        console.error("[postmark-webhook] Processing failed:", error?.message || error);
+      })
+      .finally(() => {
+        this.processing.delete(task);
+      });
+    this.processing.add(task);
+  }
+}
+
+const receiver = new PostmarkEventReceiver();
+
+/**
+ * Store a webhook event (resolves once it is durably written, throws if the
+ * write failed) and queue it for processing
+ */
+export function receivePostmarkEvent(event: PostmarkWebhookEvent, requestId: string): Promise<void> {
+  return receiver.receive(event, requestId);
+}
+
+/**
+ * Wait for queued processing (pass to `after()` so the instance stays up)
+ */
+export function postmarkEventsSettled(): Promise<void> {
+  return receiver.settled();
+}
+
+/**
+ * Process webhook docs left pending for more than a couple of minutes
+ */
+export async function processPendingPostmarkEvents(limit: number = 1000): Promise<PostmarkProcessResults> {
+  const cutoff = admin.firestore.Timestamp.fromMillis(Date.now() - PENDING_GRACE_MS);
+  const snap = await adminDb
+    .collection(WEBHOOKS)
+    .where("pendingSince", "<=", cutoff)
+    .orderBy("pendingSince")
+    .limit(limit)
+    .get();
+
+  const received: ReceivedEvent[] = [];
+  for (const doc of snap.docs) {
+    try {
+      received.push({
+        ref: doc.ref,
+        event: JSON.parse(doc.data().raw),
+        receivedAt: doc.data().receivedAt?.toDate?.() ?? new Date(),
+      });
+    } catch {
+      // Unreadable payload: stop retrying it
+      await doc.ref.update({ pendingSince: admin.firestore.FieldValue.delete() });
+    }
+  }
+
+  return processReceived(received);
+}
@@ -0,0 +1,665 @@
+/**
+ * Drip email templates shared by the cron job and the /api/email/* routes.
+ *
+ * Each template source is compiled once into its static chunks and slots and
+ * cached; rendering a recipient only interpolates the per-user fields.
+ * `{{field}}` is HTML-escaped in HTML templates, `{{&field}}` is inserted as-is
+ * (used for fragments that were already rendered from escaped values).
+ */
+
+type Slot = { key: string; raw: boolean };
+
+export type CompiledTemplate = {
+  chunks: string[];
+  slots: Slot[];
+  escape: boolean;
+};
+
+const PLACEHOLDER = /\{\{(&?)\s*(\w+)\s*\}\}/g;
+
+const HTML_ESCAPES: Record<string, string> = {
+  "&": "&amp;",
+  "<": "&lt;",
+  ">": "&gt;",
+  '"': "&quot;",
+  "'": "&#39;",
+};
+
+export function escapeHtml(value: unknown): string {
+  return String(value ?? "").replace(/[&<>"']/g, (ch) => HTML_ESCAPES[ch]);
+}
+
+/**
+ * Split a template source into static chunks around its placeholders.
+ * @param escape - HTML-escape `{{field}}` values (false for plain-text templates)
+ */
+export function compileTemplate(source: string, escape: boolean = true): CompiledTemplate {
+  const chunks: string[] = [];
+  const slots: Slot[] = [];
+  let last = 0;
+
+  for (const match of source.matchAll(PLACEHOLDER)) {
+    chunks.push(source.slice(last, match.index));
+    slots.push({ key: match[2], raw: match[1] === "&" });
+    last = (match.index ?? 0) + match[0].length;
+  }
+  chunks.push(source.slice(last));
+
+  return { chunks, slots, escape };
+}
+
+export function renderTemplate(template: CompiledTemplate, values: Record<string, unknown>): string {
+  let out = template.chunks[0];
+  for (let i = 0; i < template.slots.length; i++) {
+    const { key, raw } = template.slots[i];
+    const value = values[key];
+    out += (template.escape && !raw ? escapeHtml(value) : String(value ?? "")) + template.chunks[i + 1];
+  }
+  return out;
+}
+
+// ============================================
+// TEMPLATE SOURCES
+// ============================================
+
+const SOURCES = {
+  "upgrade-day7.html": `
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Tier II Artists Get 3x More A&R Engagement</title>
+</head>
+<body style="margin: 0; padding: 0; background-color: #060b18; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
+  <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #060b18; padding: 40px 20px;">
+    <tr>
+      <td align="center">
+        <table width="600" cellpadding="0" cellspacing="0" style="background-color: #0b1324; border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 16px; padding: 40px;">
+          <tr>
+            <td>
+              <h1 style="color: #ffffff; font-size: 24px; margin: 0 0 24px 0; font-weight: 600;">{{name}},</h1>
+              
+              <p style="color: #e2e8f0; font-size: 16px; line-height: 1.6; margin: 0 0 24px 0;">
+                After your first week on Verified Sound, here's what Tier II members experience:
+              </p>
+              
+              <!-- Stats Section -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(110, 231, 255, 0.05); border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 12px; padding: 24px; margin-bottom: 24px;">
+                <tr>
+                  <td>
+                    <p style="color: #6ee7ff; font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.1em; margin: 0 0 16px 0;">BY THE NUMBERS</p>
+                    <table width="100%" cellpadding="0" cellspacing="0">
+                      <tr>
+                        <td style="padding: 8px 0;">
+                          <span style="color: #10b981; font-size: 24px; font-weight: 700;">3x</span>
+                          <span style="color: #94a3b8; font-size: 14px; margin-left: 8px;">faster A&R review turnaround</span>
+                        </td>
+                      </tr>
+                      <tr>
+                        <td style="padding: 8px 0;">
+                          <span style="color: #10b981; font-size: 24px; font-weight: 700;">2x</span>
+                          <span style="color: #94a3b8; font-size: 14px; margin-left: 8px;">more label submission opportunities</span>
+                        </td>
+                      </tr>
+                      <tr>
+                        <td style="padding: 8px 0;">
+                          <span style="color: #10b981; font-size: 24px; font-weight: 700;">47%</span>
+                          <span style="color: #94a3b8; font-size: 14px; margin-left: 8px;">higher response rate from A&R teams</span>
+                        </td>
+                      </tr>
+                    </table>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- What You're Missing Section -->
+              <p style="color: #ffffff; font-size: 14px; font-weight: 600; text-transform: uppercase; letter-spacing: 0.1em; margin: 0 0 16px 0;">
+                WHAT YOU'RE CURRENTLY MISSING ON TIER I:
+              </p>
+              
+              <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 24px;">
+                <tr>
+                  <td style="color: #ef4444; font-size: 14px; padding: 6px 0;">
+                    ✗ <span style="color: #94a3b8;">Priority placement in A&R review queue</span>
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #ef4444; font-size: 14px; padding: 6px 0;">
+                    ✗ <span style="color: #94a3b8;">Monthly strategy calls with industry professionals</span>
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #ef4444; font-size: 14px; padding: 6px 0;">
+                    ✗ <span style="color: #94a3b8;">Direct feedback on your releases</span>
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #ef4444; font-size: 14px; padding: 6px 0;">
+                    ✗ <span style="color: #94a3b8;">Watermark-free EPK PDFs</span>
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #ef4444; font-size: 14px; padding: 6px 0;">
+                    ✗ <span style="color: #94a3b8;">Extended press image uploads (10 vs. 3)</span>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- Upgrade CTA -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(16, 185, 129, 0.1); border: 1px solid rgba(16, 185, 129, 0.3); border-radius: 12px; padding: 24px; margin-bottom: 24px;">
+                <tr>
+                  <td align="center">
+                    <p style="color: #ffffff; font-size: 16px; margin: 0 0 16px 0;">
+                      Upgrade now and lock in your monthly rate:
+                    </p>
+                    <a href="{{pricingUrl}}" style="display: inline-block; background-color: #10b981; color: #ffffff; font-size: 14px; font-weight: 600; text-decoration: none; padding: 14px 32px; border-radius: 9999px;">
+                      Upgrade to Tier II — $89/mo
+                    </a>
+                  </td>
+                </tr>
+              </table>
+              
+              <hr style="border: none; border-top: 1px solid rgba(255,255,255,0.1); margin: 32px 0;">
+              
+              <p style="color: #94a3b8; font-size: 14px; margin: 0;">
+                —<br>
+                <strong style="color: #ffffff;">Verified Sound A&R</strong><br>
+                <span style="color: #64748b;">Executive Representation for Label-Ready Artists</span>
+              </p>
+            </td>
+          </tr>
+        </table>
+      </td>
+    </tr>
+  </table>
+</body>
+</html>`,
+
+  "upgrade-day7.txt": `{{name}},
+
+After your first week on Verified Sound, here's what Tier II members experience:
+
+BY THE NUMBERS
+━━━━━━━━━━━━━━━━
+• 3x faster A&R review turnaround
+• 2x more label submission opportunities
+• 47% higher response rate from A&R teams
+
+WHAT YOU'RE CURRENTLY MISSING ON TIER I:
+
+✗ Priority placement in A&R review queue
+✗ Monthly strategy calls with industry professionals
+✗ Direct feedback on your releases
+✗ Watermark-free EPK PDFs
+✗ Extended press image uploads (10 vs. 3)
+
+Upgrade now and lock in your monthly rate:
+→ {{pricingUrl}}
+
+—
+Verified Sound A&R
+Executive Representation for Label-Ready Artists`,
+
+  "profile-reminder.html": `
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Complete Your Artist Profile</title>
+</head>
+<body style="margin: 0; padding: 0; background-color: #060b18; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
+  <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #060b18; padding: 40px 20px;">
+    <tr>
+      <td align="center">
+        <table width="600" cellpadding="0" cellspacing="0" style="background-color: #0b1324; border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 16px; padding: 40px;">
+          <tr>
+            <td>
+              <h1 style="color: #ffffff; font-size: 24px; margin: 0 0 24px 0; font-weight: 600;">{{name}},</h1>
+              
+              <p style="color: #e2e8f0; font-size: 16px; line-height: 1.6; margin: 0 0 16px 0;">
+                Your Verified Sound profile is <strong style="color: #fbbf24;">incomplete</strong>.
+              </p>
+              
+              <p style="color: #94a3b8; font-size: 15px; line-height: 1.6; margin: 0 0 24px 0;">
+                A&R representatives review profiles daily. Incomplete profiles are deprioritized in our submission queue.
+              </p>
+              
+              <!-- Missing Fields -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(251, 191, 36, 0.1); border: 1px solid rgba(251, 191, 36, 0.3); border-radius: 12px; padding: 20px; margin-bottom: 24px;">
+                <tr>
+                  <td>
+                    <p style="color: #fbbf24; font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.1em; margin: 0 0 12px 0;">
+                      MISSING FROM YOUR PROFILE:
+                    </p>
+                    <ul style="margin: 0; padding: 0; list-style: none;">
+                      {{&missingList}}
+                    </ul>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- Stats -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(16, 185, 129, 0.1); border: 1px solid rgba(16, 185, 129, 0.3); border-radius: 12px; padding: 16px; margin-bottom: 24px;">
+                <tr>
+                  <td align="center">
+                    <p style="color: #10b981; font-size: 14px; margin: 0;">
+                      <strong>Profiles with all sections completed receive 3x more A&R engagement.</strong>
+                    </p>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- CTA -->
+              <table width="100%" cellpadding="0" cellspacing="0">
+                <tr>
+                  <td align="center">
+                    <a href="{{settingsUrl}}" style="display: inline-block; background-color: #10b981; color: #ffffff; font-size: 14px; font-weight: 600; text-decoration: none; padding: 14px 32px; border-radius: 9999px;">
+                      Complete Your Profile Now
+                    </a>
+                  </td>
+                </tr>
+              </table>
+              
+              <hr style="border: none; border-top: 1px solid rgba(255,255,255,0.1); margin: 32px 0;">
+              
+              <p style="color: #94a3b8; font-size: 14px; margin: 0;">
+                —<br>
+                <strong style="color: #ffffff;">Verified Sound A&R</strong><br>
+                <span style="color: #64748b;">Executive Representation for Label-Ready Artists</span>
+              </p>
+            </td>
+          </tr>
+        </table>
+      </td>
+    </tr>
+  </table>
+</body>
+</html>`,
+
+  "profile-reminder.txt": `{{name}},
+
+Your Verified Sound profile is INCOMPLETE.
+
+A&R representatives review profiles daily. Incomplete profiles are deprioritized in our submission queue.
+
+MISSING FROM YOUR PROFILE:
+{{&missingList}}
+
+Profiles with all sections completed receive 3x more A&R engagement.
+
+Complete your profile now:
+→ {{settingsUrl}}
+
+—
+Verified Sound A&R
+Executive Representation for Label-Ready Artists`,
+
+  "profile-reminder.item.html": `<li style="color: #fbbf24; padding: 4px 0;">• {{field}}</li>`,
+
+  "epk-guide.html": `
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Your EPK Checklist — What Labels Look For</title>
+</head>
+<body style="margin: 0; padding: 0; background-color: #060b18; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
+  <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #060b18; padding: 40px 20px;">
+    <tr>
+      <td align="center">
+        <table width="600" cellpadding="0" cellspacing="0" style="background-color: #0b1324; border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 16px; padding: 40px;">
+          <tr>
+            <td>
+              <h1 style="color: #ffffff; font-size: 24px; margin: 0 0 24px 0; font-weight: 600;">{{name}},</h1>
+              
+              <p style="color: #e2e8f0; font-size: 16px; line-height: 1.6; margin: 0 0 24px 0;">
+                After 5 days on the platform, here's what separates artists who get signed from those who don't:
+              </p>
+              
+              <!-- Checklist -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(110, 231, 255, 0.05); border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 12px; padding: 24px; margin-bottom: 24px;">
+                <tr>
+                  <td>
+                    <p style="color: #6ee7ff; font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.1em; margin: 0 0 16px 0;">
+                      THE VERIFIED SOUND EPK CHECKLIST
+                    </p>
+                    <table width="100%" cellpadding="0" cellspacing="0">
+                      {{&checklist}}
+                    </table>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- Status -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(251, 191, 36, 0.1); border: 1px solid rgba(251, 191, 36, 0.3); border-radius: 12px; padding: 16px; margin-bottom: 24px;">
+                <tr>
+                  <td align="center">
+                    <p style="color: #fbbf24; font-size: 14px; margin: 0;">
+                      <strong>Your current EPK status: {{completedCount}}/5 complete</strong>
+                    </p>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- CTA -->
+              <table width="100%" cellpadding="0" cellspacing="0">
+                <tr>
+                  <td align="center" style="padding-bottom: 16px;">
+                    <a href="{{dashboardUrl}}" style="display: inline-block; background-color: #10b981; color: #ffffff; font-size: 14px; font-weight: 600; text-decoration: none; padding: 14px 32px; border-radius: 9999px;">
+                      Review and Enhance Your EPK
+                    </a>
+                  </td>
+                </tr>
+                <tr>
+                  <td align="center">
+                    <p style="color: #64748b; font-size: 13px; margin: 0;">
+                      Need guidance? Our AI assistant can review your profile and suggest improvements.
+                    </p>
+                  </td>
+                </tr>
+              </table>
+              
+              <hr style="border: none; border-top: 1px solid rgba(255,255,255,0.1); margin: 32px 0;">
+              
+              <p style="color: #94a3b8; font-size: 14px; margin: 0;">
+                —<br>
+                <strong style="color: #ffffff;">Verified Sound A&R</strong><br>
+                <span style="color: #64748b;">Executive Representation for Label-Ready Artists</span>
+              </p>
+            </td>
+          </tr>
+        </table>
+      </td>
+    </tr>
+  </table>
+</body>
+</html>`,
+
+  "epk-guide.txt": `{{name}},
+
+After 5 days on the platform, here's what separates artists who get signed from those who don't:
+
+THE VERIFIED SOUND EPK CHECKLIST
+
+□ Professional Press Image (not a selfie, not a live shot)
+□ Concise Bio (150-300 words, third person, recent highlights)
+□ Active Streaming Links (Spotify, SoundCloud, Apple Music)
+□ Social Proof (follower counts, playlist placements, press mentions)
+□ Contact Information (booking email, management if applicable)
+
+Your current EPK status: {{completedCount}}/5 complete
+
+Review and enhance your EPK:
+→ {{dashboardUrl}}
+
+Need guidance? Our AI assistant can review your profile and suggest improvements.
+
+—
+Verified Sound A&R
+Executive Representation for Label-Ready Artists`,
+
+  "epk-guide.item.html": `
+      <tr>
+        <td style="padding: 8px 0;">
+          {{&checkmark}}
+          <span style="color: {{textColor}}; margin-left: 8px; font-weight: 600;">{{item}}</span>
+          <span style="color: #64748b; font-size: 13px;"> ({{desc}})</span>
+        </td>
+      </tr>`,
+
+  "reengagement.html": `
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Your A&R Representation Is Active — Are You?</title>
+</head>
+<body style="margin: 0; padding: 0; background-color: #060b18; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;">
+  <table width="100%" cellpadding="0" cellspacing="0" style="background-color: #060b18; padding: 40px 20px;">
+    <tr>
+      <td align="center">
+        <table width="600" cellpadding="0" cellspacing="0" style="background-color: #0b1324; border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 16px; padding: 40px;">
+          <tr>
+            <td>
+              <h1 style="color: #ffffff; font-size: 24px; margin: 0 0 24px 0; font-weight: 600;">{{name}},</h1>
+              
+              <p style="color: #e2e8f0; font-size: 16px; line-height: 1.6; margin: 0 0 24px 0;">
+                It's been <strong style="color: #fbbf24;">{{daysInactive}} days</strong> since you last accessed your Verified Sound dashboard.
+              </p>
+              
+              <!-- Activity Stats -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(110, 231, 255, 0.05); border: 1px solid rgba(110, 231, 255, 0.2); border-radius: 12px; padding: 24px; margin-bottom: 24px;">
+                <tr>
+                  <td>
+                    <p style="color: #6ee7ff; font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.1em; margin: 0 0 16px 0;">
+                      DURING THAT TIME:
+                    </p>
+                    <table width="100%" cellpadding="0" cellspacing="0">
+                      <tr>
+                        <td style="color: #94a3b8; font-size: 14px; padding: 6px 0;">
+                          <span style="color: #10b981;">•</span> New A&R opportunities were added to our network
+                        </td>
+                      </tr>
+                      <tr>
+                        <td style="color: #94a3b8; font-size: 14px; padding: 6px 0;">
+                          <span style="color: #10b981;">•</span> Artists in your genre received label feedback
+                        </td>
+                      </tr>
+                      <tr>
+                        <td style="color: #94a3b8; font-size: 14px; padding: 6px 0;">
+                          <span style="color: #10b981;">•</span> Your profile remained in our submission queue
+                        </td>
+                      </tr>
+                    </table>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- Urgency -->
+              <table width="100%" cellpadding="0" cellspacing="0" style="background-color: rgba(251, 191, 36, 0.1); border: 1px solid rgba(251, 191, 36, 0.3); border-radius: 12px; padding: 16px; margin-bottom: 24px;">
+                <tr>
+                  <td align="center">
+                    <p style="color: #fbbf24; font-size: 14px; margin: 0;">
+                      <strong>Don't let momentum slip.</strong> Even 5 minutes on your dashboard can move the needle.
+                    </p>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- CTA -->
+              <table width="100%" cellpadding="0" cellspacing="0">
+                <tr>
+                  <td align="center" style="padding-bottom: 24px;">
+                    <a href="{{dashboardUrl}}" style="display: inline-block; background-color: #10b981; color: #ffffff; font-size: 14px; font-weight: 600; text-decoration: none; padding: 14px 32px; border-radius: 9999px;">
+                      Return to Dashboard
+                    </a>
+                  </td>
+                </tr>
+              </table>
+              
+              <!-- Suggestions -->
+              <p style="color: #ffffff; font-size: 14px; font-weight: 600; margin: 0 0 12px 0;">
+                If you're between releases, use this time to:
+              </p>
+              <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 24px;">
+                <tr>
+                  <td style="color: #94a3b8; font-size: 14px; padding: 4px 0;">
+                    <span style="color: #6ee7ff;">→</span> Update your bio with recent achievements
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #94a3b8; font-size: 14px; padding: 4px 0;">
+                    <span style="color: #6ee7ff;">→</span> Refresh your press images
+                  </td>
+                </tr>
+                <tr>
+                  <td style="color: #94a3b8; font-size: 14px; padding: 4px 0;">
+                    <span style="color: #6ee7ff;">→</span> Review your subscription tier
+                  </td>
+                </tr>
+              </table>
+              
+              <hr style="border: none; border-top: 1px solid rgba(255,255,255,0.1); margin: 32px 0;">
+              
+              <p style="color: #94a3b8; font-size: 14px; margin: 0;">
+                —<br>
+                <strong style="color: #ffffff;">Verified Sound A&R</strong><br>
+                <span style="color: #64748b;">Executive Representation for Label-Ready Artists</span>
+              </p>
+            </td>
+          </tr>
+        </table>
+      </td>
+    </tr>
+  </table>
+</body>
+</html>`,
+
+  "reengagement.txt": `{{name}},
+
+It's been {{daysInactive}} days since you last accessed your Verified Sound dashboard.
+
+DURING THAT TIME:
+• New A&R opportunities were added to our network
+• Artists in your genre received label feedback
+• Your profile remained in our submission queue
+
+Don't let momentum slip. Even 5 minutes on your dashboard can move the needle.
+
+Return to Dashboard:
+→ {{dashboardUrl}}
+
+If you're between releases, use this time to:
+→ Update your bio with recent achievements
+→ Refresh your press images
+→ Review your subscription tier
+
+—
+Verified Sound A&R
+Executive Representation for Label-Ready Artists`,
+} as const;
+
+export type TemplateName = keyof typeof SOURCES;
+
+const compiled = new Map<TemplateName, CompiledTemplate>();
+
+/**
+ * Compiled template by name (compiled on first use, then cached for the process)
+ */
+export function getTemplate(name: TemplateName): CompiledTemplate {
+  let template = compiled.get(name);
+  if (!template) {
+    template = compileTemplate(SOURCES[name], name.endsWith(".html"));
+    compiled.set(name, template);
+  }
+  return template;
+}
+
+export type RenderedEmail = { html: string; text: string };
+
+function render(name: string, values: Record<string, unknown>): RenderedEmail {
+  return {
+    html: renderTemplate(getTemplate(`${name}.html` as TemplateName), values),
+    text: renderTemplate(getTemplate(`${name}.txt` as TemplateName), values),
+  };
+}
+
+// ============================================
+// DRIP EMAILS
+// ============================================
+
+export function renderDay7UpgradeEmail(args: { name: string; pricingUrl: string }): RenderedEmail {
+  return render("upgrade-day7", {
+    name: args.name || "Artist",
+    pricingUrl: args.pricingUrl,
+  });
+}
+
+export function renderProfileReminderEmail(args: {
+  name: string;
+  missingFields: string[];
+  settingsUrl: string;
+}): RenderedEmail {
+  const item = getTemplate("profile-reminder.item.html");
+  const missingHtml = args.missingFields.length > 0
+    ? args.missingFields.map((field) => renderTemplate(item, { field })).join("")
+    : "<li style=\"color: #94a3b8; padding: 4px 0;\">• Complete your profile details</li>";
+  const missingText = args.missingFields.length > 0
+    ? args.missingFields.map((field) => `• ${field}`).join("\n")
+    : "• Complete your profile details";
+
+  const name = args.name || "Artist";
+  return {
+    html: renderTemplate(getTemplate("profile-reminder.html"), {
+      name,
+      missingList: missingHtml,
+      settingsUrl: args.settingsUrl,
+    }),
+    text: renderTemplate(getTemplate("profile-reminder.txt"), {
+      name,
+      missingList: missingText,
+      settingsUrl: args.settingsUrl,
+    }),
+  };
+}
+
+const EPK_CHECKLIST = [
+  { item: "Professional Press Image", desc: "not a selfie, not a live shot" },
+  { item: "Concise Bio", desc: "150-300 words, third person, recent highlights" },
+  { item: "Active Streaming Links", desc: "Spotify, SoundCloud, Apple Music" },
+  { item: "Social Proof", desc: "follower counts, playlist placements, press mentions" },
+  { item: "Contact Information", desc: "booking email, management if applicable" },
+];
+
+// The checklist only varies by completedCount (0-5), so each variant is rendered once
+const epkChecklistCache = new Map<number, string>();
+
+function epkChecklistHtml(completedCount: number): string {
+  let html = epkChecklistCache.get(completedCount);
+  if (html === undefined) {
+    const item = getTemplate("epk-guide.item.html");
+    html = EPK_CHECKLIST.map((c, i) => {
+      const isDone = i < completedCount;
+      return renderTemplate(item, {
+        checkmark: isDone
+          ? '<span style="color: #10b981;">✓</span>'
+          : '<span style="color: #64748b;">□</span>',
+        textColor: isDone ? "#10b981" : "#ffffff",
+        item: c.item,
+        desc: c.desc,
+      });
+    }).join("");
+    epkChecklistCache.set(completedCount, html);
+  }
+  return html;
+}
+
+export function renderEpkGuideEmail(args: {
+  name: string;
+  completedCount: number;
+  dashboardUrl: string;
+}): RenderedEmail {
+  const completedCount = Math.max(0, Math.min(EPK_CHECKLIST.length, Math.floor(args.completedCount) || 0));
+  return render("epk-guide", {
+    name: args.name || "Artist",
+    completedCount,
+    checklist: epkChecklistHtml(completedCount),
+    dashboardUrl: args.dashboardUrl,
+  });
+}
+
+export function renderReengagementEmail(args: {
+  name: string;
+  dashboardUrl: string;
+  daysInactive: number;
+}): RenderedEmail {
+  return render("reengagement", {
+    name: args.name || "Artist",
+    dashboardUrl: args.dashboardUrl,
+    daysInactive: args.daysInactive,
+  });
+}
@@ -1,6 +1,7 @@
 import "server-only";
 import { adminDb } from "@/lib/firebaseAdmin";
 import admin from "firebase-admin";
+import { bufferEvent } from "@/lib/analytics/eventBuffer";
 
 export type ExperimentId = 
   | "pricing_headline"
@@ -10,27 +11,24 @@ export type ExperimentId =
 export type Variant = "control" | "variant_a" | "variant_b";
 
 /**
- * Track experiment event server-side
+ * Track experiment event server-side (fire-and-forget; written in a batch
+ * after the response)
  */
-export async function trackExperimentEvent(
+export function trackExperimentEvent(
   experimentId: ExperimentId,
   variant: Variant,
   eventType: "view" | "conversion",
   userId?: string | null,
   metadata?: Record<string, unknown>
-): Promise<void> {
-  try {
-    await adminDb.collection("experimentEvents").add({
-      experimentId,
-      variant,
-      eventType,
-      userId: userId || null,
-      metadata: metadata || {},
-      timestamp: admin.firestore.FieldValue.serverTimestamp(),
-    });
-  } catch (error) {
-    console.error("[experiments] Failed to track event:", error);
-  }
+): void {
+  bufferEvent("experimentEvents", {
+    experimentId,
+    variant,
+    eventType,
+    userId: userId || null,
+    metadata: metadata || {},
+    timestamp: admin.firestore.Timestamp.now(),
+  });
 }
 
 /**
@@ -1,5 +1,7 @@
 import "server-only";
+import { createHash } from "crypto";
 import admin from "firebase-admin";
+import { LruCache, registerCacheStats } from "@/lib/lruCache";
 
 const projectId = process.env.FIREBASE_PROJECT_ID;
 const storageBucket = process.env.NEXT_PUBLIC_FIREBASE_STORAGE_BUCKET;
@@ -16,14 +18,157 @@ export const adminAuth = admin.auth();
 export const adminDb = admin.firestore();
 export const adminStorage = admin.storage();
 
-export async function verifyAuth(req: Request): Promise<{ uid: string; email?: string }> {
+// ============================================
+// VERIFIED TOKEN CACHE
+// ============================================
+
+/**
+ * Decoded ID tokens, keyed by a hash of the token, until the token expires
+ * (verifyIdToken does not check revocation, so this answers exactly as it
+ * would). A page load's burst of API calls with one token verifies it once.
+ * Role and tier lookups are cached per uid for a short TTL so upgrades and
+ * admin changes show up within a minute on every instance.
+ */
+
+type VerifiedToken = { uid: string; email?: string };
+
+export type UserAccess = {
+  email?: string;
+  tier: string;
+  status: string;
+};
+
+// Tokens unused for this long are dropped before they expire
+const TOKEN_IDLE_TTL_MS = 10 * 60 * 1000;
+const ROLE_TTL_MS = 60 * 1000;
+
+const verifiedTokens = new LruCache<string, VerifiedToken>({ maxEntries: 5000, ttlMs: TOKEN_IDLE_TTL_MS });
+const userAccess = new LruCache<string, UserAccess>({ maxEntries: 5000 });
+const adminRoles = new LruCache<string, boolean>({ maxEntries: 1000 });
+
+registerCacheStats("authTokens", () => verifiedTokens.stats());
+registerCacheStats("authUsers", () => userAccess.stats());
+registerCacheStats("authAdmins", () => adminRoles.stats());
+
+// Lookups in progress, so concurrent requests share one
+const inFlight = new Map<string, Promise<unknown>>();
+
+function once<T>(key: string, load: () => Promise<T>): Promise<T> {
+  const pending = inFlight.get(key) as Promise<T> | undefined;
+  if (pending) return pending;
+  const promise = load().finally(() => inFlight.delete(key));
+  inFlight.set(key, promise);
+  return promise;
+}
+
+function bearerToken(req: Request): string | null {
   const authHeader = req.headers.get("authorization") || "";
-  const token = authHeader.startsWith("Bearer ") ? authHeader.slice(7) : null;
+  return authHeader.startsWith("Bearer ") ? authHeader.slice(7) : null;
+}
+
+async function verifyIdTokenCached(token: string): Promise<VerifiedToken> {
+  const key = createHash("sha256").update(token).digest("base64");
+  const cached = verifiedTokens.get(key);
+  if (cached) return cached;
+
+  return once(`token:${key}`, async () => {
+    const decoded = await adminAuth.verifyIdToken(token);
+    const verified = { uid: decoded.uid, email: decoded.email };
+    const ttlMs = decoded.exp * 1000 - Date.now();
+    if (ttlMs > 0) verifiedTokens.set(key, verified, ttlMs);
+    return verified;
+  });
+}
+
+/**
+ * Tier and subscription status from the user's doc (null if there is none)
+ */
+export async function getUserAccess(uid: string): Promise<UserAccess | null> {
+  const cached = userAccess.get(uid);
+  if (cached) return cached;
+
+  return once(`user:${uid}`, async () => {
+    const userDoc = await adminDb.collection("users").doc(uid).get();
+    // Not cached: the doc is created just after sign-up
+    if (!userDoc.exists) return null;
+
+    const userData = userDoc.data()!;
+    const access = {
+      email: userData.email || undefined,
+      tier: userData.subscriptionTier || userData.tier || "tier1",
+      status: userData.subscriptionStatus || "active",
+    };
+    userAccess.set(uid, access, ROLE_TTL_MS);
+    return access;
+  });
+}
+
+/**
+ * Whether the uid has an admins/{uid} doc
+ */
+export async function isAdmin(uid: string): Promise<boolean> {
+  const cached = adminRoles.get(uid);
+  if (cached !== undefined) return cached;
+
+  return once(`admin:${uid}`, async () => {
+    const adminDoc = await adminDb.collection("admins").doc(uid).get();
+    adminRoles.set(uid, adminDoc.exists, ROLE_TTL_MS);
+    return adminDoc.exists;
+  });
+}
+
+/**
+ * Drop this instance's cached tier and role for a user (after changing them)
+ */
+export function invalidateUserAccess(uid: string) {
+  userAccess.delete(uid);
+  adminRoles.delete(uid);
+}
+
+export async function verifyAuth(req: Request): Promise<{ uid: string; email?: string }> {
+  const token = bearerToken(req);
 
   if (!token) {
     throw new Error("Unauthorized");
   }
 
-  const decoded = await adminAuth.verifyIdToken(token);
-  return { uid: decoded.uid, email: decoded.email };
+  return verifyIdTokenCached(token);
+}
+
+/**
+ * Verify the request's token and load the user's tier and status.
+ * Null if the token is missing or invalid or the user has no doc.
+ */
+export async function verifyUser(req: Request): Promise<{
+  uid: string;
+  email: string;
+  tier: string;
+  status: string;
+} | null> {
+  try {
+    const { uid, email } = await verifyAuth(req);
+    const access = await getUserAccess(uid);
+    if (!access) return null;
+
+    return {
+      uid,
+      email: access.email || email || "",
+      tier: access.tier,
+      status: access.status,
+    };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Verify the request's token and check that it belongs to an admin
+ */
+export async function verifyAdmin(req: Request): Promise<boolean> {
+  try {
+    const { uid } = await verifyAuth(req);
+    return await isAdmin(uid);
+  } catch {
+    return false;
+  }
 }
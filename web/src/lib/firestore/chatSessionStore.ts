@@ -0,0 +1,39 @@
+import "server-only";
+import { createHash } from "crypto";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import type { ChatMessage, ChatSessionBackingStore } from "@/lib/chat/sessionStore";
+
+/**
+ * Persistent chat history, one Firestore document per session, so a
+ * conversation continues when a request lands on another instance.
+ *
+ * Documents carry an `expiresAt` timestamp; enable a Firestore TTL policy on
+ * chatSessions.expiresAt to have abandoned sessions deleted automatically.
+ */
+export class FirestoreChatSessionStore implements ChatSessionBackingStore {
+  constructor(private collection: string = "chatSessions") {}
+
+  private ref(sessionId: string) {
+    // Session IDs come from the client; hash them into valid document IDs
+    const docId = createHash("sha256").update(sessionId).digest("hex");
+    return adminDb.collection(this.collection).doc(docId);
+  }
+
+  async load(sessionId: string): Promise<ChatMessage[] | null> {
+    const snap = await this.ref(sessionId).get();
+    if (!snap.exists) return null;
+
+    const data = snap.data() || {};
+    if (data.expiresAt?.toMillis?.() <= Date.now()) return null;
+    return Array.isArray(data.history) ? (data.history as ChatMessage[]) : null;
+  }
+
+  async save(sessionId: string, history: ChatMessage[], ttlMs: number): Promise<void> {
+    await this.ref(sessionId).set({
+      history,
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+      expiresAt: admin.firestore.Timestamp.fromMillis(Date.now() + ttlMs),
+    });
+  }
+}
@@ -0,0 +1,159 @@
+import "server-only";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+
+/**
+ * Time-bucketed email counters, kept current at write time:
+ *
+ *   emailMetricsHourly/{YYYY-MM-DDTHH}_{shard}  and  emailMetricsDaily/{YYYY-MM-DD}_{shard}
+ *   { start: Timestamp, counts: { [emailType]: { sent, failed, bounced, opened, unsubscribed, spam } } }
+ *
+ * Each bucket is spread over EMAIL_METRIC_SHARDS docs, a random one per write,
+ * so every send in an hour does not update the same document. A date range
+ * is answered by summing every doc of the daily buckets for the whole days
+ * and of the hourly buckets for the partial days at either end (all UTC);
+ * unsharded {YYYY-MM-DDTHH} docs (backfilled) are summed the same way.
+ */
+
+export const EMAIL_METRICS_HOURLY = "emailMetricsHourly";
+export const EMAIL_METRICS_DAILY = "emailMetricsDaily";
+// Docs per bucket; each takes about one sustained write per second
+export const EMAIL_METRIC_SHARDS = 10;
+
+export const EMAIL_METRIC_STATUSES = ["sent", "failed", "bounced", "opened", "unsubscribed", "spam"] as const;
+export type EmailMetricStatus = (typeof EMAIL_METRIC_STATUSES)[number];
+export type EmailMetricCounts = Record<EmailMetricStatus, number>;
+
+export type EmailMetricEvent = {
+  type: string;
+  status: EmailMetricStatus;
+  at?: Date;
+};
+
+const HOUR_MS = 60 * 60 * 1000;
+const DAY_MS = 24 * HOUR_MS;
+
+export function emptyEmailMetricCounts(): EmailMetricCounts {
+  return { sent: 0, failed: 0, bounced: 0, opened: 0, unsubscribed: 0, spam: 0 };
+}
+
+// Map keys must be plain identifiers for the dotted increment paths
+function metricKey(type: string): string {
+  return type.replace(/[^a-zA-Z0-9_-]/g, "_") || "unknown";
+}
+
+function hourStart(ms: number) {
+  return Math.floor(ms / HOUR_MS) * HOUR_MS;
+}
+
+function dayStart(ms: number) {
+  return Math.floor(ms / DAY_MS) * DAY_MS;
+}
+
+/**
+ * Add the events' increments to their hourly and daily buckets in `batch`
+ * (one write per bucket touched, all to the same random shard)
+ */
+export function addEmailMetricIncrements(batch: admin.firestore.WriteBatch, events: EmailMetricEvent[]) {
+  const shard = Math.floor(Math.random() * EMAIL_METRIC_SHARDS);
+  const buckets = new Map<string, { collection: string; start: number; counts: Map<string, number> }>();
+
+  for (const event of events) {
+    const at = (event.at ?? new Date()).getTime();
+    const path = `${metricKey(event.type)}.${event.status}`;
+    const targets = [
+      { collection: EMAIL_METRICS_HOURLY, start: hourStart(at), id: new Date(hourStart(at)).toISOString().slice(0, 13) },
+      { collection: EMAIL_METRICS_DAILY, start: dayStart(at), id: new Date(dayStart(at)).toISOString().slice(0, 10) },
+    ];
+    for (const target of targets) {
+      const key = `${target.collection}/${target.id}_${shard}`;
+      let bucket = buckets.get(key);
+      if (!bucket) {
+        bucket = { collection: target.collection, start: target.start, counts: new Map() };
+        buckets.set(key, bucket);
+      }
+      bucket.counts.set(path, (bucket.counts.get(path) || 0) + 1);
+    }
+  }
+
+  for (const [key, bucket] of buckets) {
+    const counts: Record<string, Record<string, admin.firestore.FieldValue>> = {};
+    for (const [path, n] of bucket.counts) {
+      const [type, status] = path.split(".");
+      counts[type] = counts[type] || {};
+      counts[type][status] = admin.firestore.FieldValue.increment(n);
+    }
+    batch.set(
+      adminDb.doc(key),
+      { start: admin.firestore.Timestamp.fromMillis(bucket.start), counts },
+      { merge: true }
+    );
+  }
+}
+
+/**
+ * Record events on their own (when there is no other write to batch with).
+ * Never throws; metrics must not fail the caller.
+ */
+export async function recordEmailMetrics(events: EmailMetricEvent[]): Promise<void> {
+  if (events.length === 0) return;
+  try {
+    const batch = adminDb.batch();
+    addEmailMetricIncrements(batch, events);
+    await batch.commit();
+  } catch (error: any) {
+    console.error("[emailMetrics] Failed to record metrics:", error?.message || error);
+  }
+}
+
+async function sumBuckets(
+  collection: string,
+  fromMs: number,
+  toMs: number,
+  into: Record<string, EmailMetricCounts>
+) {
+  if (fromMs >= toMs) return;
+  const snap = await adminDb
+    .collection(collection)
+    .where("start", ">=", admin.firestore.Timestamp.fromMillis(fromMs))
+    .where("start", "<", admin.firestore.Timestamp.fromMillis(toMs))
+    .get();
+
+  snap.forEach((doc) => {
+    const counts = (doc.data().counts || {}) as Record<string, Partial<EmailMetricCounts>>;
+    for (const [type, byStatus] of Object.entries(counts)) {
+      const total = (into[type] = into[type] || emptyEmailMetricCounts());
+      for (const status of EMAIL_METRIC_STATUSES) {
+        total[status] += byStatus[status] || 0;
+      }
+    }
+  });
+}
+
+/**
+ * Counts per email type for [from, to), to hour precision. Reads at most
+ * one bucket per whole day plus 48 hourly buckets (EMAIL_METRIC_SHARDS docs
+ * each), whatever the email volume.
+ */
+export async function getEmailMetrics(from: Date, to: Date): Promise<Record<string, EmailMetricCounts>> {
+  const fromMs = hourStart(from.getTime());
+  const toMs = hourStart(to.getTime() + HOUR_MS - 1);
+  const totals: Record<string, EmailMetricCounts> = {};
+  if (fromMs >= toMs) return totals;
+
+  // Whole days in the middle; hours for the partial days at the ends
+  const firstFullDay = dayStart(fromMs + DAY_MS - 1);
+  const lastFullDay = dayStart(toMs);
+
+  if (firstFullDay < lastFullDay) {
+    await Promise.all([
+      sumBuckets(EMAIL_METRICS_HOURLY, fromMs, firstFullDay, totals),
+      sumBuckets(EMAIL_METRICS_DAILY, firstFullDay, lastFullDay, totals),
+      sumBuckets(EMAIL_METRICS_HOURLY, lastFullDay, toMs, totals),
+    ]);
+  } else {
+    await sumBuckets(EMAIL_METRICS_HOURLY, fromMs, toMs, totals);
+  }
+
+  return totals;
+}
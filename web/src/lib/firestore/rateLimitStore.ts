@@ -0,0 +1,47 @@
+import "server-only";
+import { createHash } from "crypto";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import {
+  applyRateLimit,
+  limitExpiresAt,
+  type LimitState,
+  type RateLimitResult,
+  type RateLimitStore,
+} from "@/lib/rateLimit";
+
+/**
+ * Shared rate limit store backed by one Firestore document per key, so every
+ * App Hosting instance enforces the same limit. Each hit runs the GCRA
+ * update in a transaction.
+ *
+ * Documents carry an `expiresAt` timestamp; enable a Firestore TTL policy on
+ * rateLimits.expiresAt to have stale keys deleted automatically.
+ */
+export class FirestoreRateLimitStore implements RateLimitStore {
+  constructor(private collection: string = "rateLimits") {}
+
+  async hit(key: string, maxRequests: number, windowMs: number, now: number): Promise<RateLimitResult> {
+    // Keys contain IPs, colons and arbitrary IDs; hash them into valid document IDs
+    const docId = createHash("sha256").update(key).digest("hex");
+    const ref = adminDb.collection(this.collection).doc(docId);
+
+    return adminDb.runTransaction(async (tx) => {
+      const snap = await tx.get(ref);
+      const { result, state } = applyRateLimit(
+        snap.exists ? (snap.data() as LimitState) : null,
+        maxRequests,
+        windowMs,
+        now
+      );
+
+      tx.set(ref, {
+        ...state,
+        key,
+        expiresAt: admin.firestore.Timestamp.fromMillis(limitExpiresAt(state)),
+      });
+
+      return result;
+    });
+  }
+}
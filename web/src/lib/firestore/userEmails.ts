@@ -0,0 +1,86 @@
+import "server-only";
+import { createHash } from "crypto";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+
+/**
+ * Email → uid lookup: userEmails/{hash of normalized email} holds
+ * { uid, email }, so finding the user behind an address is a document read
+ * instead of a users query. Entries are written where the server sets a
+ * user's email (and by scripts/backfill-user-emails.ts); a lookup that misses
+ * falls back to querying users and fills the entry in.
+ */
+
+export const USER_EMAILS = "userEmails";
+
+// Firestore's limit on values in an "in" filter
+const IN_QUERY_LIMIT = 30;
+
+export function normalizeEmail(email: string): string {
+  return email.trim().toLowerCase();
+}
+
+export function userEmailRef(email: string) {
+  const id = createHash("sha1").update(normalizeEmail(email)).digest("hex");
+  return adminDb.collection(USER_EMAILS).doc(id);
+}
+
+/**
+ * Point an address at a user in `batch`
+ */
+export function setUserEmailEntry(batch: admin.firestore.WriteBatch, uid: string, email: string) {
+  batch.set(userEmailRef(email), {
+    uid,
+    email: normalizeEmail(email),
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  });
+}
+
+/**
+ * uid of the user behind each address, keyed by normalized email (unknown
+ * addresses are left out). One getAll for the index, then one users query
+ * per 30 addresses it does not have yet.
+ */
+export async function lookupUidsByEmail(emails: string[]): Promise<Map<string, string>> {
+  const addresses = Array.from(new Set(emails.filter(Boolean)));
+  const normalized = Array.from(new Set(addresses.map(normalizeEmail)));
+  const found = new Map<string, string>();
+  if (normalized.length === 0) return found;
+
+  const entries = await adminDb.getAll(...normalized.map(userEmailRef));
+  const missing = new Set<string>();
+  entries.forEach((entry, i) => {
+    const uid = entry.data()?.uid;
+    if (uid) found.set(normalized[i], uid);
+    else missing.add(normalized[i]);
+  });
+  if (missing.size === 0) return found;
+
+  // Not indexed yet: users store the address as entered, so match both forms
+  const candidates = Array.from(
+    new Set([...Array.from(missing), ...addresses.filter((email) => missing.has(normalizeEmail(email)))])
+  );
+  const queries: Promise<admin.firestore.QuerySnapshot>[] = [];
+  for (let i = 0; i < candidates.length; i += IN_QUERY_LIMIT) {
+    queries.push(adminDb.collection("users").where("email", "in", candidates.slice(i, i + IN_QUERY_LIMIT)).get());
+  }
+
+  const heal = adminDb.batch();
+  let healed = 0;
+  for (const snap of await Promise.all(queries)) {
+    for (const doc of snap.docs) {
+      const email = doc.data().email;
+      if (typeof email !== "string" || found.has(normalizeEmail(email))) continue;
+      found.set(normalizeEmail(email), doc.id);
+      setUserEmailEntry(heal, doc.id, email);
+      healed++;
+    }
+  }
+  if (healed > 0) {
+    await heal.commit().catch((error) => {
+      console.error("[userEmails] Failed to index looked-up users:", error?.message || error);
+    });
+  }
+
+  return found;
+}
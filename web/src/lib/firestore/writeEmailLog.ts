@@ -1,6 +1,7 @@
 import "server-only";
 import admin from "firebase-admin";
 import { adminDb } from "@/lib/firebaseAdmin";
+import { addEmailMetricIncrements } from "@/lib/firestore/emailMetrics";
 
 export type EmailLogEntry = {
   uid?: string | null;
@@ -13,13 +14,48 @@ export type EmailLogEntry = {
   meta?: Record<string, unknown>;
 };
 
+/**
+ * Write an email log entry; the email metrics buckets are updated in the same batch
+ */
 export async function writeEmailLog(entry: EmailLogEntry): Promise<string> {
   const logRef = adminDb.collection("emailLogs").doc();
-  
-  await logRef.set({
+  const batch = adminDb.batch();
+
+  batch.set(logRef, {
     ...entry,
     createdAt: admin.firestore.FieldValue.serverTimestamp(),
   });
+  addEmailMetricIncrements(batch, [{ type: entry.type, status: entry.status }]);
+  await batch.commit();
 
   return logRef.id;
 }
+
+// Firestore caps a batched write at 500 operations; leave room for the metrics buckets
+const LOG_BATCH_SIZE = 450;
+
+/**
+ * Write many email log entries with batched writes (one commit per 450 entries,
+ * including their metrics increments). Returns the log IDs in the same order
+ * as the entries.
+ */
+export async function writeEmailLogs(entries: EmailLogEntry[]): Promise<string[]> {
+  const ids: string[] = [];
+
+  for (let i = 0; i < entries.length; i += LOG_BATCH_SIZE) {
+    const chunk = entries.slice(i, i + LOG_BATCH_SIZE);
+    const batch = adminDb.batch();
+    for (const entry of chunk) {
+      const logRef = adminDb.collection("emailLogs").doc();
+      batch.set(logRef, {
+        ...entry,
+        createdAt: admin.firestore.FieldValue.serverTimestamp(),
+      });
+      ids.push(logRef.id);
+    }
+    addEmailMetricIncrements(batch, chunk.map((entry) => ({ type: entry.type, status: entry.status })));
+    await batch.commit();
+  }
+
+  return ids;
+}
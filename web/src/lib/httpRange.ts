@@ -0,0 +1,56 @@
+/**
+ * Helpers for conditional (ETag) and byte-range requests on file downloads
+ */
+
+export type ByteRange = { start: number; end: number };
+
+/**
+ * Whether an If-None-Match header matches the current ETag (weak comparison)
+ */
+export function etagMatches(ifNoneMatch: string | null, etag: string): boolean {
+  if (!ifNoneMatch) return false;
+  const strip = (tag: string) => tag.trim().replace(/^W\//, "");
+  const current = strip(etag);
+  return ifNoneMatch.split(",").some((tag) => tag.trim() === "*" || strip(tag) === current);
+}
+
+/**
+ * The single byte range a request asks for, given the file size.
+ *
+ * Returns null when the whole file should be sent: no Range header, an
+ * If-Range that no longer matches the ETag, an invalid range spec (e.g. a
+ * last byte before the first) or a multi-range request (which servers may
+ * answer with the full body). Returns "unsatisfiable" for a range that
+ * starts past the end of the file (416).
+ */
+export function requestedRange(req: Request, size: number, etag: string): ByteRange | "unsatisfiable" | null {
+  const header = req.headers.get("range");
+  if (!header) return null;
+
+  const ifRange = req.headers.get("if-range");
+  if (ifRange && ifRange.trim() !== etag) return null;
+
+  const match = /^bytes=(\d*)-(\d*)$/.exec(header.trim());
+  if (!match) return null;
+
+  const [, first, last] = match;
+  let start: number;
+  let end: number;
+
+  if (first === "") {
+    // Suffix range: the last N bytes
+    if (last === "") return null;
+    const length = Number(last);
+    if (length === 0) return "unsatisfiable";
+    start = Math.max(0, size - length);
+    end = size - 1;
+  } else {
+    start = Number(first);
+    // bytes=500-100 is not a valid range spec: ignore the header
+    if (last !== "" && Number(last) < start) return null;
+    end = last === "" ? size - 1 : Math.min(Number(last), size - 1);
+  }
+
+  if (start >= size) return "unsatisfiable";
+  return { start, end };
+}
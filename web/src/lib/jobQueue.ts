@@ -0,0 +1,132 @@
+import { createLimiter, type Limiter } from "@/lib/concurrency";
+
+export type JobQueueStats = {
+  enqueued: number;
+  coalesced: number;
+  completed: number;
+  retried: number;
+  failed: number;
+  pending: number;
+  running: number;
+};
+
+export type LocalJobQueueOptions = {
+  /** Jobs run at once (default: 2) */
+  concurrency?: number;
+  /** Attempts per job before it is dropped (default: 3) */
+  maxAttempts?: number;
+  /** Delay before the first retry, doubled for each further one (default: 1s) */
+  retryDelayMs?: number;
+};
+
+/**
+ * In-process job queue with per-key deduplication.
+ *
+ * Enqueueing a key that is already waiting replaces its payload; enqueueing
+ * a key that is running queues one follow-up run with the newest payload, so
+ * bursts of changes collapse into at most one extra job. Failed jobs are
+ * retried with exponential backoff. `drain()` resolves once the queue is idle
+ * (scripts and tests await it).
+ */
+export class LocalJobQueue<T> {
+  private waiting = new Map<string, T>();
+  private running = new Set<string>();
+  private followUps = new Map<string, T>();
+  private limit: Limiter;
+  private maxAttempts: number;
+  private retryDelayMs: number;
+  private inFlight = 0;
+  private idleWaiters: Array<() => void> = [];
+  private counters = { enqueued: 0, coalesced: 0, completed: 0, retried: 0, failed: 0 };
+
+  constructor(
+    private name: string,
+    private handler: (key: string, payload: T) => Promise<void>,
+    options: LocalJobQueueOptions = {}
+  ) {
+    this.limit = createLimiter(options.concurrency ?? 2);
+    this.maxAttempts = Math.max(1, options.maxAttempts ?? 3);
+    this.retryDelayMs = options.retryDelayMs ?? 1000;
+  }
+
+  /**
+   * Queue a job; returns false when it was merged into one already queued
+   */
+  enqueue(key: string, payload: T): boolean {
+    this.counters.enqueued++;
+
+    if (this.waiting.has(key)) {
+      this.waiting.set(key, payload);
+      this.counters.coalesced++;
+      return false;
+    }
+    if (this.running.has(key)) {
+      const merged = this.followUps.has(key);
+      if (merged) this.counters.coalesced++;
+      this.followUps.set(key, payload);
+      return !merged;
+    }
+
+    this.waiting.set(key, payload);
+    this.schedule(key);
+    return true;
+  }
+
+  /**
+   * Resolves when no job is waiting or running
+   */
+  drain(): Promise<void> {
+    if (this.inFlight === 0) return Promise.resolve();
+    return new Promise((resolve) => this.idleWaiters.push(resolve));
+  }
+
+  stats(): JobQueueStats {
+    return {
+      ...this.counters,
+      pending: this.waiting.size + this.followUps.size,
+      running: this.running.size,
+    };
+  }
+
+  private schedule(key: string) {
+    this.inFlight++;
+    void this.limit(async () => {
+      const payload = this.waiting.get(key) as T;
+      this.waiting.delete(key);
+      this.running.add(key);
+      try {
+        await this.run(key, payload);
+      } finally {
+        this.running.delete(key);
+        if (this.followUps.has(key)) {
+          this.waiting.set(key, this.followUps.get(key) as T);
+          this.followUps.delete(key);
+          this.schedule(key);
+        }
+      }
+    }).finally(() => {
+      this.inFlight--;
+      if (this.inFlight === 0) {
+        for (const resolve of this.idleWaiters.splice(0)) resolve();
+      }
+    });
+  }
+
+  private async run(key: string, payload: T) {
+    for (let attempt = 1; ; attempt++) {
+      try {
+        await this.handler(key, payload);
+        this.counters.completed++;
+        return;
+      } catch (error: any) {
+        if (attempt >= this.maxAttempts) {
+          this.counters.failed++;
+          console.error(`[${this.name}] Job ${key} failed after ${attempt} attempts:`, error?.message || error);
+          return;
+        }
+        this.counters.retried++;
+        await new Promise((resolve) => setTimeout(resolve, this.retryDelayMs * 2 ** (attempt - 1)));
+      }
+    }
+  }
+}
@@ -0,0 +1,199 @@
+export type CacheStats = {
+  entries: number;
+  bytes: number;
+  hits: number;
+  misses: number;
+  evictions: number;
+  expirations: number;
+  hitRate: number;
+};
+
+type Entry<V> = {
+  value: V;
+  bytes: number;
+  // Slides forward on every read (idle TTL)
+  idleUntil: number;
+  // Fixed per-entry expiry, never extended
+  deadline: number;
+};
+
+export type LruCacheOptions<V> = {
+  /** Maximum number of entries (default: 1000) */
+  maxEntries?: number;
+  /** Maximum total size in bytes as measured by sizeOf (default: unlimited) */
+  maxBytes?: number;
+  /** Entries not read or written for this long are dropped (default: never) */
+  ttlMs?: number;
+  /** Size of a value in bytes (default: 0, i.e. only maxEntries applies) */
+  sizeOf?: (value: V) => number;
+};
+
+function isExpired(entry: Entry<unknown>, now: number) {
+  return entry.idleUntil <= now || entry.deadline <= now;
+}
+
+/**
+ * Bounded in-process cache with LRU eviction, idle TTL and byte accounting.
+ * Map insertion order doubles as the recency list: reads re-insert the entry,
+ * so the first key is always the least recently used.
+ */
+export class LruCache<K, V> {
+  private entries = new Map<K, Entry<V>>();
+  private totalBytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private evictions = 0;
+  private expirations = 0;
+
+  private maxEntries: number;
+  private maxBytes: number;
+  private ttlMs: number;
+  private sizeOf: (value: V) => number;
+
+  constructor(options: LruCacheOptions<V> = {}) {
+    this.maxEntries = options.maxEntries ?? 1000;
+    this.maxBytes = options.maxBytes ?? Infinity;
+    this.ttlMs = options.ttlMs ?? Infinity;
+    this.sizeOf = options.sizeOf ?? (() => 0);
+  }
+
+  get(key: K, now: number = Date.now()): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    if (isExpired(entry, now)) {
+      this.remove(key, entry);
+      this.expirations++;
+      this.misses++;
+      return undefined;
+    }
+
+    this.hits++;
+    // Re-insert so the entry moves to the most recently used end
+    this.entries.delete(key);
+    entry.idleUntil = now + this.ttlMs;
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  has(key: K, now: number = Date.now()): boolean {
+    const entry = this.entries.get(key);
+    return !!entry && !isExpired(entry, now);
+  }
+
+  /**
+   * Store a value. `ttlMs` sets a hard expiry for this entry on top of the
+   * idle TTL (e.g. a token that must not outlive its own expiry).
+   */
+  set(key: K, value: V, ttlMs?: number, now: number = Date.now()) {
+    const existing = this.entries.get(key);
+    if (existing) this.remove(key, existing);
+
+    const bytes = this.sizeOf(value);
+    if (bytes > this.maxBytes) return;
+
+    this.entries.set(key, {
+      value,
+      bytes,
+      idleUntil: now + this.ttlMs,
+      deadline: ttlMs === undefined ? Infinity : now + ttlMs,
+    });
+    this.totalBytes += bytes;
+    this.evictOverflow();
+  }
+
+  delete(key: K): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.remove(key, entry);
+    return true;
+  }
+
+  /**
+   * Drop every entry whose key matches; returns how many were removed
+   */
+  deleteMatching(predicate: (key: K) => boolean): number {
+    let removed = 0;
+    for (const [key, entry] of this.entries) {
+      if (predicate(key)) {
+        this.remove(key, entry);
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  clear() {
+    this.entries.clear();
+    this.totalBytes = 0;
+  }
+
+  /**
+   * Drop every expired entry; returns how many were removed
+   */
+  prune(now: number = Date.now()): number {
+    let removed = 0;
+    for (const [key, entry] of this.entries) {
+      if (isExpired(entry, now)) {
+        this.remove(key, entry);
+        this.expirations++;
+        removed++;
+      }
+    }
+    return removed;
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  stats(): CacheStats {
+    const lookups = this.hits + this.misses;
+    return {
+      entries: this.entries.size,
+      bytes: this.totalBytes,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      expirations: this.expirations,
+      hitRate: lookups ? this.hits / lookups : 0,
+    };
+  }
+
+  private remove(key: K, entry: Entry<V>) {
+    this.entries.delete(key);
+    this.totalBytes -= entry.bytes;
+  }
+
+  private evictOverflow() {
+    while (this.entries.size > this.maxEntries || this.totalBytes > this.maxBytes) {
+      const oldest = this.entries.entries().next().value;
+      if (!oldest) break;
+      this.remove(oldest[0], oldest[1]);
+      this.evictions++;
+    }
+  }
+}
+
+// ============================================
+// STATS REGISTRY (for the admin cache dashboard)
+// ============================================
+
+const registry = new Map<string, () => CacheStats>();
+
+/**
+ * Expose a cache's counters under a name in getCacheStats()
+ */
+export function registerCacheStats(name: string, read: () => CacheStats) {
+  registry.set(name, read);
+}
+
+export function getCacheStats(): Record<string, CacheStats> {
+  const all: Record<string, CacheStats> = {};
+  for (const [name, read] of registry) {
+    all[name] = read();
+  }
+  return all;
+}
@@ -0,0 +1,132 @@
+import "server-only";
+import React from "react";
+import { renderToBuffer, renderToStream } from "@react-pdf/renderer";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { EpkPdfDocument, type EpkPdfData, type EpkTier, type TrackInfo } from "@/lib/pdf/EpkPdfTemplate";
+import { epkPdfCacheKey, hasStoredEpkPdf, storeEpkPdf } from "@/lib/pdf/epkPdfCache";
+import { getPressImageSource, getQrCodeDataUrl } from "@/lib/pdf/pdfAssets";
+
+/**
+ * Whether the user's subscription allows PDF downloads
+ */
+export function hasPdfAccess(userData: Record<string, any>): boolean {
+  const subStatus = userData.subscriptionStatus || userData.paymentStatus;
+  return subStatus === "active" || subStatus === "paid" || subStatus === "trialing";
+}
+
+export function epkTierOf(userData: Record<string, any>): EpkTier {
+  return (userData.subscriptionTier as EpkTier) || "tier1";
+}
+
+/**
+ * Build the template data for a user's EPK (everything except track QR
+ * codes and embedded image bytes, which the render functions add). `email` is the auth email fallback for
+ * the contact address.
+ */
+export async function buildEpkPdfData(uid: string, userData: Record<string, any>, email?: string): Promise<EpkPdfData> {
+  const tier = epkTierOf(userData);
+
+  // Fetch press images
+  const mediaSnap = await adminDb
+    .collection("users")
+    .doc(uid)
+    .collection("media")
+    .orderBy("sortOrder", "asc")
+    .limit(6)
+    .get();
+
+  // Prefer the downscaled PDF variant; older uploads only have the original
+  const pressImages = mediaSnap.docs.map((doc) => {
+    const data = doc.data();
+    const source = data.pdfVariant?.downloadURL ? data.pdfVariant : data;
+    return {
+      url: source.downloadURL,
+      width: source.width || 500,
+      height: source.height || 500,
+    };
+  });
+
+  let tracks: TrackInfo[] | undefined;
+  if (userData.tracks && Array.isArray(userData.tracks)) {
+    tracks = userData.tracks.slice(0, tier === "tier1" ? 3 : 5).map((track: any) => ({
+      title: track.title || "Untitled",
+      description: track.description,
+      streamingUrl: track.streamingUrl || track.url,
+    }));
+  }
+
+  return {
+    artistName: userData.artistName || userData.displayName || "Artist",
+    tagline: userData.tagline || userData.genre || undefined,
+    bio: userData.bio || undefined,
+    genre: userData.genre || undefined,
+    location: userData.location || undefined,
+    contactEmail: userData.contactEmail || email || undefined,
+    website: userData.links?.website || undefined,
+    quote: userData.quote || undefined,
+    achievements: userData.achievements || undefined,
+    tracks,
+    pressQuotes: tier === "tier3" ? userData.pressQuotes : undefined,
+    stats: userData.stats || undefined,
+    links: userData.links || undefined,
+    pressImages,
+    tier,
+    brandSettings: tier === "tier3" ? userData.brandSettings : undefined,
+  };
+}
+
+// Resolve cached render assets: press image bytes, and track QR codes for Tier II & III
+async function withRenderAssets(data: EpkPdfData): Promise<EpkPdfData> {
+  const pressImages = await Promise.all(
+    data.pressImages.map(async (image) => ({ ...image, url: await getPressImageSource(image.url) }))
+  );
+
+  if (data.tier === "tier1" || !data.tracks) return { ...data, pressImages };
+  const tracks = await Promise.all(
+    data.tracks.map(async (track) => ({
+      ...track,
+      qrCodeDataUrl: track.streamingUrl ? await getQrCodeDataUrl(track.streamingUrl) : undefined,
+    }))
+  );
+  return { ...data, pressImages, tracks };
+}
+
+/**
+ * Render the PDF into memory (background pre-render)
+ */
+export async function renderEpkPdf(data: EpkPdfData): Promise<Buffer> {
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  return renderToBuffer(React.createElement(EpkPdfDocument, { data: await withRenderAssets(data) }) as any);
+}
+
+/**
+ * Render the PDF as a stream, so a download can start before rendering ends
+ * and the whole file never has to sit in memory
+ */
+export async function renderEpkPdfStream(data: EpkPdfData): Promise<NodeJS.ReadableStream> {
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  return renderToStream(React.createElement(EpkPdfDocument, { data: await withRenderAssets(data) }) as any);
+}
+
+export type PrerenderResult = "rendered" | "fresh" | "no-access" | "not-found";
+
+/**
+ * Render and store a user's current EPK PDF unless that exact content is
+ * already stored (background pre-render; the download route serves the file)
+ */
+export async function prerenderEpkPdf(uid: string): Promise<PrerenderResult> {
+  const userSnap = await adminDb.collection("users").doc(uid).get();
+  if (!userSnap.exists) return "not-found";
+
+  const userData = userSnap.data()!;
+  if (!hasPdfAccess(userData)) return "no-access";
+
+  // The account email stands in for the auth token's email the download route uses
+  const pdfData = await buildEpkPdfData(uid, userData, userData.email);
+  const cacheKey = epkPdfCacheKey(pdfData);
+  if (await hasStoredEpkPdf(uid, cacheKey)) return "fresh";
+
+  const buffer = await renderEpkPdf(pdfData);
+  await storeEpkPdf(uid, cacheKey, buffer, pdfData.tier);
+  return "rendered";
+}
@@ -0,0 +1,207 @@
+import "server-only";
+import { createHash } from "crypto";
+import { PassThrough, Readable, type Writable } from "stream";
+import { adminStorage } from "@/lib/firebaseAdmin";
+import { LruCache, registerCacheStats } from "@/lib/lruCache";
+import type { EpkPdfData } from "@/lib/pdf/EpkPdfTemplate";
+
+// Bump when EpkPdfTemplate's output changes so stored PDFs are re-rendered
+export const EPK_PDF_TEMPLATE_VERSION = 1;
+
+const MEMORY_CACHE_BYTES = 64 * 1024 * 1024; // 64 MB of recent PDFs per instance
+const MEMORY_CACHE_TTL_MS = 60 * 60 * 1000;
+
+/**
+ * JSON with object keys sorted, so equal data always hashes the same
+ * (Firestore does not guarantee map field order)
+ */
+export function stableStringify(value: unknown): string {
+  if (value === null || typeof value !== "object") {
+    return JSON.stringify(value) ?? "null";
+  }
+  if (Array.isArray(value)) {
+    return `[${value.map((item) => (item === undefined ? "null" : stableStringify(item))).join(",")}]`;
+  }
+  const entries = Object.keys(value as Record<string, unknown>)
+    .filter((key) => (value as Record<string, unknown>)[key] !== undefined)
+    .sort()
+    .map((key) => `${JSON.stringify(key)}:${stableStringify((value as Record<string, unknown>)[key])}`);
+  return `{${entries.join(",")}}`;
+}
+
+/**
+ * Content address of a rendered EPK: a hash of everything the template reads,
+ * including the tier (tier1 output is watermarked). Any edit changes the key.
+ * Derived data (track QR codes) is left out; it follows from the track URLs.
+ */
+export function epkPdfCacheKey(data: EpkPdfData): string {
+  const inputs = {
+    ...data,
+    tracks: data.tracks?.map((track) => ({ ...track, qrCodeDataUrl: undefined })),
+  };
+  return createHash("sha256")
+    .update(`${EPK_PDF_TEMPLATE_VERSION}:${stableStringify(inputs)}`)
+    .digest("hex");
+}
+
+export function epkPdfPath(uid: string, key: string): string {
+  return `epk-pdfs/${uid}/${key}.pdf`;
+}
+
+function isNotFound(error: any): boolean {
+  return error?.code === 404 || error?.code === "storage/object-not-found";
+}
+
+// Recently served PDFs, keyed by Storage path
+const memoryCache = new LruCache<string, Buffer>({
+  maxEntries: 500,
+  maxBytes: MEMORY_CACHE_BYTES,
+  ttlMs: MEMORY_CACHE_TTL_MS,
+  sizeOf: (buffer) => buffer.length,
+});
+
+registerCacheStats("epkPdfs", () => memoryCache.stats());
+
+/**
+ * A stored render, opened lazily so bytes stream straight to the response
+ */
+export type StoredEpkPdf = {
+  size: number;
+  source: "memory" | "storage";
+  /** Bytes start..end (inclusive; default: the whole file) */
+  open(start?: number, end?: number): ReadableStream<Uint8Array>;
+};
+
+function toWebStream(stream: Readable): ReadableStream<Uint8Array> {
+  return Readable.toWeb(stream) as unknown as ReadableStream<Uint8Array>;
+}
+
+/**
+ * Look up a rendered PDF: memory first, then Storage with a single metadata
+ * read (which doubles as the existence check). Storage reads are streamed;
+ * a full read also fills the in-memory cache.
+ */
+export async function findCachedEpkPdf(uid: string, key: string): Promise<StoredEpkPdf | null> {
+  const path = epkPdfPath(uid, key);
+  const inMemory = memoryCache.get(path);
+  if (inMemory) {
+    return {
+      size: inMemory.length,
+      source: "memory",
+      open: (start = 0, end = inMemory.length - 1) => toWebStream(Readable.from([inMemory.subarray(start, end + 1)])),
+    };
+  }
+
+  try {
+    const file = adminStorage.bucket().file(path);
+    const [metadata] = await file.getMetadata();
+    const size = Number(metadata.size);
+    if (!size) return null;
+
+    return {
+      size,
+      source: "storage",
+      open: (start = 0, end = size - 1) => {
+        const stream = file.createReadStream({ start, end, validation: false });
+        if (start !== 0 || end !== size - 1 || size > MEMORY_CACHE_BYTES / 8) {
+          return toWebStream(stream);
+        }
+
+        const chunks: Buffer[] = [];
+        const tee = new PassThrough();
+        tee.on("data", (chunk: Buffer) => chunks.push(chunk));
+        tee.on("end", () => memoryCache.set(path, Buffer.concat(chunks)));
+        stream.on("error", (error) => tee.destroy(error));
+        return toWebStream(stream.pipe(tee));
+      },
+    };
+  } catch (error) {
+    if (!isNotFound(error)) {
+      console.error("[epkPdfCache] Cache read error:", error);
+    }
+    return null;
+  }
+}
+
+/**
+ * Whether a render for this content key exists (memory or one metadata read)
+ */
+export async function hasStoredEpkPdf(uid: string, key: string): Promise<boolean> {
+  const path = epkPdfPath(uid, key);
+  if (memoryCache.has(path)) return true;
+
+  try {
+    const [metadata] = await adminStorage.bucket().file(path).getMetadata();
+    return Number(metadata.size) > 0;
+  } catch (error) {
+    if (!isNotFound(error)) {
+      console.error("[epkPdfCache] Cache read error:", error);
+    }
+    return false;
+  }
+}
+
+// Superseded renders can never be hit again
+async function deleteSupersededRenders(uid: string, currentPath: string) {
+  const [files] = await adminStorage.bucket().getFiles({ prefix: `epk-pdfs/${uid}/` });
+  await Promise.all(
+    files
+      .filter((file) => file.name !== currentPath)
+      .map((file) => file.delete().catch(() => undefined))
+  );
+}
+
+function uploadOptions(tier: string) {
+  return {
+    contentType: "application/pdf",
+    resumable: false,
+    metadata: {
+      cacheControl: "private, max-age=3600",
+      metadata: { tier, templateVersion: String(EPK_PDF_TEMPLATE_VERSION) },
+    },
+  };
+}
+
+/**
+ * Store a rendered PDF under its content address and drop the user's older renders
+ */
+export async function storeEpkPdf(uid: string, key: string, buffer: Buffer, tier: string): Promise<void> {
+  const path = epkPdfPath(uid, key);
+  memoryCache.set(path, buffer);
+
+  try {
+    await adminStorage.bucket().file(path).save(buffer, uploadOptions(tier));
+    await deleteSupersededRenders(uid, path);
+  } catch (error) {
+    console.error("[epkPdfCache] Cache write error:", error);
+  }
+}
+
+/**
+ * Upload stream for a render that is being streamed to a client at the same
+ * time. Destroy it with an error to abandon the upload (nothing is stored).
+ */
+export function createEpkPdfWriteStream(uid: string, key: string, tier: string): Writable {
+  const path = epkPdfPath(uid, key);
+  const upload = adminStorage.bucket().file(path).createWriteStream(uploadOptions(tier));
+
+  upload.on("finish", () => {
+    deleteSupersededRenders(uid, path).catch((error) => {
+      console.error("[epkPdfCache] Cleanup error:", error);
+    });
+  });
+  upload.on("error", (error) => {
+    console.error("[epkPdfCache] Cache write error:", error);
+  });
+
+  return upload;
+}
+
+/**
+ * Remove every stored and in-memory PDF for a user
+ */
+export async function clearEpkPdfCache(uid: string): Promise<void> {
+  const prefix = `epk-pdfs/${uid}/`;
+  memoryCache.deleteMatching((path) => path.startsWith(prefix));
+  await adminStorage.bucket().deleteFiles({ prefix });
+}
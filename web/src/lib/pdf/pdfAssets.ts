@@ -0,0 +1,93 @@
+import "server-only";
+import QRCode from "qrcode";
+import { LruCache, registerCacheStats } from "@/lib/lruCache";
+
+// Encoded once per URL; an entry is a few KB of data URL
+const qrCodes = new LruCache<string, string>({
+  maxEntries: 2000,
+  ttlMs: 24 * 60 * 60 * 1000,
+});
+
+// Press image bytes as data URLs, so renders skip the download
+const pressImages = new LruCache<string, string>({
+  maxEntries: 300,
+  maxBytes: 48 * 1024 * 1024,
+  ttlMs: 60 * 60 * 1000,
+  sizeOf: (dataUrl) => dataUrl.length,
+});
+
+// Originals above this are left to the renderer to fetch rather than cached
+const MAX_CACHED_IMAGE_BYTES = 4 * 1024 * 1024;
+const IMAGE_FETCH_TIMEOUT_MS = 10000;
+
+// Formats the PDF renderer can embed
+const EMBEDDABLE_TYPES = new Set(["image/jpeg", "image/png"]);
+
+registerCacheStats("pdfQrCodes", () => qrCodes.stats());
+registerCacheStats("pdfImages", () => pressImages.stats());
+
+// Concurrent renders of the same asset share one fetch/encode
+const inFlight = new Map<string, Promise<string | undefined>>();
+
+function once(key: string, load: () => Promise<string | undefined>): Promise<string | undefined> {
+  const pending = inFlight.get(key);
+  if (pending) return pending;
+
+  const promise = load().finally(() => inFlight.delete(key));
+  inFlight.set(key, promise);
+  return promise;
+}
+
+/**
+ * QR code for a URL as a PNG data URL, memoized per URL
+ */
+export async function getQrCodeDataUrl(url: string): Promise<string | undefined> {
+  const cached = qrCodes.get(url);
+  if (cached) return cached;
+
+  return once(`qr:${url}`, async () => {
+    try {
+      const dataUrl = await QRCode.toDataURL(url, {
+        width: 120,
+        margin: 1,
+        color: { dark: "#10b981", light: "#00000000" },
+      });
+      qrCodes.set(url, dataUrl);
+      return dataUrl;
+    } catch {
+      return undefined;
+    }
+  });
+}
+
+/**
+ * Press image as a data URL for embedding. Falls back to the URL itself
+ * (the renderer fetches it) when the download fails or the image is too
+ * large or in a format worth leaving to the renderer.
+ */
+export async function getPressImageSource(url: string): Promise<string> {
+  const cached = pressImages.get(url);
+  if (cached) return cached;
+
+  const dataUrl = await once(`img:${url}`, async () => {
+    try {
+      const res = await fetch(url, { signal: AbortSignal.timeout(IMAGE_FETCH_TIMEOUT_MS) });
+      if (!res.ok) return undefined;
+
+      const contentType = (res.headers.get("content-type") || "").split(";")[0].trim();
+      if (!EMBEDDABLE_TYPES.has(contentType)) return undefined;
+
+      const bytes = Buffer.from(await res.arrayBuffer());
+      if (bytes.length > MAX_CACHED_IMAGE_BYTES) return undefined;
+
+      const encoded = `data:${contentType};base64,${bytes.toString("base64")}`;
+      pressImages.set(url, encoded);
+      return encoded;
+    } catch (error: any) {
+      console.error("[pdfAssets] Image fetch failed:", error?.message || error);
+      return undefined;
+    }
+  });
+
+  return dataUrl || url;
+}
@@ -0,0 +1,174 @@
+import "server-only";
+import { after } from "next/server";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { createLimiter } from "@/lib/concurrency";
+import { LocalJobQueue } from "@/lib/jobQueue";
+import { prerenderEpkPdf } from "@/lib/pdf/epkPdf";
+
+export type PdfRenderReason = "epk-generated" | "epk-updated";
+
+const JOBS_COLLECTION = "pdfRenderJobs";
+// A claimed job is retried by another worker run if not finished within this
+const LEASE_MS = 5 * 60 * 1000;
+const MAX_ATTEMPTS = 3;
+const RETRY_DELAY_MS = 60 * 1000;
+
+// ============================================
+// LOCAL QUEUE (default: renders in this process)
+// ============================================
+
+const localQueue = new LocalJobQueue<PdfRenderReason>(
+  "pdfPrerender",
+  async (uid) => {
+    await prerenderEpkPdf(uid);
+  },
+  { concurrency: 2 }
+);
+
+/**
+ * The in-process queue (scripts and tests can `drain()` it)
+ */
+export function getLocalPdfRenderQueue() {
+  return localQueue;
+}
+
+function usesFirestoreQueue() {
+  return process.env.PDF_RENDER_QUEUE === "firestore";
+}
+
+/**
+ * Queue a background render of the user's EPK PDF after their EPK changed.
+ * With PDF_RENDER_QUEUE=firestore the job is stored in pdfRenderJobs/{uid}
+ * for the /api/cron/pdf-prerender worker; otherwise it runs in this process,
+ * and the request keeps the instance up with `after()` until the queue is
+ * idle (CPU is throttled once a response is sent). Repeated changes to the
+ * same EPK collapse into one job. Never throws.
+ */
+export async function enqueueEpkPdfRender(uid: string, reason: PdfRenderReason): Promise<void> {
+  try {
+    if (!usesFirestoreQueue()) {
+      localQueue.enqueue(uid, reason);
+      try {
+        after(() => localQueue.drain());
+      } catch {
+        // Outside a request (scripts): callers drain the queue themselves
+      }
+      return;
+    }
+
+    const now = admin.firestore.Timestamp.now();
+    await adminDb.collection(JOBS_COLLECTION).doc(uid).set({
+      uid,
+      reason,
+      attempts: 0,
+      enqueuedAt: now,
+      availableAt: now,
+      lastError: null,
+    });
+  } catch (error: any) {
+    console.error(`[pdfPrerender] Failed to enqueue ${uid}:`, error?.message || error);
+  }
+}
+
+// ============================================
+// FIRESTORE QUEUE WORKER
+// ============================================
+
+type Claim = {
+  enqueuedAt: number;
+  attempts: number;
+};
+
+/**
+ * Lease a job to this worker run (null if another run holds it or it is gone)
+ */
+async function claimJob(ref: admin.firestore.DocumentReference): Promise<Claim | null> {
+  return adminDb.runTransaction(async (tx) => {
+    const snap = await tx.get(ref);
+    const job = snap.data();
+    const now = Date.now();
+    if (!job || !job.availableAt || job.availableAt.toMillis() > now) return null;
+
+    const attempts = (job.attempts || 0) + 1;
+    tx.update(ref, {
+      attempts,
+      availableAt: admin.firestore.Timestamp.fromMillis(now + LEASE_MS),
+    });
+    return { enqueuedAt: job.enqueuedAt?.toMillis?.() || 0, attempts };
+  });
+}
+
+/**
+ * Finish a job; if the EPK changed again while it ran, leave the new job queued
+ */
+async function settleJob(ref: admin.firestore.DocumentReference, claim: Claim, error?: any) {
+  await adminDb.runTransaction(async (tx) => {
+    const snap = await tx.get(ref);
+    const job = snap.data();
+    if (!job || (job.enqueuedAt?.toMillis?.() || 0) !== claim.enqueuedAt) return;
+
+    if (!error) {
+      tx.delete(ref);
+    } else if (claim.attempts >= MAX_ATTEMPTS) {
+      tx.update(ref, {
+        availableAt: null,
+        failedAt: admin.firestore.FieldValue.serverTimestamp(),
+        lastError: String(error?.message || error),
+      });
+    } else {
+      tx.update(ref, {
+        availableAt: admin.firestore.Timestamp.fromMillis(Date.now() + RETRY_DELAY_MS * 2 ** (claim.attempts - 1)),
+        lastError: String(error?.message || error),
+      });
+    }
+  });
+}
+
+export type PrerenderRunResults = {
+  claimed: number;
+  rendered: number;
+  fresh: number;
+  skipped: number;
+  failed: number;
+  errors: string[];
+};
+
+/**
+ * Run due jobs from pdfRenderJobs (called by the worker route)
+ */
+export async function processQueuedPdfRenders(maxJobs: number, concurrency: number = 2): Promise<PrerenderRunResults> {
+  const results: PrerenderRunResults = { claimed: 0, rendered: 0, fresh: 0, skipped: 0, failed: 0, errors: [] };
+
+  const due = await adminDb
+    .collection(JOBS_COLLECTION)
+    .where("availableAt", "<=", admin.firestore.Timestamp.now())
+    .orderBy("availableAt")
+    .limit(maxJobs)
+    .get();
+
+  const limit = createLimiter(concurrency);
+  await Promise.all(
+    due.docs.map((doc) =>
+      limit(async () => {
+        const claim = await claimJob(doc.ref);
+        if (!claim) return;
+        results.claimed++;
+
+        try {
+          const outcome = await prerenderEpkPdf(doc.id);
+          if (outcome === "rendered") results.rendered++;
+          else if (outcome === "fresh") results.fresh++;
+          else results.skipped++;
+          await settleJob(doc.ref, claim);
+        } catch (error: any) {
+          results.failed++;
+          results.errors.push(`${doc.id}: ${error?.message || error}`);
+          await settleJob(doc.ref, claim, error);
+        }
+      })
+    )
+  );
+
+  return results;
+}
@@ -1,13 +1,160 @@
-type Bucket = {
-  count: number;
+export type RateLimitResult = {
+  allowed: boolean;
+  remaining: number;
   resetAt: number;
 };
 
-const buckets = new Map<string, Bucket>();
+/**
+ * Rate limit state for one key (GCRA): the theoretical arrival time, i.e.
+ * when the key will have its full allowance again.
+ */
+export type LimitState = {
+  tat: number;
+  windowMs: number;
+};
+
+/**
+ * Backend that holds rate limit state.
+ * `hit` must apply `applyRateLimit` atomically for the key.
+ */
+export interface RateLimitStore {
+  hit(key: string, maxRequests: number, windowMs: number, now: number): Promise<RateLimitResult>;
+}
 
 // Default values
 const DEFAULT_MAX_REQUESTS = 10;
 const DEFAULT_WINDOW_MS = 60 * 60 * 1000; // 1 hour
+// Absorbs float error from windowMs / maxRequests (ms)
+const TAT_TOLERANCE_MS = 1e-6;
+
+/**
+ * Generic cell rate algorithm (pure, shared by every store).
+ * Each allowed hit pushes the key's theoretical arrival time one interval
+ * (windowMs / maxRequests) ahead; a hit is denied while that would put it
+ * more than windowMs past now. A key gets a burst of maxRequests, then one
+ * hit per interval; with maxRequests = 1 that is one hit per windowMs
+ * counted from the last allowed hit, wherever calendar windows fall.
+ * Returns the result and the state to persist.
+ */
+export function applyRateLimit(
+  state: LimitState | null | undefined,
+  maxRequests: number,
+  windowMs: number,
+  now: number
+): { result: RateLimitResult; state: LimitState } {
+  const interval = windowMs / maxRequests;
+  // State written for another window (or in an older format) starts fresh
+  const tat =
+    state && state.windowMs === windowMs && typeof state.tat === "number" ? Math.max(state.tat, now) : now;
+  const nextTat = tat + interval;
+
+  if (nextTat - now > windowMs + TAT_TOLERANCE_MS) {
+    return {
+      result: { allowed: false, remaining: 0, resetAt: nextTat - windowMs },
+      state: { tat, windowMs },
+    };
+  }
+
+  return {
+    result: {
+      allowed: true,
+      remaining: Math.max(0, Math.floor((windowMs - (nextTat - now) + TAT_TOLERANCE_MS) / interval)),
+      resetAt: nextTat,
+    },
+    state: { tat: nextTat, windowMs },
+  };
+}
+
+/**
+ * When a key's state no longer affects any decision (its allowance is full again)
+ */
+export function limitExpiresAt(state: LimitState): number {
+  return state.tat;
+}
+
+// Sweep expired keys at most this often
+const SWEEP_INTERVAL_MS = 60 * 1000;
+// Hard cap on tracked keys; the least recently used keys are evicted first
+const MAX_MEMORY_KEYS = 50_000;
+
+/**
+ * Process-local store (default). Expired keys are swept lazily and the map
+ * is capped at MAX_MEMORY_KEYS, so IP churn cannot grow it without bound.
+ */
+export class MemoryRateLimitStore implements RateLimitStore {
+  private limits = new Map<string, LimitState>();
+  private lastSweepAt = 0;
+
+  constructor(private maxKeys: number = MAX_MEMORY_KEYS) {}
+
+  async hit(key: string, maxRequests: number, windowMs: number, now: number) {
+    return this.hitSync(key, maxRequests, windowMs, now);
+  }
+
+  hitSync(key: string, maxRequests: number, windowMs: number, now: number): RateLimitResult {
+    if (now - this.lastSweepAt >= SWEEP_INTERVAL_MS) {
+      this.sweep(now);
+    }
+
+    const { result, state } = applyRateLimit(this.limits.get(key), maxRequests, windowMs, now);
+    // Re-insert so Map iteration order tracks recency for LRU eviction
+    this.limits.delete(key);
+    this.limits.set(key, state);
+
+    while (this.limits.size > this.maxKeys) {
+      const oldest = this.limits.keys().next().value;
+      if (oldest === undefined) break;
+      this.limits.delete(oldest);
+    }
+
+    return result;
+  }
+
+  sweep(now: number = Date.now()): number {
+    this.lastSweepAt = now;
+    let cleaned = 0;
+    for (const [key, state] of this.limits) {
+      if (limitExpiresAt(state) <= now) {
+        this.limits.delete(key);
+        cleaned++;
+      }
+    }
+    return cleaned;
+  }
+
+  get size() {
+    return this.limits.size;
+  }
+}
+
+const memoryStore = new MemoryRateLimitStore();
+let configuredStore: RateLimitStore | null = null;
+let storeLoading: Promise<RateLimitStore> | null = null;
+
+/**
+ * Override the rate limit backend (e.g. a shared store in tests or scripts)
+ */
+export function setRateLimitStore(store: RateLimitStore | null) {
+  configuredStore = store;
+  storeLoading = null;
+}
+
+/**
+ * Backend selected by RATE_LIMIT_STORE: "firestore" shares limits across
+ * instances, anything else keeps the in-memory store.
+ */
+async function getStore(): Promise<RateLimitStore> {
+  if (configuredStore) return configuredStore;
+  if (process.env.RATE_LIMIT_STORE !== "firestore") return memoryStore;
+
+  if (!storeLoading) {
+    storeLoading = import("@/lib/firestore/rateLimitStore").then(({ FirestoreRateLimitStore }) => {
+      configuredStore = new FirestoreRateLimitStore();
+      return configuredStore;
+    });
+  }
+  return storeLoading;
+}
 
 /**
  * Rate limit by key with configurable limits
@@ -15,27 +162,20 @@ const DEFAULT_WINDOW_MS = 60 * 60 * 1000; // 1 hour
  * @param maxRequests - Maximum requests allowed in window (default: 10)
  * @param windowMs - Time window in milliseconds (default: 1 hour)
  */
-export function rateLimit(
+export async function rateLimit(
   key: string,
   maxRequests: number = DEFAULT_MAX_REQUESTS,
   windowMs: number = DEFAULT_WINDOW_MS
-) {
+): Promise<RateLimitResult> {
   const now = Date.now();
-  const bucket = buckets.get(key);
-
-  if (!bucket || bucket.resetAt < now) {
-    const resetAt = now + windowMs;
-    buckets.set(key, { count: 1, resetAt });
-    return { allowed: true, remaining: maxRequests - 1, resetAt };
-  }
-
-  if (bucket.count >= maxRequests) {
-    return { allowed: false, remaining: 0, resetAt: bucket.resetAt };
+  try {
+    const store = await getStore();
+    return await store.hit(key, maxRequests, windowMs, now);
+  } catch (error: any) {
+    // A shared-store outage should not take the API down: fall back to this instance's limits
+    console.error("[rateLimit] Store unavailable, using in-memory limits:", error?.message || error);
+    return memoryStore.hitSync(key, maxRequests, windowMs, now);
   }
-
-  bucket.count += 1;
-  buckets.set(key, bucket);
-  return { allowed: true, remaining: maxRequests - bucket.count, resetAt: bucket.resetAt };
 }
 
 /**
@@ -50,16 +190,8 @@ export function getRequestIp(req: Request): string {
 }
 
 /**
- * Clean up expired buckets (call periodically if needed)
+ * Clean up expired in-memory keys (also runs automatically on use)
  */
 export function cleanupExpiredBuckets(): number {
-  const now = Date.now();
-  let cleaned = 0;
-  for (const [key, bucket] of buckets) {
-    if (bucket.resetAt < now) {
-      buckets.delete(key);
-      cleaned++;
-    }
-  }
-  return cleaned;
+  return memoryStore.sweep();
 }
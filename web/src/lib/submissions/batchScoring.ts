@@ -0,0 +1,101 @@
+import {
+  MAX_GENRE_SCORE,
+  TopK,
+  genrePoints,
+  labelBaseScore,
+  type RecommendableLabel,
+  type ScoredLabel,
+} from "@/lib/submissions/labelIndex";
+
+export type ArtistInput = {
+  id: string;
+  genres: string[];
+  styleDescription?: string;
+};
+
+/**
+ * Scores many artists against the whole label catalog in one pass
+ * (e.g. nightly recommendation precompute), producing the same scores and
+ * order as calculateMatchScore plus a full sort.
+ *
+ * The catalog is compiled once into flat typed arrays: a sparse label x genre
+ * matrix (CSR: each label's genre columns, duplicates kept) and a vector of
+ * genre-independent base scores. Per artist, points are computed once per
+ * catalog genre, then each label's score is a sum over its row.
+ */
+export function createBatchScorer(labels: RecommendableLabel[]) {
+  // Catalog order (document ID) breaks ties, as in the per-request scorer
+  const catalog = [...labels].sort((a, b) => (a.id < b.id ? -1 : a.id > b.id ? 1 : 0));
+
+  const vocabulary = new Map<string, number>();
+  const rowStart = new Int32Array(catalog.length + 1);
+  const columns: number[] = [];
+  const baseScores = new Int16Array(catalog.length);
+
+  catalog.forEach((label, row) => {
+    rowStart[row] = columns.length;
+    for (const genre of label.genres) {
+      const key = genre.toLowerCase();
+      let column = vocabulary.get(key);
+      if (column === undefined) {
+        column = vocabulary.size;
+        vocabulary.set(key, column);
+      }
+      columns.push(column);
+    }
+    baseScores[row] = labelBaseScore(label);
+  });
+  rowStart[catalog.length] = columns.length;
+
+  const genreColumns = Int32Array.from(columns);
+  const genres = [...vocabulary.keys()];
+  const points = new Int32Array(genres.length);
+  const scores = new Int16Array(catalog.length);
+
+  const ranksAbove = (a: number, b: number) => scores[a] > scores[b] || (scores[a] === scores[b] && a < b);
+
+  /**
+   * Best `limit` labels for one artist, highest score first (scores of 0 are left out)
+   */
+  function scoreArtist(artistGenres: string[], styleDescription: string, limit: number): ScoredLabel[] {
+    const userGenresLower = artistGenres.map((g) => g.toLowerCase());
+    const styleLower = styleDescription.toLowerCase();
+
+    for (let column = 0; column < genres.length; column++) {
+      points[column] = genrePoints(genres[column], userGenresLower, styleLower);
+    }
+
+    const top = new TopK<number>(limit, ranksAbove);
+    for (let row = 0; row < catalog.length; row++) {
+      let genreScore = 0;
+      for (let i = rowStart[row]; i < rowStart[row + 1]; i++) {
+        genreScore += points[genreColumns[i]];
+      }
+      const score = Math.min(Math.min(genreScore, MAX_GENRE_SCORE) + baseScores[row], 100);
+      scores[row] = score;
+      if (score > 0) top.push(row);
+    }
+
+    return top.toSortedArray().map((row) => ({ ...catalog[row], matchScore: scores[row] }));
+  }
+
+  /**
+   * Top `limit` labels for every artist, keyed by artist ID
+   */
+  function scoreArtists(artists: ArtistInput[], limit: number): Map<string, ScoredLabel[]> {
+    const results = new Map<string, ScoredLabel[]>();
+    for (const artist of artists) {
+      results.set(artist.id, scoreArtist(artist.genres, artist.styleDescription || "", limit));
+    }
+    return results;
+  }
+
+  return {
+    size: catalog.length,
+    genreCount: genres.length,
+    scoreArtist,
+    scoreArtists,
+  };
+}
+
+export type BatchScorer = ReturnType<typeof createBatchScorer>;
@@ -0,0 +1,288 @@
+import "server-only";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { createLimiter } from "@/lib/concurrency";
+import { trackServerEvent } from "@/lib/analytics/serverTracking";
+import { sendBatchTransactionalEmails, type BatchEmailMessage } from "@/services/email/postmark";
+import type { ArtistPitch, Label } from "@/lib/submissions";
+import {
+  createCampaign,
+  createPendingSubmissionLogs,
+  getArtistPitch,
+  releaseSubmissions,
+  reserveSubmissions,
+  settleSubmissionLogs,
+  updateCampaign,
+  type SubmissionReservation,
+} from "@/lib/submissions/queries";
+import { buildSubmissionEmail, type PitchType } from "@/lib/submissions/submissionEmail";
+
+// Labels per campaign (one pending log each, created in a single batch)
+export const MAX_CAMPAIGN_LABELS = 100;
+// Emails per Postmark batch call; small so status streams back as chunks finish
+const SEND_CHUNK_SIZE = 10;
+const SEND_CONCURRENCY = 3;
+
+export type CampaignSender = {
+  uid: string;
+  tier: string;
+  status: string;
+};
+
+export type CampaignRequest = {
+  labelIds: string[];
+  pitchType?: PitchType;
+  customMessage?: string;
+  name?: string;
+};
+
+export type CampaignLabelStatus = {
+  labelId: string;
+  labelName?: string;
+  status: "sent" | "failed" | "skipped";
+  reason?: "not_found" | "not_email" | "limit_reached";
+  submissionId?: string;
+  messageId?: string;
+  error?: string;
+};
+
+export type CampaignSummary = {
+  campaignId: string;
+  sent: number;
+  failed: number;
+  skipped: number;
+  remaining: number;
+  limit: number;
+};
+
+type QueuedSend = {
+  label: Label;
+  reservation: SubmissionReservation;
+  message: BatchEmailMessage;
+};
+
+/**
+ * A prepared campaign: labels fetched, quota reserved and pending logs
+ * written. `skipped` are the labels that will not be sent to.
+ */
+export type CampaignPlan = {
+  sender: CampaignSender;
+  campaignId: string;
+  pitchType: PitchType;
+  queued: QueuedSend[];
+  skipped: CampaignLabelStatus[];
+  remaining: number;
+  limit: number;
+};
+
+/**
+ * Do the once-per-campaign work for a multi-label send: read the pitch and
+ * every label (one getAll), reserve quota for all email labels in one
+ * transaction and create the campaign with its pending logs. Returns an
+ * error (with an HTTP status) when nothing can be sent.
+ */
+export async function prepareCampaign(
+  sender: CampaignSender,
+  request: CampaignRequest
+): Promise<CampaignPlan | { error: string; status: number; remaining?: number; limit?: number }> {
+  const labelIds = Array.from(new Set(request.labelIds.filter((id) => typeof id === "string" && id)));
+  if (labelIds.length === 0) {
+    return { error: "At least one label ID required", status: 400 };
+  }
+  if (labelIds.length > MAX_CAMPAIGN_LABELS) {
+    return { error: `A campaign can include at most ${MAX_CAMPAIGN_LABELS} labels`, status: 400 };
+  }
+  const pitchType: PitchType = request.pitchType === "short" || request.pitchType === "long" ? request.pitchType : "medium";
+
+  const [pitch, labelDocs] = await Promise.all([
+    getArtistPitch(sender.uid),
+    adminDb.getAll(...labelIds.map((id) => adminDb.collection("labels").doc(id))),
+  ]);
+  if (!pitch) {
+    return { error: "Please generate your pitch first", status: 400 };
+  }
+
+  const skipped: CampaignLabelStatus[] = [];
+  const eligible: Label[] = [];
+  for (const doc of labelDocs) {
+    if (!doc.exists) {
+      skipped.push({ labelId: doc.id, status: "skipped", reason: "not_found" });
+      continue;
+    }
+    const label = { id: doc.id, ...doc.data() } as Label;
+    if (label.submissionMethod !== "email" || !label.submissionEmail) {
+      skipped.push({ labelId: label.id, labelName: label.name, status: "skipped", reason: "not_email" });
+      continue;
+    }
+    eligible.push(label);
+  }
+  if (eligible.length === 0) {
+    return { error: "None of these labels accept email submissions", status: 400 };
+  }
+
+  // Labels past the monthly limit are skipped, in the order given
+  const quota = await reserveSubmissions(sender.uid, sender.tier, sender.status, eligible.length);
+  if (quota.reservations.length === 0) {
+    return {
+      error: `Monthly submission limit reached (${quota.limit}/${quota.limit}). Upgrade your tier for more submissions.`,
+      status: 429,
+      remaining: 0,
+      limit: quota.limit,
+    };
+  }
+  for (const label of eligible.slice(quota.reservations.length)) {
+    skipped.push({ labelId: label.id, labelName: label.name, status: "skipped", reason: "limit_reached" });
+  }
+
+  try {
+    const queued = eligible.slice(0, quota.reservations.length).map((label, i) => ({
+      label,
+      reservation: quota.reservations[i],
+      message: campaignMessage(sender, label, pitch, pitchType, request.customMessage, quota.reservations[i]),
+    }));
+
+    const campaignId = await createCampaign({
+      userId: sender.uid,
+      name: request.name?.trim() || `Campaign ${new Date().toISOString().slice(0, 10)}`,
+      status: "active",
+      labelIds,
+      totalLabels: labelIds.length,
+      submitted: 0,
+      delivered: 0,
+      opened: 0,
+      replied: 0,
+      failed: 0,
+      pitchVersion: pitchType,
+      trackUrl: pitch.trackUrl,
+      startedAt: new Date(),
+    });
+
+    await createPendingSubmissionLogs(
+      queued.map(({ label, reservation }) => ({
+        reservation,
+        submission: {
+          userId: sender.uid,
+          campaignId,
+          labelId: label.id,
+          labelName: label.name,
+          method: "email",
+          sentTo: label.submissionEmail,
+          sentFrom: pitch.contactEmail,
+          subject: pitch.subjectLine,
+          pitchUsed: pitchType,
+        },
+      }))
+    );
+
+    return { sender, campaignId, pitchType, queued, skipped, remaining: quota.remaining, limit: quota.limit };
+  } catch (error) {
+    await releaseSubmissions(sender.uid, quota.reservations).catch(() => {});
+    throw error;
+  }
+}
+
+function campaignMessage(
+  sender: CampaignSender,
+  label: Label,
+  pitch: ArtistPitch,
+  pitchType: PitchType,
+  customMessage: string | undefined,
+  reservation: SubmissionReservation
+): BatchEmailMessage {
+  const email = buildSubmissionEmail(label, pitch, pitchType, customMessage);
+  return {
+    to: label.submissionEmail!,
+    subject: email.subject,
+    html: email.html,
+    text: email.text,
+    uid: sender.uid,
+    emailType: "label-submission",
+    meta: {
+      labelId: label.id,
+      labelName: label.name,
+      submissionId: reservation.submissionId,
+    },
+  };
+}
+
+/**
+ * Send a prepared campaign through the Postmark batch API, a few chunks at
+ * a time. Each chunk's logs and quota slots are settled in one batch, then
+ * `onStatus` is called for each of its labels.
+ */
+export async function runCampaign(
+  plan: CampaignPlan,
+  onStatus: (status: CampaignLabelStatus) => void
+): Promise<CampaignSummary> {
+  const { sender, campaignId } = plan;
+  const summary: CampaignSummary = {
+    campaignId,
+    sent: 0,
+    failed: 0,
+    skipped: plan.skipped.length,
+    remaining: plan.remaining,
+    limit: plan.limit,
+  };
+  plan.skipped.forEach(onStatus);
+
+  const chunks: QueuedSend[][] = [];
+  for (let i = 0; i < plan.queued.length; i += SEND_CHUNK_SIZE) {
+    chunks.push(plan.queued.slice(i, i + SEND_CHUNK_SIZE));
+  }
+
+  const limit = createLimiter(SEND_CONCURRENCY);
+  await Promise.all(
+    chunks.map((chunk) =>
+      limit(async () => {
+        const results = await sendBatchTransactionalEmails(chunk.map((item) => item.message));
+
+        // Pending logs that fail to settle keep their slot until it expires
+        await settleSubmissionLogs(
+          sender.uid,
+          chunk.map((item, i) => ({
+            reservation: item.reservation,
+            updates: results[i].ok
+              ? { status: "sent", postmarkMessageId: results[i].messageId }
+              : { status: "failed", notes: results[i].error || "Email send failed" },
+          }))
+        ).catch((error) => {
+          console.error(`[campaignSend] Failed to settle logs for campaign ${campaignId}:`, error?.message || error);
+        });
+
+        chunk.forEach((item, i) => {
+          const result = results[i];
+          if (result.ok) {
+            summary.sent++;
+            trackServerEvent("submission_sent", sender.uid, {
+              labelId: item.label.id,
+              labelName: item.label.name,
+              method: "email",
+              tier: sender.tier,
+              campaignId,
+            });
+          } else {
+            summary.failed++;
+            // A failed send gives its slot back
+            summary.remaining++;
+          }
+          onStatus({
+            labelId: item.label.id,
+            labelName: item.label.name,
+            status: result.ok ? "sent" : "failed",
+            submissionId: item.reservation.submissionId,
+            messageId: result.messageId,
+            error: result.ok ? undefined : result.error,
+          });
+        });
+      })
+    )
+  );
+
+  await updateCampaign(campaignId, {
+    status: "completed",
+    submitted: summary.sent,
+    failed: summary.failed,
+    completedAt: new Date(),
+  });
+
+  return summary;
+}
@@ -0,0 +1,224 @@
+import "server-only";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import {
+  isAlreadyExists,
+  labelNameEntry,
+  labelNameRef,
+  normalizeLabelName,
+} from "@/lib/submissions/labelNames";
+
+export type LabelImport = {
+  name: string;
+  genres: string[];
+  country?: string;
+  website?: string;
+  submissionUrl?: string;
+  submissionEmail?: string;
+  notes?: string;
+};
+
+export type LabelImportResults = {
+  received: number;
+  imported: number;
+  skipped: number;
+  failed: number;
+  batches: number;
+  errors: string[];
+};
+
+// Two writes per label (label + name index entry) under Firestore's 500 per batch
+const LABELS_PER_BATCH = 200;
+const DEFAULT_CONCURRENCY = 4;
+// A batch that lost a race for a name is re-checked and retried this often
+const MAX_BATCH_ATTEMPTS = 3;
+// Errors kept for the response
+const MAX_ERRORS = 50;
+
+function labelDoc(label: LabelImport) {
+  // Determine submission method
+  let submissionMethod: "email" | "webform" | "portal" | "none" = "none";
+  if (label.submissionEmail) {
+    submissionMethod = "email";
+  } else if (label.submissionUrl) {
+    submissionMethod = "webform";
+  }
+
+  return {
+    name: label.name.trim(),
+    genres: Array.isArray(label.genres) ? label.genres : [],
+    country: label.country || null,
+    website: label.website || null,
+    submissionMethod,
+    submissionEmail: label.submissionEmail || null,
+    submissionUrl: label.submissionUrl || null,
+    notes: label.notes || null,
+    confidenceScore: 80, // Admin-imported
+    addedBy: "admin",
+    isActive: true,
+    createdAt: admin.firestore.FieldValue.serverTimestamp(),
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  };
+}
+
+type PendingLabel = { label: LabelImport; normalized: string };
+
+/**
+ * Streaming label import.
+ *
+ * Labels are fed one at a time with `add()` and written in batches of 200,
+ * up to `concurrency` batches committing at once; `add()` waits when the
+ * writers fall behind, so memory stays flat however long the input is.
+ * Duplicates are skipped by normalized name, both within the import and
+ * against the labelNames index (one getAll per batch; no collection scan).
+ * Index entries are created in the same batch as their labels, so two
+ * imports racing on a name cannot both add it.
+ */
+export class LabelImporter {
+  readonly results: LabelImportResults = { received: 0, imported: 0, skipped: 0, failed: 0, batches: 0, errors: [] };
+  private seen = new Set<string>();
+  private pending: PendingLabel[] = [];
+  private inFlight = new Set<Promise<void>>();
+  private concurrency: number;
+
+  constructor(private options: { concurrency?: number; onProgress?: (results: LabelImportResults) => void } = {}) {
+    this.concurrency = Math.max(1, options.concurrency ?? DEFAULT_CONCURRENCY);
+  }
+
+  async add(input: unknown): Promise<void> {
+    this.results.received++;
+    const label = input as LabelImport;
+
+    // Skip if no name
+    if (!label || typeof label.name !== "string" || !label.name.trim()) {
+      this.results.skipped++;
+      return;
+    }
+
+    // Skip duplicates within this import
+    const normalized = normalizeLabelName(label.name);
+    if (this.seen.has(normalized)) {
+      this.results.skipped++;
+      return;
+    }
+    this.seen.add(normalized);
+
+    this.pending.push({ label, normalized });
+    if (this.pending.length >= LABELS_PER_BATCH) {
+      await this.dispatch();
+    }
+  }
+
+  /**
+   * Record an input that could not be parsed
+   */
+  reject(error: string) {
+    this.results.received++;
+    this.results.failed++;
+    this.noteError(error);
+  }
+
+  /**
+   * Commit what is left and wait for every batch
+   */
+  async finish(): Promise<LabelImportResults> {
+    if (this.pending.length > 0) await this.dispatch();
+    await Promise.all(this.inFlight);
+    return this.results;
+  }
+
+  private async dispatch() {
+    const chunk = this.pending;
+    this.pending = [];
+
+    const task: Promise<void> = this.commit(chunk).finally(() => {
+      this.inFlight.delete(task);
+    });
+    this.inFlight.add(task);
+
+    // Backpressure: stop reading input until a writer is free
+    while (this.inFlight.size >= this.concurrency) {
+      await Promise.race(this.inFlight);
+    }
+  }
+
+  private async commit(chunk: PendingLabel[]) {
+    let remaining = chunk;
+    try {
+      for (let attempt = 1; remaining.length > 0; attempt++) {
+        // Skip names that already have an index entry
+        const entries = await adminDb.getAll(...remaining.map((item) => labelNameRef(item.normalized)));
+        const fresh = remaining.filter((_, i) => !entries[i].exists);
+        this.results.skipped += remaining.length - fresh.length;
+        remaining = fresh;
+        if (fresh.length === 0) break;
+
+        const batch = adminDb.batch();
+        for (const item of fresh) {
+          const labelRef = adminDb.collection("labels").doc();
+          batch.create(labelNameRef(item.normalized), labelNameEntry(labelRef.id, item.label.name.trim()));
+          batch.set(labelRef, labelDoc(item.label));
+        }
+
+        try {
+          await batch.commit();
+          this.results.imported += fresh.length;
+          break;
+        } catch (error) {
+          // Another writer claimed one of the names first: re-check and retry
+          if (!isAlreadyExists(error) || attempt >= MAX_BATCH_ATTEMPTS) throw error;
+        }
+      }
+    } catch (error: any) {
+      this.results.failed += remaining.length;
+      this.noteError(`Batch of ${remaining.length} failed: ${error?.message || error}`);
+    }
+
+    this.results.batches++;
+    this.options.onProgress?.(this.results);
+  }
+
+  private noteError(error: string) {
+    if (this.results.errors.length < MAX_ERRORS) this.results.errors.push(error);
+  }
+}
+
+/**
+ * Parse an NDJSON stream (one label object per line) as it arrives
+ */
+export async function* readNdjson(
+  body: ReadableStream<Uint8Array>
+): AsyncGenerator<{ line: number; value?: unknown; error?: string }> {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  let line = 0;
+
+  function* parseLines(text: string) {
+    for (const raw of text.split("\n")) {
+      line++;
+      const trimmed = raw.trim();
+      if (!trimmed) continue;
+      try {
+        yield { line, value: JSON.parse(trimmed) as unknown };
+      } catch {
+        yield { line, error: `Line ${line}: invalid JSON` };
+      }
+    }
+  }
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+
+    const lastNewline = buffered.lastIndexOf("\n");
+    if (lastNewline === -1) continue;
+    const complete = buffered.slice(0, lastNewline);
+    buffered = buffered.slice(lastNewline + 1);
+    yield* parseLines(complete);
+  }
+
+  buffered += decoder.decode();
+  if (buffered.trim()) yield* parseLines(buffered);
+}
@@ -0,0 +1,388 @@
+import "server-only";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+
+export type RecommendableLabel = {
+  id: string;
+  name: string;
+  genres: string[];
+  submissionMethod: string;
+  submissionEmail?: string;
+  submissionUrl?: string;
+  website?: string;
+  country?: string;
+  tier?: string;
+  notes?: string;
+};
+
+export type ScoredLabel = RecommendableLabel & { matchScore: number };
+
+// ============================================
+// MATCH SCORING
+// ============================================
+
+// Genre points are capped so tier/method/notes still separate strong genre matches
+export const MAX_GENRE_SCORE = 60;
+
+/**
+ * Points one label genre earns against a user's genres (both lowercased).
+ * Per user genre: exact match 20, partial match (e.g. "deep house" / "house")
+ * 10, otherwise 5 if the style description mentions the label genre.
+ */
+export function genrePoints(labelGenre: string, userGenres: string[], styleLower: string): number {
+  let points = 0;
+  for (const userGenre of userGenres) {
+    if (userGenre === labelGenre) {
+      points += 20;
+    } else if (userGenre.includes(labelGenre) || labelGenre.includes(userGenre)) {
+      points += 10;
+    } else if (styleLower.includes(labelGenre)) {
+      points += 5;
+    }
+  }
+  return points;
+}
+
+/**
+ * The genre-independent part of a label's score (up to 40 points)
+ */
+export function labelBaseScore(label: Pick<RecommendableLabel, "tier" | "submissionEmail" | "submissionUrl" | "notes">): number {
+  let score = 0;
+
+  // Tier bonus (up to 20 points)
+  if (label.tier) {
+    const tierLower = label.tier.toLowerCase();
+    if (tierLower.includes("indie") || tierLower.includes("boutique")) {
+      score += 20; // More likely to accept new artists
+    } else if (tierLower.includes("mid")) {
+      score += 15;
+    } else if (tierLower.includes("major")) {
+      score += 10;
+    }
+  } else {
+    score += 15; // Default mid-tier assumption
+  }
+
+  // Submission method bonus (up to 10 points)
+  if (label.submissionEmail) {
+    score += 10; // Email submissions are easier
+  } else if (label.submissionUrl) {
+    score += 5; // Webform available
+  }
+
+  // Active accepting demos (up to 10 points)
+  const notesLower = label.notes?.toLowerCase();
+  if (notesLower?.includes("accepting") || notesLower?.includes("open for")) {
+    score += 10;
+  }
+
+  return score;
+}
+
+/**
+ * Score one label for a user (0-100)
+ */
+export function calculateMatchScore(label: RecommendableLabel, userGenres: string[], styleDescription: string): number {
+  const userGenresLower = userGenres.map((g) => g.toLowerCase());
+  const styleLower = styleDescription.toLowerCase();
+
+  let genreScore = 0;
+  for (const labelGenre of label.genres) {
+    genreScore += genrePoints(labelGenre.toLowerCase(), userGenresLower, styleLower);
+  }
+
+  return Math.min(Math.min(genreScore, MAX_GENRE_SCORE) + labelBaseScore(label), 100);
+}
+
+// ============================================
+// TOP-K SELECTION
+// ============================================
+
+/**
+ * Keeps the best `k` items seen so far in a min-heap, so selecting the top
+ * matches costs O(n log k) instead of sorting every scored label.
+ * `better(a, b)` returns true when a ranks above b.
+ */
+export class TopK<T> {
+  private heap: T[] = [];
+
+  constructor(private k: number, private better: (a: T, b: T) => boolean) {}
+
+  get size() {
+    return this.heap.length;
+  }
+
+  /**
+   * The item that would be dropped next (the worst one kept)
+   */
+  peekWorst(): T | undefined {
+    return this.heap[0];
+  }
+
+  push(item: T) {
+    if (this.k <= 0) return;
+    if (this.heap.length < this.k) {
+      this.heap.push(item);
+      this.siftUp(this.heap.length - 1);
+    } else if (this.better(item, this.heap[0])) {
+      this.heap[0] = item;
+      this.siftDown(0);
+    }
+  }
+
+  /**
+   * Kept items, best first
+   */
+  toSortedArray(): T[] {
+    return [...this.heap].sort((a, b) => (this.better(a, b) ? -1 : this.better(b, a) ? 1 : 0));
+  }
+
+  private siftUp(i: number) {
+    const heap = this.heap;
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (!this.better(heap[parent], heap[i])) break;
+      [heap[parent], heap[i]] = [heap[i], heap[parent]];
+      i = parent;
+    }
+  }
+
+  private siftDown(i: number) {
+    const heap = this.heap;
+    for (;;) {
+      const left = 2 * i + 1;
+      const right = left + 1;
+      let worst = i;
+      if (left < heap.length && this.better(heap[worst], heap[left])) worst = left;
+      if (right < heap.length && this.better(heap[worst], heap[right])) worst = right;
+      if (worst === i) break;
+      [heap[worst], heap[i]] = [heap[i], heap[worst]];
+      i = worst;
+    }
+  }
+}
+
+// Higher score first; ties keep the catalog's document ID order
+function ranksAbove(a: ScoredLabel, b: ScoredLabel) {
+  return a.matchScore > b.matchScore || (a.matchScore === b.matchScore && a.id < b.id);
+}
+
+// ============================================
+// LABEL INDEX
+// ============================================
+
+type IndexedLabel = {
+  label: RecommendableLabel;
+  genresLower: string[];
+  baseScore: number;
+};
+
+/**
+ * In-memory label catalog indexed by lowercased genre.
+ *
+ * A label's score is its genre points (capped) plus a genre-independent base
+ * score. Genre points are computed once per distinct catalog genre, which is
+ * a small vocabulary, and only labels filed under a genre that earned points
+ * are scored in full. Every other label scores exactly its base score, so the
+ * best of them come straight off a list pre-sorted by base score.
+ */
+export class LabelIndex {
+  private labels = new Map<string, IndexedLabel>();
+  private byGenre = new Map<string, Set<string>>();
+  private byBaseScore: IndexedLabel[] | null = null;
+
+  get size() {
+    return this.labels.size;
+  }
+
+  /**
+   * Every indexed label (e.g. to compile a batch scorer)
+   */
+  all(): RecommendableLabel[] {
+    return [...this.labels.values()].map((entry) => entry.label);
+  }
+
+  upsert(label: RecommendableLabel) {
+    this.remove(label.id);
+
+    const genresLower = label.genres.map((g) => g.toLowerCase());
+    const entry: IndexedLabel = { label, genresLower, baseScore: labelBaseScore(label) };
+    this.labels.set(label.id, entry);
+
+    for (const genre of genresLower) {
+      let ids = this.byGenre.get(genre);
+      if (!ids) {
+        ids = new Set();
+        this.byGenre.set(genre, ids);
+      }
+      ids.add(label.id);
+    }
+    this.byBaseScore = null;
+  }
+
+  remove(labelId: string) {
+    const entry = this.labels.get(labelId);
+    if (!entry) return;
+
+    this.labels.delete(labelId);
+    for (const genre of entry.genresLower) {
+      const ids = this.byGenre.get(genre);
+      if (!ids) continue;
+      ids.delete(labelId);
+      if (ids.size === 0) this.byGenre.delete(genre);
+    }
+    this.byBaseScore = null;
+  }
+
+  /**
+   * Best `limit` labels for a user, highest score first (scores of 0 are left out)
+   */
+  topMatches(userGenres: string[], styleDescription: string, limit: number): ScoredLabel[] {
+    const userGenresLower = userGenres.map((g) => g.toLowerCase());
+    const styleLower = styleDescription.toLowerCase();
+    const top = new TopK<ScoredLabel>(limit, ranksAbove);
+
+    // Points per catalog genre, and the labels filed under a genre that earned any
+    const points = new Map<string, number>();
+    const candidates = new Set<string>();
+    for (const [genre, ids] of this.byGenre) {
+      const p = genrePoints(genre, userGenresLower, styleLower);
+      if (p === 0) continue;
+      points.set(genre, p);
+      for (const id of ids) candidates.add(id);
+    }
+
+    for (const id of candidates) {
+      const entry = this.labels.get(id)!;
+      let genreScore = 0;
+      for (const genre of entry.genresLower) {
+        genreScore += points.get(genre) || 0;
+      }
+      const matchScore = Math.min(Math.min(genreScore, MAX_GENRE_SCORE) + entry.baseScore, 100);
+      if (matchScore > 0) top.push({ ...entry.label, matchScore });
+    }
+
+    // Non-candidates score their base score; the list is already in rank order
+    let taken = 0;
+    for (const entry of this.sortedByBaseScore()) {
+      if (taken >= limit || entry.baseScore === 0) break;
+      if (candidates.has(entry.label.id)) continue;
+      top.push({ ...entry.label, matchScore: Math.min(entry.baseScore, 100) });
+      taken++;
+    }
+
+    return top.toSortedArray();
+  }
+
+  private sortedByBaseScore(): IndexedLabel[] {
+    if (!this.byBaseScore) {
+      this.byBaseScore = [...this.labels.values()].sort(
+        (a, b) => b.baseScore - a.baseScore || (a.label.id < b.label.id ? -1 : a.label.id > b.label.id ? 1 : 0)
+      );
+    }
+    return this.byBaseScore;
+  }
+}
+
+// ============================================
+// PROCESS-LEVEL INDEX (refreshed from Firestore)
+// ============================================
+
+// Check Firestore for changed labels at most this often
+const REFRESH_INTERVAL_MS = 30 * 1000;
+// Rebuild from scratch periodically to drop deleted labels
+const FULL_REBUILD_INTERVAL_MS = 30 * 60 * 1000;
+// Re-read a little before the last seen change, in case writes commit out of order
+const REFRESH_OVERLAP_MS = 5 * 1000;
+
+export function labelFromDoc(id: string, data: Record<string, any>): RecommendableLabel {
+  return {
+    id,
+    name: data.name,
+    genres: Array.isArray(data.genres) ? data.genres.filter((g: unknown) => typeof g === "string") : [],
+    submissionMethod: data.submissionMethod || "unknown",
+    submissionEmail: data.submissionEmail,
+    submissionUrl: data.submissionUrl,
+    website: data.website,
+    country: data.country,
+    tier: data.tier,
+    notes: data.notes,
+  };
+}
+
+let current: {
+  index: LabelIndex;
+  builtAt: number;
+  checkedAt: number;
+  lastUpdatedAt: number;
+} | null = null;
+let refreshing: Promise<LabelIndex> | null = null;
+
+function updatedAtMillis(data: Record<string, any>): number {
+  return data.updatedAt?.toMillis?.() || 0;
+}
+
+async function buildIndex() {
+  const snapshot = await adminDb.collection("labels").get();
+  const index = new LabelIndex();
+  let lastUpdatedAt = 0;
+
+  snapshot.forEach((doc) => {
+    const data = doc.data();
+    index.upsert(labelFromDoc(doc.id, data));
+    lastUpdatedAt = Math.max(lastUpdatedAt, updatedAtMillis(data));
+  });
+
+  const now = Date.now();
+  current = { index, builtAt: now, checkedAt: now, lastUpdatedAt };
+  return index;
+}
+
+async function applyChanges() {
+  const state = current!;
+  const since = admin.firestore.Timestamp.fromMillis(Math.max(0, state.lastUpdatedAt - REFRESH_OVERLAP_MS));
+  const snapshot = await adminDb.collection("labels").where("updatedAt", ">", since).get();
+
+  snapshot.forEach((doc) => {
+    const data = doc.data();
+    state.index.upsert(labelFromDoc(doc.id, data));
+    state.lastUpdatedAt = Math.max(state.lastUpdatedAt, updatedAtMillis(data));
+  });
+  state.checkedAt = Date.now();
+  return state.index;
+}
+
+/**
+ * The shared label index, built on first use and then kept current by
+ * querying labels whose updatedAt changed since the last refresh
+ */
+export async function getLabelIndex(): Promise<LabelIndex> {
+  const now = Date.now();
+  if (current && now - current.checkedAt < REFRESH_INTERVAL_MS) {
+    return current.index;
+  }
+
+  if (!refreshing) {
+    const rebuild = !current || now - current.builtAt >= FULL_REBUILD_INTERVAL_MS;
+    refreshing = (rebuild ? buildIndex() : applyChanges()).finally(() => {
+      refreshing = null;
+    });
+  }
+
+  try {
+    return await refreshing;
+  } catch (error: any) {
+    // A failed refresh should not fail recommendations; retry on the next request
+    if (!current) throw error;
+    console.error("[labelIndex] Refresh failed, serving previous index:", error?.message || error);
+    return current.index;
+  }
+}
+
+/**
+ * Make the next getLabelIndex() call pick up label writes immediately
+ * (used after this instance changes the catalog)
+ */
+export function markLabelIndexStale() {
+  if (current) current.checkedAt = 0;
+}
@@ -0,0 +1,116 @@
+import "server-only";
+import { createHash } from "crypto";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+
+/**
+ * Normalized-name index for labels: labelNames/{hash of normalized name}
+ * holds { labelId, name }, so a duplicate check is a document read instead
+ * of a scan of the labels collection. The first label with a name owns its
+ * entry; imports skip names that already have one.
+ */
+
+export const LABEL_NAMES = "labelNames";
+
+// Firestore's code for a create() on an existing document
+const ALREADY_EXISTS = 6;
+
+/**
+ * Comparison form of a label name: case, accents, punctuation and spacing
+ * are ignored ("Ninja-Tune" and "ninja tune" are the same label)
+ */
+export function normalizeLabelName(name: string): string {
+  const lower = name.normalize("NFKD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
+  const simplified = lower.replace(/[^a-z0-9]+/g, " ").trim();
+  // Names in other scripts keep their characters
+  return simplified || lower.replace(/\s+/g, " ").trim();
+}
+
+export function labelNameRef(normalizedName: string) {
+  const id = createHash("sha1").update(normalizedName).digest("hex");
+  return adminDb.collection(LABEL_NAMES).doc(id);
+}
+
+export function labelNameEntry(labelId: string, name: string) {
+  return {
+    labelId,
+    name,
+    normalized: normalizeLabelName(name),
+    createdAt: admin.firestore.FieldValue.serverTimestamp(),
+  };
+}
+
+export function isAlreadyExists(error: any): boolean {
+  return error?.code === ALREADY_EXISTS || /already exists/i.test(error?.message || "");
+}
+
+/**
+ * Claim the index entry for a label's name (no-op if another label owns it)
+ */
+export async function claimLabelName(labelId: string, name: string): Promise<void> {
+  try {
+    await labelNameRef(normalizeLabelName(name)).create(labelNameEntry(labelId, name));
+  } catch (error) {
+    if (!isAlreadyExists(error)) throw error;
+  }
+}
+
+/**
+ * Move a label's index entry after a rename
+ */
+export async function renameLabelName(labelId: string, oldName: string | undefined, newName: string): Promise<void> {
+  if (oldName && normalizeLabelName(oldName) === normalizeLabelName(newName)) return;
+
+  if (oldName) {
+    const oldRef = labelNameRef(normalizeLabelName(oldName));
+    await adminDb.runTransaction(async (tx) => {
+      const entry = await tx.get(oldRef);
+      if (entry.exists && entry.data()?.labelId === labelId) tx.delete(oldRef);
+    });
+  }
+  await claimLabelName(labelId, newName);
+}
+
+/**
+ * Index every existing label's name (one-time setup, safe to re-run): pages
+ * through labels and adds the entries that are missing
+ */
+export async function backfillLabelNameIndex(pageSize: number = 250): Promise<{ scanned: number; indexed: number }> {
+  const results = { scanned: 0, indexed: 0 };
+  const ordered = adminDb.collection("labels").orderBy(admin.firestore.FieldPath.documentId()).limit(pageSize);
+  let last: admin.firestore.QueryDocumentSnapshot | null = null;
+
+  while (true) {
+    const page: admin.firestore.QuerySnapshot = await (last ? ordered.startAfter(last) : ordered).get();
+    if (page.empty) break;
+
+    const named = page.docs.filter((doc) => typeof doc.data().name === "string" && doc.data().name.trim());
+    const seen = new Set<string>();
+    const candidates = named.filter((doc) => {
+      const normalized = normalizeLabelName(doc.data().name);
+      if (seen.has(normalized)) return false;
+      seen.add(normalized);
+      return true;
+    });
+
+    if (candidates.length > 0) {
+      const refs = candidates.map((doc) => labelNameRef(normalizeLabelName(doc.data().name)));
+      const entries = await adminDb.getAll(...refs);
+      const batch = adminDb.batch();
+      let writes = 0;
+      entries.forEach((entry, i) => {
+        if (entry.exists) return;
+        batch.set(refs[i], labelNameEntry(candidates[i].id, candidates[i].data().name));
+        writes++;
+      });
+      if (writes > 0) await batch.commit();
+      results.indexed += writes;
+    }
+
+    results.scanned += page.size;
+    if (page.size < pageSize) break;
+    last = page.docs[page.docs.length - 1];
+  }
+
+  return results;
+}
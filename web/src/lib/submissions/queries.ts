@@ -1,7 +1,8 @@
 import "server-only";
 import { adminDb } from "@/lib/firebaseAdmin";
 import admin from "firebase-admin";
-import type { Label, SubmissionLog, SubmissionCampaign, ArtistPitch } from "@/lib/submissions";
+import { canSubmit, type Label, type SubmissionLog, type SubmissionCampaign, type ArtistPitch } from "@/lib/submissions";
+import { claimLabelName, renameLabelName } from "@/lib/submissions/labelNames";
 
 // ============================================
 // LABELS
@@ -59,6 +60,7 @@ export async function addLabel(label: Omit<Label, "id">): Promise<string> {
     createdAt: admin.firestore.FieldValue.serverTimestamp(),
     updatedAt: admin.firestore.FieldValue.serverTimestamp(),
   });
+  await claimLabelName(docRef.id, label.name);
   return docRef.id;
 }
 
@@ -69,10 +71,16 @@ export async function updateLabel(
   labelId: string,
   updates: Partial<Label>
 ): Promise<void> {
-  await adminDb.collection("labels").doc(labelId).update({
+  const labelRef = adminDb.collection("labels").doc(labelId);
+  const oldName = updates.name ? (await labelRef.get()).data()?.name : undefined;
+
+  await labelRef.update({
     ...updates,
     updatedAt: admin.firestore.FieldValue.serverTimestamp(),
   });
+  if (updates.name) {
+    await renameLabelName(labelId, oldName, updates.name);
+  }
 }
 
 /**
@@ -91,34 +99,335 @@ export async function getUserLabels(userId: string): Promise<Label[]> {
   } as Label));
 }
 
+// ============================================
+// SUBMISSION QUOTA
+// ============================================
+
+/**
+ * Monthly quota counters: submissionQuotas/{uid}_{YYYY-MM} holds `used` (logs
+ * in a counted status created that month) and `reservations` (submission IDs
+ * holding a slot while being sent, with an expiry so a crashed send frees
+ * its slot). Counters change only inside the transactions below, so the
+ * quota check is a single document read and concurrent sends cannot
+ * overshoot the limit.
+ */
+
+// Statuses that count toward the monthly limit
+const COUNTED_STATUSES = new Set(["sent", "delivered", "opened", "replied"]);
+// How long a reserved slot is held for a send in progress
+const RESERVATION_TTL_MS = 10 * 60 * 1000;
+
+export type SubmissionReservation = {
+  submissionId: string;
+  month: string;
+};
+
+export type QuotaCheck = {
+  allowed: boolean;
+  remaining: number;
+  limit: number;
+  reservation?: SubmissionReservation;
+};
+
+function quotaMonth(date: Date = new Date()): string {
+  return date.toISOString().slice(0, 7);
+}
+
+function quotaRef(userId: string, month: string) {
+  return adminDb.collection("submissionQuotas").doc(`${userId}_${month}`);
+}
+
+function activeReservations(data: Record<string, any> | undefined, now: number): Record<string, number> {
+  return Object.fromEntries(
+    Object.entries((data?.reservations || {}) as Record<string, number>).filter(([, expiresAt]) => expiresAt > now)
+  );
+}
+
+function quotaUsage(data: Record<string, any> | undefined, now: number): number {
+  return (data?.used || 0) + Object.keys(activeReservations(data, now)).length;
+}
+
+/**
+ * Logs already written in the month that use a slot (an aggregation count,
+ * not a document download)
+ */
+function countedLogsQuery(userId: string, month: string) {
+  return adminDb
+    .collection("submissionLogs")
+    .where("userId", "==", userId)
+    .where("createdAt", ">=", new Date(`${month}-01T00:00:00.000Z`))
+    .where("status", "in", Array.from(COUNTED_STATUSES))
+    .count();
+}
+
+function seededQuotaCounter(userId: string, month: string, used: number) {
+  return { userId, month, used, reservations: {} };
+}
+
+/**
+ * Make sure the month's counter exists, seeding it from the logs already
+ * written that month on first use. Returns the counter data.
+ */
+async function ensureQuotaCounter(userId: string, month: string): Promise<Record<string, any> | undefined> {
+  const ref = quotaRef(userId, month);
+  const snap = await ref.get();
+  if (snap.exists) return snap.data();
+
+  const counted = await countedLogsQuery(userId, month).get();
+  const seeded = seededQuotaCounter(userId, month, counted.data().count);
+  try {
+    await ref.create({ ...seeded, updatedAt: admin.firestore.FieldValue.serverTimestamp() });
+    return seeded;
+  } catch (error: any) {
+    // Another request seeded it first
+    if (error?.code !== 6) throw error;
+    return (await ref.get()).data();
+  }
+}
+
+/**
+ * The month's counter read inside `tx` (one point read), seeded in the same
+ * transaction on first use
+ */
+async function readQuotaCounter(
+  tx: admin.firestore.Transaction,
+  userId: string,
+  month: string
+): Promise<Record<string, any> | undefined> {
+  const ref = quotaRef(userId, month);
+  const snap = await tx.get(ref);
+  if (snap.exists) return snap.data();
+
+  const counted = await tx.get(countedLogsQuery(userId, month));
+  const seeded = seededQuotaCounter(userId, month, counted.data().count);
+  tx.create(ref, { ...seeded, updatedAt: admin.firestore.FieldValue.serverTimestamp() });
+  return seeded;
+}
+
+/**
+ * Check the user's monthly limit and reserve up to `count` slots in one
+ * transaction (fewer if the limit is closer). Each reservation's
+ * submissionId becomes the ID of its submission log.
+ */
+export async function reserveSubmissions(
+  userId: string,
+  tier: string | null | undefined,
+  status: string | null | undefined,
+  count: number
+): Promise<QuotaCheck & { reservations: SubmissionReservation[] }> {
+  const month = quotaMonth();
+  const ref = quotaRef(userId, month);
+
+  return adminDb.runTransaction(async (tx) => {
+    const now = Date.now();
+    const data = await readQuotaCounter(tx, userId, month);
+    const check = canSubmit(quotaUsage(data, now), tier, status);
+    const granted = Math.min(Math.max(0, count), check.remaining);
+    if (granted === 0) return { ...check, reservations: [] };
+
+    const reservations = Array.from({ length: granted }, () => ({
+      submissionId: adminDb.collection("submissionLogs").doc().id,
+      month,
+    }));
+    tx.update(ref, {
+      // Expired reservations are dropped as new ones are added
+      reservations: {
+        ...activeReservations(data, now),
+        ...Object.fromEntries(reservations.map((r) => [r.submissionId, now + RESERVATION_TTL_MS])),
+      },
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+    return { ...check, remaining: check.remaining - granted, reservations };
+  });
+}
+
+/**
+ * Check the user's monthly limit and, if a slot is free, reserve it for one
+ * submission. Pass `reservation` to createSubmissionLog (which uses its
+ * submissionId); call releaseSubmission if the submission is abandoned.
+ */
+export async function reserveSubmission(
+  userId: string,
+  tier?: string | null,
+  status?: string | null
+): Promise<QuotaCheck> {
+  const { reservations, ...check } = await reserveSubmissions(userId, tier, status, 1);
+  return { ...check, reservation: reservations[0] };
+}
+
+/**
+ * Give back reserved slots that were not used (all from the same month)
+ */
+export async function releaseSubmissions(userId: string, reservations: SubmissionReservation[]): Promise<void> {
+  if (reservations.length === 0) return;
+  await quotaRef(userId, reservations[0].month).update({
+    ...Object.fromEntries(
+      reservations.map((r) => [`reservations.${r.submissionId}`, admin.firestore.FieldValue.delete()])
+    ),
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  });
+}
+
+/**
+ * Give back a reserved slot that was not used
+ */
+export async function releaseSubmission(userId: string, reservation: SubmissionReservation): Promise<void> {
+  await releaseSubmissions(userId, [reservation]);
+}
+
 // ============================================
 // SUBMISSIONS
 // ============================================
 
 /**
- * Log a submission
+ * Log a submission. With a reservation the log takes the reserved ID; the
+ * quota counter is updated in the same batch (a counted status uses the
+ * slot, a pending one keeps holding it).
  */
 export async function createSubmissionLog(
-  submission: Omit<SubmissionLog, "id" | "createdAt" | "updatedAt">
+  submission: Omit<SubmissionLog, "id" | "createdAt" | "updatedAt">,
+  reservation?: SubmissionReservation
 ): Promise<string> {
-  const docRef = await adminDb.collection("submissionLogs").add({
+  const month = reservation?.month ?? quotaMonth();
+  const counted = COUNTED_STATUSES.has(submission.status);
+  if (!reservation && counted) await ensureQuotaCounter(submission.userId, month);
+
+  const docRef = reservation
+    ? adminDb.collection("submissionLogs").doc(reservation.submissionId)
+    : adminDb.collection("submissionLogs").doc();
+  const counterRef = quotaRef(submission.userId, month);
+
+  const batch = adminDb.batch();
+  batch.create(docRef, {
     ...submission,
+    quotaMonth: month,
+    quotaReserved: !!reservation && !counted,
     createdAt: admin.firestore.FieldValue.serverTimestamp(),
     updatedAt: admin.firestore.FieldValue.serverTimestamp(),
   });
+
+  if (counted) {
+    batch.set(
+      counterRef,
+      {
+        used: admin.firestore.FieldValue.increment(1),
+        // The slot is used now; a pending submission keeps holding it until it settles
+        ...(reservation ? { reservations: { [reservation.submissionId]: admin.firestore.FieldValue.delete() } } : {}),
+        updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+      },
+      { merge: true }
+    );
+  }
+  await batch.commit();
+
   return docRef.id;
 }
 
 /**
- * Update a submission log
+ * Log a user's pending submissions in one batch, each under its reserved ID
+ * (the slots stay held until settleSubmissionLogs). Keep batches under
+ * Firestore's 500 writes.
+ */
+export async function createPendingSubmissionLogs(
+  entries: Array<{
+    submission: Omit<SubmissionLog, "id" | "status" | "createdAt" | "updatedAt">;
+    reservation: SubmissionReservation;
+  }>
+): Promise<string[]> {
+  const batch = adminDb.batch();
+  for (const { submission, reservation } of entries) {
+    batch.create(adminDb.collection("submissionLogs").doc(reservation.submissionId), {
+      ...submission,
+      status: "pending",
+      quotaMonth: reservation.month,
+      quotaReserved: true,
+      createdAt: admin.firestore.FieldValue.serverTimestamp(),
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+  }
+  if (entries.length > 0) await batch.commit();
+  return entries.map(({ reservation }) => reservation.submissionId);
+}
+
+/**
+ * Record the outcome of pending submissions created by
+ * createPendingSubmissionLogs: one batch updates the logs and moves their
+ * slots from reserved to used (or frees them)
+ */
+export async function settleSubmissionLogs(
+  userId: string,
+  outcomes: Array<{ reservation: SubmissionReservation; updates: Partial<SubmissionLog> & { status: SubmissionLog["status"] } }>
+): Promise<void> {
+  if (outcomes.length === 0) return;
+
+  const batch = adminDb.batch();
+  let used = 0;
+  for (const { reservation, updates } of outcomes) {
+    if (COUNTED_STATUSES.has(updates.status)) used++;
+    batch.update(adminDb.collection("submissionLogs").doc(reservation.submissionId), {
+      ...updates,
+      quotaReserved: false,
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+  }
+  batch.set(
+    quotaRef(userId, outcomes[0].reservation.month),
+    {
+      ...(used > 0 ? { used: admin.firestore.FieldValue.increment(used) } : {}),
+      reservations: Object.fromEntries(
+        outcomes.map(({ reservation }) => [reservation.submissionId, admin.firestore.FieldValue.delete()])
+      ),
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    },
+    { merge: true }
+  );
+  await batch.commit();
+}
+
+/**
+ * Update a submission log. A status change moves the log in or out of the
+ * monthly count (and settles its reservation) in the same transaction.
  */
 export async function updateSubmissionLog(
   submissionId: string,
   updates: Partial<SubmissionLog>
 ): Promise<void> {
-  await adminDb.collection("submissionLogs").doc(submissionId).update({
-    ...updates,
-    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  const docRef = adminDb.collection("submissionLogs").doc(submissionId);
+
+  if (!updates.status) {
+    await docRef.update({
+      ...updates,
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+    return;
+  }
+
+  await adminDb.runTransaction(async (tx) => {
+    const log = (await tx.get(docRef)).data();
+    if (!log) throw new Error(`Submission ${submissionId} not found`);
+
+    const wasCounted = COUNTED_STATUSES.has(log.status);
+    const isCounted = COUNTED_STATUSES.has(updates.status!);
+    const settlesReservation = log.quotaReserved && updates.status !== "pending";
+
+    tx.update(docRef, {
+      ...updates,
+      ...(settlesReservation ? { quotaReserved: false } : {}),
+      updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    });
+
+    // Logs from before the quota counters have no quotaMonth and are not tracked
+    if (!log.quotaMonth || (wasCounted === isCounted && !settlesReservation)) return;
+
+    tx.set(
+      quotaRef(log.userId, log.quotaMonth),
+      {
+        ...(wasCounted !== isCounted ? { used: admin.firestore.FieldValue.increment(isCounted ? 1 : -1) } : {}),
+        ...(settlesReservation ? { reservations: { [submissionId]: admin.firestore.FieldValue.delete() } } : {}),
+        updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+      },
+      { merge: true }
+    );
   });
 }
 
@@ -152,21 +461,11 @@ export async function getUserSubmissions(
 }
 
 /**
- * Get submission count for current month
+ * Get submission count for current month (one counter read; slots reserved
+ * by sends in progress count as used)
  */
 export async function getMonthlySubmissionCount(userId: string): Promise<number> {
-  const startOfMonth = new Date();
-  startOfMonth.setDate(1);
-  startOfMonth.setHours(0, 0, 0, 0);
-
-  const snapshot = await adminDb
-    .collection("submissionLogs")
-    .where("userId", "==", userId)
-    .where("createdAt", ">=", startOfMonth)
-    .where("status", "in", ["sent", "delivered", "opened", "replied"])
-    .get();
-
-  return snapshot.size;
+  return quotaUsage(await ensureQuotaCounter(userId, quotaMonth()), Date.now());
 }
 
 // ============================================
@@ -0,0 +1,197 @@
+import "server-only";
+import { createHash } from "crypto";
+import admin from "firebase-admin";
+import { adminDb } from "@/lib/firebaseAdmin";
+import { getLabelIndex, markLabelIndexStale, type ScoredLabel } from "@/lib/submissions/labelIndex";
+
+// Number of recommendations kept per user
+export const TOP_RECOMMENDATIONS = 20;
+
+const CACHE_COLLECTION = "labelRecommendations";
+
+export type RecommendationProfile = {
+  genre?: string;
+  genres?: string[];
+  epkContent?: {
+    styleDescription?: string;
+  };
+  epkEnhanced?: boolean;
+};
+
+/**
+ * Cached recommendations for one user (labelRecommendations/{uid})
+ */
+export type CachedRecommendations = {
+  catalogVersion: number;
+  profileHash: string;
+  recommendations: ScoredLabel[];
+  totalLabels: number;
+  userGenres: string[];
+};
+
+// ============================================
+// CACHE KEYS
+// ============================================
+
+/**
+ * Genres used for matching (the `genres` list, falling back to the single `genre`)
+ */
+export function recommendationGenres(profile: RecommendationProfile): string[] {
+  return profile.genres?.length ? profile.genres : (profile.genre ? [profile.genre] : []);
+}
+
+/**
+ * Hash of the profile fields recommendations depend on
+ */
+export function recommendationProfileHash(userGenres: string[], styleDescription: string): string {
+  return createHash("sha256")
+    .update(JSON.stringify([userGenres, styleDescription]))
+    .digest("hex");
+}
+
+function catalogVersionRef() {
+  return adminDb.collection("cacheVersions").doc("labels");
+}
+
+export function recommendationCacheRef(uid: string) {
+  return adminDb.collection(CACHE_COLLECTION).doc(uid);
+}
+
+export function catalogVersionOf(snap: admin.firestore.DocumentSnapshot): number {
+  return snap.data()?.version || 0;
+}
+
+/**
+ * Record a label catalog change: every cached recommendation stamped with an
+ * older version is recomputed on its next read. Call after any label write.
+ */
+export async function bumpLabelCatalogVersion() {
+  markLabelIndexStale();
+  await catalogVersionRef().set({
+    version: admin.firestore.FieldValue.increment(1),
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+  }, { merge: true });
+}
+
+/**
+ * Firestore document for a cache entry
+ */
+export function toCacheDoc(entry: CachedRecommendations) {
+  return {
+    ...entry,
+    // Firestore rejects undefined fields (optional label fields)
+    recommendations: JSON.parse(JSON.stringify(entry.recommendations)),
+    computedAt: admin.firestore.FieldValue.serverTimestamp(),
+  };
+}
+
+// ============================================
+// READ-THROUGH CACHE
+// ============================================
+
+// Highest catalog version this instance's label index has been refreshed for
+let indexedCatalogVersion = -1;
+
+/**
+ * The label index, refreshed first if another instance has bumped the
+ * catalog version since this instance last looked
+ */
+export async function getLabelIndexForVersion(catalogVersion: number) {
+  if (catalogVersion > indexedCatalogVersion) {
+    markLabelIndexStale();
+  }
+  const labelIndex = await getLabelIndex();
+  indexedCatalogVersion = Math.max(indexedCatalogVersion, catalogVersion);
+  return labelIndex;
+}
+
+/**
+ * Whether a stored entry was computed for this catalog version and profile
+ */
+export function isCacheCurrent(
+  cached: Partial<CachedRecommendations> | undefined,
+  catalogVersion: number,
+  profileHash: string
+): cached is CachedRecommendations {
+  return !!cached && cached.catalogVersion === catalogVersion && cached.profileHash === profileHash;
+}
+
+/**
+ * Score labels for a profile against the current catalog and store the result
+ */
+async function computeAndStore(
+  uid: string,
+  userGenres: string[],
+  styleDescription: string,
+  profileHash: string,
+  catalogVersion: number
+): Promise<CachedRecommendations> {
+  const labelIndex = await getLabelIndexForVersion(catalogVersion);
+
+  const entry: CachedRecommendations = {
+    catalogVersion,
+    profileHash,
+    recommendations: labelIndex.topMatches(userGenres, styleDescription, TOP_RECOMMENDATIONS),
+    totalLabels: labelIndex.size,
+    userGenres,
+  };
+
+  await recommendationCacheRef(uid).set(toCacheDoc(entry));
+
+  return entry;
+}
+
+/**
+ * Recommendations for a user with a generated EPK and at least one genre.
+ * Served from labelRecommendations/{uid} while its catalog version and
+ * profile hash are current, otherwise recomputed and stored.
+ */
+export async function getRecommendations(
+  uid: string,
+  profile: RecommendationProfile,
+  cacheSnap: admin.firestore.DocumentSnapshot,
+  catalogVersion: number
+): Promise<CachedRecommendations & { cached: boolean }> {
+  const userGenres = recommendationGenres(profile);
+  const styleDescription = profile.epkContent?.styleDescription || "";
+  const profileHash = recommendationProfileHash(userGenres, styleDescription);
+
+  const cached = cacheSnap.data() as CachedRecommendations | undefined;
+  if (isCacheCurrent(cached, catalogVersion, profileHash)) {
+    return { ...cached, cached: true };
+  }
+
+  const fresh = await computeAndStore(uid, userGenres, styleDescription, profileHash, catalogVersion);
+  return { ...fresh, cached: false };
+}
+
+/**
+ * Load a user's profile, cache entry and the catalog version in one round trip
+ */
+export async function loadRecommendationInputs(uid: string) {
+  const [userSnap, cacheSnap, versionSnap] = await adminDb.getAll(
+    adminDb.collection("users").doc(uid),
+    recommendationCacheRef(uid),
+    catalogVersionRef()
+  );
+  return { userSnap, cacheSnap, catalogVersion: catalogVersionOf(versionSnap) };
+}
+
+/**
+ * Recompute a user's cached recommendations after their profile changed
+ * (e.g. EPK generation), so the next dashboard load is a cache hit
+ */
+export async function refreshRecommendations(uid: string) {
+  const { userSnap, cacheSnap, catalogVersion } = await loadRecommendationInputs(uid);
+  const profile = userSnap.data() as RecommendationProfile | undefined;
+  if (!profile?.epkEnhanced || recommendationGenres(profile).length === 0) return;
+
+  await getRecommendations(uid, profile, cacheSnap, catalogVersion);
+}
+
+/**
+ * Current catalog version (for bulk precompute)
+ */
+export async function getLabelCatalogVersion(): Promise<number> {
+  return catalogVersionOf(await catalogVersionRef().get());
+}
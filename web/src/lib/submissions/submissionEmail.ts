@@ -0,0 +1,136 @@
+import "server-only";
+import type { ArtistPitch, Label } from "@/lib/submissions";
+
+export type PitchType = "short" | "medium" | "long";
+
+/**
+ * Subject, HTML and text of a label submission email built from the
+ * artist's pitch (shared by single sends and campaigns)
+ */
+export function buildSubmissionEmail(
+  label: Pick<Label, "name">,
+  pitch: ArtistPitch,
+  pitchType: string,
+  customMessage?: string
+): { subject: string; html: string; text: string } {
+  // Select pitch content based on type
+  let pitchContent: string;
+  switch (pitchType) {
+    case "short":
+      pitchContent = pitch.shortPitch;
+      break;
+    case "long":
+    case "medium":
+    default:
+      pitchContent = pitch.mediumPitch;
+  }
+
+  // Append custom message if provided
+  if (customMessage) {
+    pitchContent = `${pitchContent}\n\n${customMessage}`;
+  }
+
+  const html = buildSubmissionEmailHtml({
+    labelName: label.name,
+    artistName: pitch.artistName,
+    genre: pitch.genre,
+    pitchContent,
+    trackUrl: pitch.trackUrl,
+    epkUrl: pitch.epkUrl,
+    spotifyUrl: pitch.spotifyUrl,
+    soundcloudUrl: pitch.soundcloudUrl,
+    contactEmail: pitch.contactEmail,
+  });
+
+  const text = buildSubmissionEmailText({
+    artistName: pitch.artistName,
+    pitchContent,
+    trackUrl: pitch.trackUrl,
+    epkUrl: pitch.epkUrl,
+    contactEmail: pitch.contactEmail,
+  });
+
+  return { subject: pitch.subjectLine, html, text };
+}
+
+// ============================================
+// Email HTML Builder
+// ============================================
+
+interface EmailParams {
+  labelName: string;
+  artistName: string;
+  genre: string;
+  pitchContent: string;
+  trackUrl: string;
+  epkUrl: string;
+  spotifyUrl?: string;
+  soundcloudUrl?: string;
+  contactEmail: string;
+}
+
+function buildSubmissionEmailHtml(params: EmailParams): string {
+  const links: string[] = [];
+  
+  links.push(`<a href="${params.trackUrl}" style="color:#10b981;text-decoration:none;">Featured Track</a>`);
+  links.push(`<a href="${params.epkUrl}" style="color:#10b981;text-decoration:none;">Full EPK</a>`);
+  
+  if (params.spotifyUrl) {
+    links.push(`<a href="${params.spotifyUrl}" style="color:#10b981;text-decoration:none;">Spotify</a>`);
+  }
+  if (params.soundcloudUrl) {
+    links.push(`<a href="${params.soundcloudUrl}" style="color:#10b981;text-decoration:none;">SoundCloud</a>`);
+  }
+
+  return `<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin:0;padding:0;font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,Helvetica,Arial,sans-serif;color:#1a1a1a;line-height:1.6;">
+  <div style="max-width:600px;margin:0 auto;padding:32px 20px;">
+    <div style="white-space:pre-wrap;font-size:15px;">${escapeHtml(params.pitchContent)}</div>
+    
+    <div style="margin-top:24px;padding-top:24px;border-top:1px solid #e5e5e5;">
+      <p style="margin:0 0 12px 0;font-size:14px;color:#666;">
+        <strong>Links:</strong> ${links.join(" | ")}
+      </p>
+      <p style="margin:0;font-size:14px;color:#666;">
+        <strong>Contact:</strong> ${params.contactEmail}
+      </p>
+    </div>
+    
+    <div style="margin-top:32px;font-size:12px;color:#999;">
+      <p style="margin:0;">
+        This submission was sent via Verified Sound A&R on behalf of ${escapeHtml(params.artistName)}.
+      </p>
+    </div>
+  </div>
+</body>
+</html>`;
+}
+
+function buildSubmissionEmailText(params: Omit<EmailParams, "labelName" | "genre" | "spotifyUrl" | "soundcloudUrl">): string {
+  return `${params.pitchContent}
+
+---
+Links:
+- Featured Track: ${params.trackUrl}
+- Full EPK: ${params.epkUrl}
+
+Contact: ${params.contactEmail}
+
+---
+This submission was sent via Verified Sound A&R on behalf of ${params.artistName}.`;
+}
+
+function escapeHtml(text: string): string {
+  return text
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;")
+    .replace(/"/g, "&quot;")
+    .replace(/'/g, "&#039;")
+    .replace(/\n/g, "<br>");
+}
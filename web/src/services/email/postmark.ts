@@ -1,23 +1,43 @@
 import "server-only";
 import { ServerClient } from "postmark";
-import { writeEmailLog } from "@/lib/firestore/writeEmailLog";
+import { writeEmailLog, writeEmailLogs } from "@/lib/firestore/writeEmailLog";
 
 let client: ServerClient | null = null;
 
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 1000;
 
+// Postmark accepts at most 500 messages per batch API call
+export const POSTMARK_BATCH_SIZE = 500;
+
 function getClient() {
   const token = process.env.POSTMARK_SERVER_TOKEN;
   if (!token) {
     throw new Error("Missing POSTMARK_SERVER_TOKEN");
   }
   if (!client) {
-    client = new ServerClient(token);
+    client = new ServerClient(token, getClientOptions());
   }
   return client;
 }
 
+/**
+ * Optional API host override (e.g. the local postmark_standin.py server)
+ */
+function getClientOptions() {
+  const apiUrl = process.env.POSTMARK_API_URL;
+  const timeout = Number(process.env.POSTMARK_TIMEOUT_SECONDS) || undefined;
+  if (!apiUrl) {
+    return timeout ? { timeout } : undefined;
+  }
+  const url = new URL(apiUrl);
+  return {
+    useHttps: url.protocol === "https:",
+    requestHost: url.host,
+    timeout,
+  };
+}
+
 function getFromAddress() {
   const fromEmail = process.env.POSTMARK_FROM_EMAIL;
   const fromName = process.env.POSTMARK_FROM_NAME || "Verified Sound A&R";
@@ -123,6 +143,8 @@ export async function sendTransactionalEmail(args: {
         TextBody: args.text,
         MessageStream: getMessageStream(args.messageStream),
         ReplyTo: replyTo || undefined,
+        // Webhook events carry the tag, so bounces and opens count toward this type
+        Tag: args.emailType || "transactional",
       })
     );
     messageId = response.MessageID;
@@ -153,6 +175,99 @@ export async function sendTransactionalEmail(args: {
   return { messageId, logId };
 }
 
+export type BatchEmailMessage = {
+  to: string;
+  subject: string;
+  html: string;
+  text?: string;
+  messageStream?: string;
+  uid?: string;
+  emailType?: string;
+  meta?: Record<string, unknown>;
+};
+
+export type BatchEmailResult = {
+  to: string;
+  uid?: string;
+  ok: boolean;
+  messageId?: string;
+  logId?: string;
+  error?: string;
+};
+
+/**
+ * Send many transactional emails through Postmark's batch API.
+ * Messages are chunked to POSTMARK_BATCH_SIZE per call and every message is
+ * logged to emailLogs with batched writes. Results are per recipient, in the
+ * same order as the input; a failed chunk marks all of its messages failed
+ * instead of throwing.
+ */
+export async function sendBatchTransactionalEmails(
+  messages: BatchEmailMessage[]
+): Promise<BatchEmailResult[]> {
+  const replyTo = process.env.POSTMARK_REPLY_TO;
+  const results: BatchEmailResult[] = [];
+
+  for (let i = 0; i < messages.length; i += POSTMARK_BATCH_SIZE) {
+    const chunk = messages.slice(i, i + POSTMARK_BATCH_SIZE);
+
+    try {
+      const responses = await withRetry(() =>
+        getClient().sendEmailBatch(
+          chunk.map((message) => ({
+            From: getFromAddress(),
+            To: message.to,
+            Subject: message.subject,
+            HtmlBody: message.html,
+            TextBody: message.text,
+            MessageStream: getMessageStream(message.messageStream),
+            ReplyTo: replyTo || undefined,
+            Tag: message.emailType || "transactional",
+          }))
+        )
+      );
+
+      chunk.forEach((message, index) => {
+        const response = responses[index];
+        const ok = response?.ErrorCode === 0;
+        results.push({
+          to: message.to,
+          uid: message.uid,
+          ok,
+          messageId: ok ? response.MessageID : undefined,
+          error: ok ? undefined : response?.Message || "Unknown error",
+        });
+      });
+    } catch (err: any) {
+      const error = err?.message || "Unknown error";
+      for (const message of chunk) {
+        results.push({ to: message.to, uid: message.uid, ok: false, error });
+      }
+    }
+  }
+
+  try {
+    const logIds = await writeEmailLogs(
+      results.map((result, index) => ({
+        uid: result.uid || null,
+        type: messages[index].emailType || "transactional",
+        to: result.to,
+        status: result.ok ? "sent" : "failed",
+        postmarkMessageId: result.messageId ?? null,
+        error: result.error ?? null,
+        ...(messages[index].meta ? { meta: messages[index].meta } : {}),
+      }))
+    );
+    logIds.forEach((logId, index) => {
+      results[index].logId = logId;
+    });
+  } catch (err: any) {
+    console.error("[postmark] Failed to write batch email logs:", err?.message || err);
+  }
+
+  return results;
+}
+
 export async function sendWithTemplate(args: {
   to: string;
   templateId: string;
@@ -176,6 +291,7 @@ export async function sendWithTemplate(args: {
         TemplateModel: args.model,
         MessageStream: getMessageStream(args.messageStream),
         ReplyTo: replyTo || undefined,
+        Tag: args.emailType || "template",
       })
     );
     messageId = response.MessageID;
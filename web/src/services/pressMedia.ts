@@ -31,6 +31,16 @@ export type PressMediaDoc = {
   downloadURL: string;
   contentType: string;
   sizeBytes: number;
+  /** Downscaled JPEG used when rendering PDFs (absent on older uploads) */
+  pdfVariant?: PressMediaVariant;
+};
+
+export type PressMediaVariant = {
+  width: number;
+  height: number;
+  storagePath: string;
+  downloadURL: string;
+  sizeBytes: number;
 };
 
 export type UploadProgress = {
@@ -46,6 +56,9 @@ const MAX_SIZE_BYTES = 10 * 1024 * 1024; // 10 MB
 const MAX_IMAGES = 3;
 const MAX_RETRIES = 3;
 const RETRY_DELAY_MS = 1000;
+// PDF variant: longest edge in px (~300 dpi at the template's largest image size)
+const PDF_VARIANT_MAX_EDGE = 1200;
+const PDF_VARIANT_QUALITY = 0.85;
 
 function getExtFromMime(mime: string): string {
   switch (mime) {
@@ -79,6 +92,82 @@ async function getImageDimensions(
   }
 }
 
+/**
+ * Downscale an image to a JPEG for PDF rendering (the PDF renderer cannot
+ * embed WEBP, and full-resolution originals make every render slower)
+ */
+async function createPdfVariant(
+  file: File,
+  width: number,
+  height: number
+): Promise<{ blob: Blob; width: number; height: number }> {
+  const scale = Math.min(1, PDF_VARIANT_MAX_EDGE / Math.max(width, height));
+  const targetW = Math.max(1, Math.round(width * scale));
+  const targetH = Math.max(1, Math.round(height * scale));
+
+  const url = URL.createObjectURL(file);
+  try {
+    const img = new Image();
+    await new Promise<void>((resolve, reject) => {
+      img.onload = () => resolve();
+      img.onerror = () => reject(new Error("Could not read image"));
+      img.src = url;
+    });
+
+    const canvas = document.createElement("canvas");
+    canvas.width = targetW;
+    canvas.height = targetH;
+    const ctx = canvas.getContext("2d");
+    if (!ctx) throw new Error("Canvas not supported");
+    // JPEG has no alpha: flatten transparent PNGs onto white
+    ctx.fillStyle = "#ffffff";
+    ctx.fillRect(0, 0, targetW, targetH);
+    ctx.drawImage(img, 0, 0, targetW, targetH);
+
+    const blob = await new Promise<Blob>((resolve, reject) => {
+      canvas.toBlob(
+        (result) => (result ? resolve(result) : reject(new Error("Could not encode image"))),
+        "image/jpeg",
+        PDF_VARIANT_QUALITY
+      );
+    });
+    return { blob, width: targetW, height: targetH };
+  } finally {
+    URL.revokeObjectURL(url);
+  }
+}
+
+/**
+ * Create and upload the PDF variant; the original is used if this fails
+ */
+async function uploadPdfVariant(
+  file: File,
+  uid: string,
+  imageId: string,
+  width: number,
+  height: number
+): Promise<PressMediaVariant | undefined> {
+  try {
+    const variant = await createPdfVariant(file, width, height);
+    const storagePath = `users/${uid}/media/${imageId}_pdf.jpg`;
+    const variantRef = ref(storage, storagePath);
+
+    await withRetry(() => uploadBytes(variantRef, variant.blob, { contentType: "image/jpeg" }));
+    const downloadURL = await withRetry(() => getDownloadURL(variantRef));
+
+    return {
+      width: variant.width,
+      height: variant.height,
+      storagePath,
+      downloadURL,
+      sizeBytes: variant.blob.size,
+    };
+  } catch (error) {
+    console.error("[pressMedia] PDF variant failed:", error);
+    return undefined;
+  }
+}
+
 /**
  * Validate file before upload
  */
@@ -203,6 +292,7 @@ export async function uploadPressImage(
   });
 
   const downloadURL = await withRetry(() => getDownloadURL(storageRef));
+  const pdfVariant = await uploadPdfVariant(file, uid, imageId, width, height);
 
   const pressDoc: Omit<PressMediaDoc, "id"> = {
     sortOrder: existingCount,
@@ -214,6 +304,7 @@ export async function uploadPressImage(
     downloadURL,
     contentType: file.type,
     sizeBytes: uploadResult.size ?? file.size,
+    ...(pdfVariant ? { pdfVariant } : {}),
   };
 
   const docRef = doc(db, "users", uid, "media", imageId);
@@ -238,10 +329,11 @@ export async function deletePressImage(uid: string, imageId: string): Promise<vo
   
   if (targetDoc) {
     const data = targetDoc.data() as Partial<PressMediaDoc>;
-    const storagePath = data.storagePath;
+    const storagePaths = [data.storagePath, data.pdfVariant?.storagePath];
 
-    // Delete from storage with retry
-    if (storagePath) {
+    // Delete the original and its PDF variant from storage with retry
+    for (const storagePath of storagePaths) {
+      if (!storagePath) continue;
       try {
         await withRetry(() => deleteObject(ref(storage, storagePath)));
       } catch (error: any) {